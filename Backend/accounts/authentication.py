@@ -0,0 +1,143 @@
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from django.core.cache import caches
+from django.db import router
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from .models import User
+
+
+def _version_key(user_id):
+    return f'token-version:{user_id}'
+
+
+def _version_cache():
+    """
+    Where token versions are cached: the shared version cache, or nowhere
+    when it isn't shared by every worker, as a stale entry would keep a
+    revoked token working on the workers that didn't see the change.
+    """
+    if settings.VERSION_CACHE_SHARED:
+        return caches[settings.VERSION_CACHE_ALIAS]
+    return None
+
+
+def current_token_version(user_id):
+    """
+    The user's current token_version and is_active flag. Refuses users
+    that are gone, or inactive when CHECK_USER_IS_ACTIVE is on.
+
+    Read from the shared version cache when there is one, from the
+    database otherwise; the user signals drop the entry whenever the user
+    is saved or deleted.
+    """
+    cache = _version_cache()
+    key = _version_key(user_id)
+    entry = cache.get(key) if cache is not None else None
+    if entry is None:
+        row = User.objects.filter(pk=user_id).values_list(
+            'token_version', 'is_active'
+        ).first()
+        entry = row or (None, False)
+        if cache is not None:
+            cache.set(key, entry, settings.TOKEN_VERSION_CACHE_TIMEOUT)
+
+    version, is_active = entry
+    if version is None:
+        raise AuthenticationFailed("User not found", code='user_not_found')
+    if not is_active and api_settings.CHECK_USER_IS_ACTIVE:
+        raise AuthenticationFailed("User is inactive", code='user_inactive')
+    return version, is_active
+
+
+def forget_token_version(*user_ids):
+    cache = _version_cache()
+    if cache is not None:
+        cache.delete_many([_version_key(user_id) for user_id in user_ids])
+
+
+class _UserRowCache:
+    """
+    Short-lived, per-process cache of user rows for tokens whose claims
+    can't be used. Rows are kept instead of instances so every request gets
+    its own User object.
+    """
+
+    def __init__(self, max_size=1024):
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._rows = OrderedDict()
+
+    def get(self, user_id, version):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._rows.get(user_id)
+        if entry is None or entry[0] < now or entry[1] != version:
+            names = [field.attname for field in User._meta.concrete_fields]
+            values = User.objects.filter(pk=user_id).values_list(*names).first()
+            if values is None:
+                raise AuthenticationFailed("User not found", code='user_not_found')
+            entry = (now + settings.TOKEN_USER_CACHE_TIMEOUT, version, names, values)
+            with self._lock:
+                self._rows[user_id] = entry
+                self._rows.move_to_end(user_id)
+                while len(self._rows) > self.max_size:
+                    self._rows.popitem(last=False)
+
+        _, _, names, values = entry
+        return User.from_db(router.db_for_read(User), names, values)
+
+    def clear(self):
+        with self._lock:
+            self._rows.clear()
+
+
+user_rows = _UserRowCache()
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that builds request.user from the token's claims.
+
+    Access tokens carry the user's name, role, organization and email (see
+    User.token_claims) along with the user's token_version. While that
+    version is still current the user is built straight from the claims,
+    with no query; other fields load lazily if something reads them. A
+    role, organization or activation change bumps the version, so older
+    tokens fall back to a database read (cached briefly per process) and a
+    deleted or deactivated user is refused at once. Only User.save() bumps
+    the version; see User.TOKEN_CLAIM_FIELDS for bulk updates.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = User._meta.pk.to_python(validated_token[api_settings.USER_ID_CLAIM])
+        except KeyError:
+            raise InvalidToken("Token contained no recognizable user identification")
+
+        version, is_active = current_token_version(user_id)
+
+        claims = User.TOKEN_CLAIM_FIELDS
+        if validated_token.get('token_version') == version and all(
+            claim in validated_token for claim in claims
+        ):
+            loaded = {
+                'id': user_id,
+                'token_version': version,
+                'is_active': is_active,
+                **{claim: validated_token[claim] for claim in claims},
+            }
+            # from_db pairs a partial row with the model's fields in
+            # declaration order, so the values must follow that order
+            names = [
+                field.attname for field in User._meta.concrete_fields
+                if field.attname in loaded
+            ]
+            return User.from_db(
+                router.db_for_read(User), names, [loaded[name] for name in names]
+            )
+
+        return user_rows.get(user_id, version)
@@ -0,0 +1,361 @@
+import logging
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q, Sum
+from django.utils import timezone
+from plantra.async_views import gather_queries
+from .models import User
+
+
+logger = logging.getLogger(__name__)
+
+
+def dashboard_cache_key(organization_id):
+    return f'dashboard:stats:{organization_id}'
+
+
+def get_dashboard_stats(organization_id):
+    """
+    Return the dashboard snapshot for an organization.
+
+    Every user in the organization sees the same payload, so it is cached
+    per organization. Writes to events, expenses, checklist items and users
+    invalidate it (see accounts.signals); the short timeout keeps the
+    date-relative fields ("overdue", "this week", "2 hours ago") fresh.
+    """
+    key = dashboard_cache_key(organization_id)
+    stats = cache.get(key)
+    if stats is None:
+        stats = build_dashboard_stats(organization_id)
+        cache.set(key, stats, settings.DASHBOARD_CACHE_TIMEOUT)
+    return stats
+
+
+def invalidate_dashboard(organization_id):
+    cache.delete(dashboard_cache_key(organization_id))
+
+
+async def aget_dashboard_stats(organization_id):
+    """
+    Async get_dashboard_stats: on a cache miss the dashboard's independent
+    queries run concurrently instead of one after another.
+    """
+    key = dashboard_cache_key(organization_id)
+    stats = await cache.aget(key)
+    if stats is None:
+        stats = await abuild_dashboard_stats(organization_id)
+        await cache.aset(key, stats, settings.DASHBOARD_CACHE_TIMEOUT)
+    return stats
+
+
+async def abuild_dashboard_stats(organization_id):
+    queries = dashboard_queries(organization_id)
+    if queries is None:
+        return _empty_stats()
+    results = await gather_queries(*queries.values())
+    return assemble_dashboard_stats(dict(zip(queries, results)))
+
+
+def _empty_stats():
+    return {
+        'stats': {
+            'active_events': {
+                'value': 0,
+                'change': '+0 this month',
+                'trend': 'neutral'
+            },
+            'team_members': {
+                'value': 0,
+                'change': '+0 this week',
+                'trend': 'neutral'
+            },
+            'pending_tasks': {
+                'value': 0,
+                'change': '0 overdue',
+                'trend': 'neutral'
+            },
+            'total_budget': {
+                'value': '$0',
+                'change': '0% spent',
+                'trend': 'neutral'
+            }
+        },
+        'upcoming_events': [],
+        'urgent_tasks': [],
+        'recent_activity': []
+    }
+
+
+def _fallback(query, default, label):
+    """Wrap a dashboard query so a failure degrades to `default`"""
+    def run():
+        try:
+            return query()
+        except Exception:
+            logger.exception("Error fetching %s", label)
+            return default
+    return run
+
+
+def dashboard_queries(organization_id):
+    """
+    The dashboard's database work as independent callables, keyed by name.
+
+    None of them depends on another's result, so they can run in any
+    order or concurrently (see aget_dashboard_stats). Returns None when
+    the events app is unavailable.
+    """
+    # Import here to avoid circular imports
+    try:
+        from events.models import Event, EventChecklist, Expense
+        from events.progress import checklist_progress, checklist_totals
+    except ImportError:
+        return None
+
+    today = timezone.now().date()
+    now = timezone.now()
+
+    # Get events for the organization
+    events = Event.objects.filter(organization_id=organization_id)
+
+    def upcoming():
+        # Get upcoming events (next 5) and their checklist progress
+        upcoming_events = list(events.filter(
+            event_date__gte=today
+        ).order_by('event_date')[:5])
+        try:
+            progress = checklist_progress(event.id for event in upcoming_events)
+        except Exception:
+            progress = {}
+        return upcoming_events, progress
+
+    return {
+        # Count active events (future or ongoing events)
+        'active_events': lambda: events.filter(
+            Q(event_date__gte=today) | Q(event_date__isnull=True)
+        ).count(),
+
+        # Count team members
+        'team_members': lambda: User.objects.filter(
+            organization_id=organization_id
+        ).count(),
+
+        # Count pending and overdue tasks across all events
+        'task_counts': _fallback(
+            lambda: checklist_totals(event__organization_id=organization_id),
+            None, 'task counts'
+        ),
+
+        # Calculate total budget and spent amount
+        'total_budget': _fallback(
+            lambda: events.aggregate(total=Sum('expected_budget'))['total'] or 0,
+            0, 'total budget'
+        ),
+        'total_spent': _fallback(
+            lambda: Expense.objects.filter(
+                event__organization_id=organization_id
+            ).aggregate(total=Sum('amount'))['total'] or 0,
+            0, 'total spent'
+        ),
+
+        'upcoming': upcoming,
+
+        # Get urgent tasks (overdue or due soon)
+        'urgent_tasks': _fallback(lambda: list(EventChecklist.objects.filter(
+            event__organization_id=organization_id,
+            status__in=['pending', 'in_progress'],
+            due_date__lte=today + timezone.timedelta(days=3)
+        ).select_related('event').order_by('due_date')[:5]), [], 'urgent tasks'),
+
+        # Recent activity
+        'recent_expenses': _fallback(lambda: list(Expense.objects.filter(
+            event__organization_id=organization_id
+        ).select_related('event').order_by('-created_at')[:3]), [], 'expenses'),
+
+        'recent_tasks': _fallback(lambda: list(EventChecklist.objects.filter(
+            event__organization_id=organization_id,
+            status='completed'
+        ).select_related('event').order_by('-created_at')[:3]), [], 'tasks'),
+
+        'recent_events': _fallback(lambda: list(Event.objects.filter(
+            organization_id=organization_id
+        ).order_by('-created_at')[:2]), [], 'events'),
+
+        # Calculate recent additions
+        'events_this_month': lambda: events.filter(
+            created_at__gte=now - timezone.timedelta(days=30)
+        ).count(),
+
+        'team_this_week': lambda: User.objects.filter(
+            organization_id=organization_id,
+            date_joined__gte=now - timezone.timedelta(days=7)
+        ).count(),
+    }
+
+
+def build_dashboard_stats(organization_id):
+    """Compute the dashboard statistics for an organization"""
+    queries = dashboard_queries(organization_id)
+    if queries is None:
+        return _empty_stats()
+    return assemble_dashboard_stats({name: query() for name, query in queries.items()})
+
+
+def assemble_dashboard_stats(results):
+    """Shape the results of dashboard_queries() into the response payload"""
+    task_counts = results['task_counts']
+    if task_counts is not None:
+        pending_tasks_count = task_counts['pending'] + task_counts['in_progress']
+        overdue_tasks_count = task_counts['overdue']
+    else:
+        pending_tasks_count = 0
+        overdue_tasks_count = 0
+
+    total_budget = results['total_budget']
+    total_spent = results['total_spent']
+    budget_percentage = 0
+    if total_budget > 0:
+        budget_percentage = round((total_spent / total_budget) * 100, 1)
+
+    upcoming_events, upcoming_progress = results['upcoming']
+    upcoming_events_data = []
+    for event in upcoming_events:
+        event_progress = upcoming_progress.get(event.id)
+        total_tasks = event_progress['total'] if event_progress else 0
+        completed_tasks = event_progress['completed'] if event_progress else 0
+
+        progress = 0
+        if total_tasks > 0:
+            progress = round((completed_tasks / total_tasks) * 100)
+
+        status_label = 'Planning'
+        if progress > 75:
+            status_label = 'In Progress'
+        elif progress < 30:
+            status_label = 'Early Stage'
+
+        upcoming_events_data.append({
+            'id': event.id,
+            'name': event.name,
+            'date': event.event_date,
+            'status': status_label,
+            'progress': progress,
+            'location': event.location or 'TBD'
+        })
+
+    urgent_tasks_data = []
+    for task in results['urgent_tasks']:
+        days_until = (task.due_date - timezone.now().date()).days
+        if days_until < 0:
+            deadline = f"{abs(days_until)} days overdue"
+        elif days_until == 0:
+            deadline = "Today"
+        elif days_until == 1:
+            deadline = "Tomorrow"
+        else:
+            deadline = f"In {days_until} days"
+
+        urgent_tasks_data.append({
+            'id': task.id,
+            'task': task.title,
+            'event': task.event.name,
+            'event_id': task.event.id,
+            'deadline': deadline,
+            'due_date': task.due_date
+        })
+
+    # Get recent activity
+    recent_activity = []
+
+    for expense in results['recent_expenses']:
+        recent_activity.append({
+            'action': 'Expense added',
+            'detail': f"{expense.name} - ${expense.amount}",
+            'time': _get_time_ago(expense.created_at),
+            'icon': 'DollarSign',
+            'created_at': expense.created_at
+        })
+
+    for task in results['recent_tasks']:
+        recent_activity.append({
+            'action': 'Task completed',
+            'detail': task.title,
+            'time': _get_time_ago(task.created_at),
+            'icon': 'CheckSquare',
+            'created_at': task.created_at
+        })
+
+    for event in results['recent_events']:
+        recent_activity.append({
+            'action': 'Event created',
+            'detail': event.name,
+            'time': _get_time_ago(event.created_at),
+            'icon': 'Calendar',
+            'created_at': event.created_at
+        })
+
+    # Sort by created_at and take top 10
+    recent_activity.sort(key=lambda x: x.get('created_at', timezone.now()), reverse=True)
+    recent_activity = recent_activity[:10]
+
+    # Remove created_at from response
+    for activity in recent_activity:
+        activity.pop('created_at', None)
+
+    events_this_month = results['events_this_month']
+    team_this_week = results['team_this_week']
+
+    return {
+        'stats': {
+            'active_events': {
+                'value': results['active_events'],
+                'change': f'+{events_this_month} this month',
+                'trend': 'up' if events_this_month > 0 else 'neutral'
+            },
+            'team_members': {
+                'value': results['team_members'],
+                'change': f'+{team_this_week} this week',
+                'trend': 'up' if team_this_week > 0 else 'neutral'
+            },
+            'pending_tasks': {
+                'value': pending_tasks_count,
+                'change': f'{overdue_tasks_count} overdue',
+                'trend': 'down' if overdue_tasks_count > 0 else 'neutral'
+            },
+            'total_budget': {
+                'value': f'${total_budget:,.0f}',
+                'change': f'{budget_percentage}% spent',
+                'trend': 'neutral'
+            }
+        },
+        'upcoming_events': upcoming_events_data,
+        'urgent_tasks': urgent_tasks_data,
+        'recent_activity': recent_activity
+    }
+
+
+def _get_time_ago(dt):
+    """Helper method to get human-readable time difference"""
+    if not dt:
+        return 'Recently'
+
+    diff = timezone.now() - dt
+
+    if diff.days > 0:
+        if diff.days == 1:
+            return '1 day ago'
+        return f'{diff.days} days ago'
+
+    hours = diff.seconds // 3600
+    if hours > 0:
+        if hours == 1:
+            return '1 hour ago'
+        return f'{hours} hours ago'
+
+    minutes = diff.seconds // 60
+    if minutes > 0:
+        if minutes == 1:
+            return '1 minute ago'
+        return f'{minutes} minutes ago'
+
+    return 'Just now'
\ No newline at end of file
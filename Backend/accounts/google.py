@@ -0,0 +1,160 @@
+import base64
+import json
+import logging
+import re
+import threading
+import time
+from functools import lru_cache
+import requests
+from django.conf import settings
+from google.auth import exceptions, jwt
+from google.auth.transport.requests import Request
+
+
+logger = logging.getLogger(__name__)
+
+GOOGLE_ISSUERS = ('accounts.google.com', 'https://accounts.google.com')
+
+_MAX_AGE = re.compile(r'max-age=(\d+)')
+
+
+def _max_age(headers, default):
+    """Seconds a response stays fresh, from Cache-Control max-age less Age"""
+    match = _MAX_AGE.search(headers.get('cache-control', ''))
+    if not match:
+        return default
+    try:
+        age = int(headers.get('age', 0))
+    except ValueError:
+        age = 0
+    return max(int(match.group(1)) - age, 0)
+
+
+def _unverified_key_id(token):
+    """The `kid` from a JWT header, or None if it can't be read"""
+    try:
+        if isinstance(token, bytes):
+            token = token.decode('utf-8')
+        header = token.split('.', 1)[0]
+        header += '=' * (-len(header) % 4)
+        return json.loads(base64.urlsafe_b64decode(header)).get('kid')
+    except (ValueError, AttributeError):
+        return None
+
+
+class GoogleCertificates:
+    """
+    Google's ID token signing certificates ({key id: PEM certificate}),
+    shared by every login in the process.
+
+    The certificates are fetched once and kept for the max-age Google
+    sends. Once most of that lifetime has passed, the next caller starts a
+    background refresh and keeps using the current set, so logins only
+    wait on the network for the very first fetch or after a full expiry.
+    A token signed with a key id we don't hold (Google rotated its keys)
+    triggers an immediate refetch, at most once per `min_refetch_interval`
+    seconds so forged key ids can't be used to hammer the endpoint.
+    """
+
+    def __init__(self, url, request=None, default_max_age=3600,
+                 refresh_fraction=0.9, min_refetch_interval=60):
+        self.url = url
+        self.request = request or Request(requests.Session())
+        self.default_max_age = default_max_age
+        self.refresh_fraction = refresh_fraction
+        self.min_refetch_interval = min_refetch_interval
+
+        self._lock = threading.Lock()
+        self._fetch_lock = threading.Lock()
+        self._certs = None
+        self._fetched_at = None
+        self._refresh_at = None
+        self._expires_at = None
+        self._refreshing = False
+
+    def get(self, key_id=None):
+        now = time.monotonic()
+        with self._lock:
+            certs, fetched_at = self._certs, self._fetched_at
+            expires_at, refresh_at = self._expires_at, self._refresh_at
+
+        if certs is None or now >= expires_at:
+            return self._fetch(seen=fetched_at)
+
+        if key_id is not None and key_id not in certs:
+            if now - fetched_at >= self.min_refetch_interval:
+                return self._fetch(seen=fetched_at)
+            return certs
+
+        if now >= refresh_at:
+            self._refresh_in_background()
+        return certs
+
+    def _fetch(self, seen=None):
+        """Fetch the certificates unless another thread did since `seen`"""
+        with self._fetch_lock:
+            with self._lock:
+                if self._certs is not None and self._fetched_at != seen:
+                    return self._certs
+
+            response = self.request(self.url, method='GET')
+            if response.status != 200:
+                raise exceptions.TransportError(
+                    f"Could not fetch certificates at {self.url}"
+                )
+            certs = json.loads(response.data.decode('utf-8'))
+            max_age = _max_age(
+                {name.lower(): value for name, value in response.headers.items()},
+                self.default_max_age
+            )
+
+            now = time.monotonic()
+            with self._lock:
+                self._certs = certs
+                self._fetched_at = now
+                self._refresh_at = now + max_age * self.refresh_fraction
+                self._expires_at = now + max_age
+            return certs
+
+    def _refresh_in_background(self):
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+            seen = self._fetched_at
+
+        def refresh():
+            try:
+                self._fetch(seen=seen)
+            except Exception:
+                # Keep serving the current certificates until they expire
+                logger.warning("Refreshing Google certificates failed", exc_info=True)
+            finally:
+                with self._lock:
+                    self._refreshing = False
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+    def clear(self):
+        with self._lock:
+            self._certs = self._fetched_at = self._refresh_at = self._expires_at = None
+
+
+@lru_cache(maxsize=None)
+def get_google_certificates():
+    return GoogleCertificates(settings.GOOGLE_OAUTH_CERTS_URL)
+
+
+def verify_google_id_token(token, audience, certificates=None):
+    """
+    Verify a Google ID token's signature, audience and issuer and return its
+    claims. Raises ValueError for an invalid token and
+    google.auth.exceptions.TransportError if the certificates can't be
+    fetched.
+    """
+    certificates = certificates or get_google_certificates()
+    certs = certificates.get(_unverified_key_id(token))
+    idinfo = jwt.decode(token, certs=certs, audience=audience)
+    if idinfo.get('iss') not in GOOGLE_ISSUERS:
+        raise ValueError('Wrong issuer.')
+    return idinfo
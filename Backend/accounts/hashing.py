@@ -0,0 +1,59 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import repeat
+from django.conf import settings
+from django.contrib.auth.hashers import get_hasher
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _encode(hasher, password, salt):
+    # Runs in a worker process; must not touch settings or the database
+    return hasher.encode(password, salt)
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # Spawned rather than forked: forking a threaded server process
+            # can copy held locks into the child
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.PASSWORD_HASHING_WORKERS,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return _pool
+
+
+def _reset_pool():
+    global _pool
+    with _pool_lock:
+        _pool = None
+
+
+def hash_passwords(passwords):
+    """
+    make_password() for many passwords, spread over a process pool.
+
+    Each hash is a deliberately slow key derivation, so hashing hundreds of
+    them in the request thread takes minutes; the pool runs them on every
+    core. The hasher and salts are picked here and sent with each
+    password, so workers need no Django setup. Small batches are hashed
+    inline, where starting the pool would cost more than it saves.
+    """
+    passwords = list(passwords)
+    hasher = get_hasher()
+    salts = [hasher.salt() for _ in passwords]
+
+    if len(passwords) >= settings.PASSWORD_HASHING_POOL_MIN_BATCH:
+        try:
+            return list(_get_pool().map(_encode, repeat(hasher), passwords, salts))
+        except BrokenProcessPool:
+            # A worker died; start a fresh pool next time and finish inline
+            _reset_pool()
+
+    return [hasher.encode(password, salt) for password, salt in zip(passwords, salts)]
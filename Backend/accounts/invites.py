@@ -0,0 +1,159 @@
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.tokens import default_token_generator
+from django.db import IntegrityError, transaction
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+from rest_framework import serializers
+from events.imports import UnreadableRow
+from .hashing import hash_passwords
+from .models import User
+
+
+class TeamInviteRowSerializer(serializers.Serializer):
+    """
+    One row of a bulk invite. Rows without a password become invite
+    accounts, which get a token to set their own password with.
+    """
+    email = serializers.EmailField()
+    name = serializers.CharField(max_length=255)
+    role = serializers.ChoiceField(choices=['Team Lead', 'Team Member'])
+    password = serializers.CharField(required=False, allow_blank=True, write_only=True)
+
+    def to_internal_value(self, data):
+        # CSV cells are always strings; treat empty cells as missing
+        if isinstance(data, dict):
+            data = {key: value for key, value in data.items() if value not in ('', None)}
+        return super().to_internal_value(data)
+
+
+def invite_token(user):
+    """The uid and token an invite account uses to set its password"""
+    return {
+        'uid': urlsafe_base64_encode(force_bytes(user.pk)),
+        'token': default_token_generator.make_token(user),
+    }
+
+
+class TeamInviter:
+    """
+    Create many team accounts in an organization at once.
+
+    Every row is validated first, with one query for emails that are
+    already taken, so no time is spent hashing rows that will be rejected.
+    Passwords are then hashed in parallel (see hash_passwords) and the
+    users inserted with bulk_create.
+    """
+    batch_size = 500
+
+    def __init__(self, organization):
+        self.organization = organization
+        self.errors = []
+
+    def run(self, rows):
+        valid = self.validate(rows)
+        users = self.build_users(valid)
+        created = self.insert(users)
+
+        return {
+            'created': len(created),
+            'failed': len(self.errors),
+            'errors': sorted(self.errors, key=lambda error: error['row']),
+            # Invite accounts need their token passed on to the invitee
+            'invited': [
+                {'id': user.id, 'email': user.email, **invite_token(user)}
+                for _, user in created if not user.has_usable_password()
+            ],
+            'users': [
+                {'id': user.id, 'email': user.email, 'name': user.name, 'role': user.role}
+                for _, user in created
+            ],
+        }
+
+    def validate(self, rows):
+        valid = []
+        seen = set()
+        for row_number, row in enumerate(rows, start=1):
+            if row_number > settings.TEAM_INVITE_MAX_ROWS:
+                raise serializers.ValidationError(
+                    f"At most {settings.TEAM_INVITE_MAX_ROWS} users can be invited at once"
+                )
+            if isinstance(row, UnreadableRow):
+                self.fail(row_number, {'non_field_errors': [row.reason]})
+                continue
+            if not isinstance(row, dict):
+                self.fail(row_number, {'non_field_errors': ['Row is not a valid object']})
+                continue
+
+            serializer = TeamInviteRowSerializer(data=row)
+            if not serializer.is_valid():
+                self.fail(row_number, serializer.errors)
+                continue
+
+            data = serializer.validated_data
+            data['email'] = User.objects.normalize_email(data['email'])
+            if data['email'].lower() in seen:
+                self.fail(row_number, {'email': ["Appears more than once in this invite"]})
+                continue
+            seen.add(data['email'].lower())
+            valid.append((row_number, data))
+
+        return self.drop_taken_emails(valid)
+
+    def drop_taken_emails(self, rows):
+        taken = set(User.objects.filter(
+            email__in=[data['email'] for _, data in rows]
+        ).values_list('email', flat=True))
+
+        remaining = []
+        for row_number, data in rows:
+            if data['email'] in taken:
+                self.fail(row_number, {'email': ["A user with this email already exists"]})
+            else:
+                remaining.append((row_number, data))
+        return remaining
+
+    def build_users(self, rows):
+        with_password = [(row_number, data) for row_number, data in rows if data.get('password')]
+        hashes = iter(hash_passwords(data['password'] for _, data in with_password))
+        hashed = {row_number: next(hashes) for row_number, _ in with_password}
+
+        users = []
+        for row_number, data in rows:
+            users.append((row_number, User(
+                email=data['email'],
+                name=data['name'],
+                role=data['role'],
+                organization=self.organization,
+                organization_name=self.organization.name,
+                # make_password(None) is an unusable password
+                password=hashed.get(row_number) or make_password(None),
+            )))
+        return users
+
+    def insert(self, users):
+        try:
+            with transaction.atomic():
+                User.objects.bulk_create(
+                    [user for _, user in users], batch_size=self.batch_size
+                )
+            return users
+        except IntegrityError:
+            pass
+
+        # Someone took one of the emails since we checked; drop those rows
+        taken = set(User.objects.filter(
+            email__in=[user.email for _, user in users]
+        ).values_list('email', flat=True))
+        remaining = []
+        for row_number, user in users:
+            if user.email in taken:
+                self.fail(row_number, {'email': ["A user with this email already exists"]})
+            else:
+                remaining.append((row_number, user))
+
+        User.objects.bulk_create([user for _, user in remaining], batch_size=self.batch_size)
+        return remaining
+
+    def fail(self, row_number, errors):
+        self.errors.append({'row': row_number, 'errors': errors})
@@ -0,0 +1,79 @@
+from django.core.management.base import BaseCommand, CommandError
+from accounts.models import Organization, OrganizationTeardown
+from accounts.teardown import claim, request_teardown, resumable, run_teardown
+
+
+class Command(BaseCommand):
+    help = (
+        "Run organization teardown jobs in the foreground: resume pending "
+        "jobs and jobs whose runner crashed, or queue and run a teardown "
+        "for the named organizations. Safe to run from cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--organization',
+            action='append',
+            dest='organizations',
+            help="Tear down this organization now (can be repeated)"
+        )
+        parser.add_argument(
+            '--include-failed',
+            action='store_true',
+            help="Also retry jobs that stopped with an error"
+        )
+        parser.add_argument('--batch-size', type=int, help="Rows per delete batch")
+        parser.add_argument(
+            '--list',
+            action='store_true',
+            help="Only show unfinished jobs and their progress"
+        )
+
+    def handle(self, *args, **options):
+        if options['list']:
+            jobs = OrganizationTeardown.objects.exclude(status='completed').order_by('created_at')
+            for job in jobs:
+                self.stdout.write(self.describe(job))
+            return
+
+        if options['organizations']:
+            job_ids = [
+                request_teardown(
+                    self.get_organization(name), requested_by='manage.py', background=False
+                ).id
+                for name in options['organizations']
+            ]
+        else:
+            job_ids = list(resumable(options['include_failed']).values_list('id', flat=True))
+
+        if not job_ids:
+            self.stdout.write("No teardown jobs to run")
+            return
+
+        for job_id in job_ids:
+            if not claim(job_id, options['include_failed']):
+                self.stdout.write(f"Job {job_id} is being run elsewhere; skipped")
+                continue
+            try:
+                job = run_teardown(
+                    job_id,
+                    batch_size=options['batch_size'],
+                    claimed=True,
+                    on_batch=lambda job: self.stdout.write(self.describe(job)),
+                )
+            except Exception as exc:
+                raise CommandError(f"Job {job_id} failed: {exc!r}")
+            self.stdout.write(self.style.SUCCESS(self.describe(job)))
+
+    @staticmethod
+    def get_organization(name):
+        try:
+            return Organization.objects.get(name=name)
+        except Organization.DoesNotExist:
+            raise CommandError(f"No organization named {name!r}")
+
+    @staticmethod
+    def describe(job):
+        progress = ', '.join(f'{name}={count}' for name, count in job.progress.items())
+        step = f" [{job.step}]" if job.step else ''
+        return f"#{job.id} {job.organization_name}: {job.status}{step} {progress}".rstrip()
@@ -0,0 +1,36 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def link_users(apps, schema_editor):
+    Organization = apps.get_model('accounts', 'Organization')
+    User = apps.get_model('accounts', 'User')
+
+    names = User.objects.order_by().values_list('organization_name', flat=True).distinct()
+    for name in names:
+        organization, _ = Organization.objects.get_or_create(name=name)
+        User.objects.filter(organization_name=name).update(organization=organization)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0007_organization_teardown'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Organization',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='organization',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='users', to='accounts.organization'),
+        ),
+        migrations.RunPython(link_users, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_organization'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='user',
+            name='organization',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='users', to='accounts.organization'),
+        ),
+        migrations.RemoveIndex(
+            model_name='user',
+            name='user_org_role_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='user',
+            name='user_org_joined_idx',
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['organization', 'role'], name='user_org_id_role_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['organization', 'date_joined'], name='user_org_id_joined_idx'),
+        ),
+    ]
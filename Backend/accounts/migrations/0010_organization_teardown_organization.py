@@ -0,0 +1,37 @@
+# Generated by Django 5.2 on 2026-10-18 14:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def link_unfinished_jobs(apps, schema_editor):
+    # Completed jobs stay unlinked: their organization is gone
+    Organization = apps.get_model('accounts', 'Organization')
+    OrganizationTeardown = apps.get_model('accounts', 'OrganizationTeardown')
+
+    jobs = OrganizationTeardown.objects.exclude(status='completed')
+    for name in jobs.order_by().values_list('organization_name', flat=True).distinct():
+        organization = Organization.objects.filter(name=name).first()
+        if organization is not None:
+            jobs.filter(organization_name=name).update(organization=organization)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0009_user_organization_required'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='organizationteardown',
+            name='organization',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='teardowns', to='accounts.organization'),
+        ),
+        migrations.AlterField(
+            model_name='organizationteardown',
+            name='organization_name',
+            field=models.CharField(max_length=255),
+        ),
+        migrations.RunPython(link_unfinished_jobs, migrations.RunPython.noop),
+    ]
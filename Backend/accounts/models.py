@@ -37,6 +37,27 @@ class UserManager(BaseUserManager):
         return user
 
 
+class OrganizationManager(models.Manager):
+    def for_name(self, name):
+        """The organization called `name`, created on first use"""
+        return self.get_or_create(name=name)[0]
+
+
+class Organization(models.Model):
+    """
+    A tenant. Users and events point at it with an integer key, which is
+    what every organization-scoped query filters and joins on; its name
+    is also copied onto them as `organization_name` for display.
+    """
+    name = models.CharField(max_length=255, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = OrganizationManager()
+
+    def __str__(self):
+        return self.name
+
+
 class User(AbstractBaseUser, PermissionsMixin):
     ROLE_CHOICES = [
         ('Account Manager', 'Account Manager'),
@@ -51,6 +72,11 @@ class User(AbstractBaseUser, PermissionsMixin):
 
     email = models.EmailField(unique=True)
     name = models.CharField(max_length=255)
+    organization = models.ForeignKey(
+        Organization,
+        related_name='users',
+        on_delete=models.PROTECT
+    )
     organization_name = models.CharField(max_length=255)
     role = models.CharField(
         max_length=50,
@@ -73,11 +99,56 @@ class User(AbstractBaseUser, PermissionsMixin):
     date_joined = models.DateTimeField(default=timezone.now)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Bumped whenever a field copied into access tokens changes, so tokens
+    # carrying the old values stop being trusted
+    token_version = models.PositiveIntegerField(default=0)
+
     objects = UserManager()
 
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['name', 'organization_name']
 
+    # Fields copied into JWT claims; see token_claims(). Changing one of
+    # them (or is_active) through save() bumps token_version. QuerySet
+    # .update() skips save(), so a bulk update of these columns must bump
+    # token_version itself and call forget_token_version(), or tokens keep
+    # carrying the old values.
+    TOKEN_CLAIM_FIELDS = ('name', 'role', 'organization_id', 'organization_name', 'email')
+    _TOKEN_TRACKED_FIELDS = TOKEN_CLAIM_FIELDS + ('is_active',)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remembered so a change to token fields can be told apart on save
+        instance._loaded_token_fields = instance._token_fields()
+        return instance
+
+    def _token_fields(self):
+        return {
+            name: self.__dict__[name]
+            for name in self._TOKEN_TRACKED_FIELDS if name in self.__dict__
+        }
+
+    def save(self, *args, **kwargs):
+        if self.organization_id is None and self.organization_name:
+            self.organization = Organization.objects.for_name(self.organization_name)
+
+        loaded = getattr(self, '_loaded_token_fields', None)
+        if not self._state.adding and loaded is not None:
+            current = self._token_fields()
+            if any(current.get(name, value) != value for name, value in loaded.items()):
+                self.token_version += 1
+                if kwargs.get('update_fields') is not None:
+                    kwargs['update_fields'] = {*kwargs['update_fields'], 'token_version'}
+        super().save(*args, **kwargs)
+        self._loaded_token_fields = self._token_fields()
+
+    def token_claims(self):
+        """The user fields carried in access tokens, with their version"""
+        claims = {name: getattr(self, name) for name in self.TOKEN_CLAIM_FIELDS}
+        claims['token_version'] = self.token_version
+        return claims
+
     def __str__(self):
         return f"{self.name} ({self.organization_name})"
 
@@ -89,4 +160,57 @@ class User(AbstractBaseUser, PermissionsMixin):
         return self.role == 'Team Lead'
 
     def is_team_member(self):
-        return self.role == 'Team Member'
\ No newline at end of file
+        return self.role == 'Team Member'
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['organization', 'role'],
+                name='user_org_id_role_idx'
+            ),
+            models.Index(
+                fields=['organization', 'date_joined'],
+                name='user_org_id_joined_idx'
+            ),
+        ]
+
+
+class OrganizationTeardown(models.Model):
+    """
+    A background deletion of everything belonging to an organization.
+
+    Rows are deleted in batches, child tables first (see
+    accounts.teardown); `progress` counts what each step has removed and
+    is saved with every batch, so a job interrupted by a crash carries on
+    from where it stopped.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+
+    # Cleared when the job deletes the organization
+    organization = models.ForeignKey(
+        Organization,
+        related_name='teardowns',
+        null=True,
+        on_delete=models.SET_NULL
+    )
+    # The name, for the record once the organization is gone
+    organization_name = models.CharField(max_length=255)
+    # Kept as text; the requesting user is deleted by the job
+    requested_by = models.CharField(max_length=254, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    step = models.CharField(max_length=50, blank=True)
+    progress = models.JSONField(default=dict, blank=True)
+    error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Doubles as a heartbeat: every batch saves the job
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Teardown of {self.organization_name} ({self.status})"
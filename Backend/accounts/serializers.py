@@ -1,8 +1,10 @@
 from rest_framework import serializers
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from .models import User
-from google.oauth2 import id_token
-from google.auth.transport import requests as google_requests
+from django.contrib.auth.tokens import default_token_generator
+from django.utils.http import urlsafe_base64_decode
+from google.auth.exceptions import TransportError
+from .google import verify_google_id_token
 from django.conf import settings
 
 
@@ -30,10 +32,9 @@ class MyTokenObtainPairSerializer(TokenObtainPairSerializer):
     def get_token(cls, user):
         token = super().get_token(user)
 
-        # Add custom claims
-        token['name'] = user.name
-        token['role'] = user.role
-        token['organization_name'] = user.organization_name
+        # Add custom claims; ClaimsJWTAuthentication builds the user from them
+        for claim, value in user.token_claims().items():
+            token[claim] = value
         return token
 
     def validate(self, attrs):
@@ -57,15 +58,12 @@ class GoogleLoginSerializer(serializers.Serializer):
         # If token is provided, verify it with Google
         if attrs.get('token'):
             try:
-                idinfo = id_token.verify_oauth2_token(
-                    attrs['token'], 
-                    google_requests.Request(), 
+                # Certificates are cached process-wide; see accounts.google
+                idinfo = verify_google_id_token(
+                    attrs['token'],
                     settings.GOOGLE_OAUTH_CLIENT_ID
                 )
                 
-                if idinfo['iss'] not in ['accounts.google.com', 'https://accounts.google.com']:
-                    raise serializers.ValidationError('Wrong issuer.')
-                
                 attrs['email'] = idinfo.get('email')
                 attrs['name'] = idinfo.get('name', '')
                 attrs['google_id'] = idinfo.get('sub')
@@ -73,6 +71,8 @@ class GoogleLoginSerializer(serializers.Serializer):
                 
             except ValueError:
                 raise serializers.ValidationError('Invalid Google token')
+            except TransportError:
+                raise serializers.ValidationError('Could not verify the Google token, try again')
         
         # If email and google_id are provided directly (from access token flow)
         elif attrs.get('email') and attrs.get('google_id'):
@@ -123,4 +123,30 @@ class TeamUserListSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ('id', 'email', 'name', 'role', 'is_active', 'date_joined', 'auth_provider')
-        read_only_fields = fields
\ No newline at end of file
+        read_only_fields = fields
+
+class AcceptInviteSerializer(serializers.Serializer):
+    """Set the first password of an invite account from its uid and token"""
+    uid = serializers.CharField()
+    token = serializers.CharField()
+    password = serializers.CharField(write_only=True)
+
+    def validate(self, attrs):
+        try:
+            user = User.objects.get(pk=urlsafe_base64_decode(attrs['uid']).decode())
+        except (ValueError, User.DoesNotExist):
+            user = None
+
+        # The token is tied to the unusable password, so it stops working
+        # once a password is set
+        if user is None or not default_token_generator.check_token(user, attrs['token']):
+            raise serializers.ValidationError('Invalid or expired invite')
+
+        attrs['user'] = user
+        return attrs
+
+    def save(self):
+        user = self.validated_data['user']
+        user.set_password(self.validated_data['password'])
+        user.save(update_fields=['password'])
+        return user
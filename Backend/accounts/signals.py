@@ -0,0 +1,40 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from events.versions import bump_versions
+from .authentication import forget_token_version
+from .dashboard import invalidate_dashboard
+from .models import User
+
+
+def _invalidate_on_commit(organization_id):
+    if organization_id:
+        transaction.on_commit(lambda: invalidate_dashboard(organization_id))
+
+
+def user_changed(sender, instance, **kwargs):
+    user_id = instance.pk
+    transaction.on_commit(lambda: forget_token_version(user_id))
+
+    organization_id = instance.organization_id
+    _invalidate_on_commit(organization_id)
+    if organization_id:
+        # Team counts on the dashboard depend on users
+        transaction.on_commit(lambda: bump_versions(organization_id=organization_id))
+
+
+def event_changed(sender, instance, **kwargs):
+    _invalidate_on_commit(instance.organization_id)
+
+
+def event_child_changed(sender, instance, **kwargs):
+    """Expenses and checklist items only know their event, so look up its org"""
+    from events.signals import event_organization_id
+
+    _invalidate_on_commit(event_organization_id(instance))
+
+
+for signal in (post_save, post_delete):
+    signal.connect(user_changed, sender=User)
+    signal.connect(event_changed, sender='events.Event')
+    signal.connect(event_child_changed, sender='events.Expense')
+    signal.connect(event_child_changed, sender='events.EventChecklist')
@@ -0,0 +1,158 @@
+import threading
+from datetime import timedelta
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+from events.access import invalidate_org_access
+from events.models import Event, BudgetItem, Expense, EventChecklist, EventTemplate
+from events.versions import bump_versions
+from .authentication import forget_token_version
+from .dashboard import invalidate_dashboard
+from .models import Organization, User, OrganizationTeardown
+
+
+def _steps(organization_id):
+    """
+    (name, queryset) for each table, children before their parents.
+
+    Each batch goes through the normal delete, so signals keep event
+    rollups, access sets and version stamps in step as rows go. Starting
+    from the leaves keeps every batch small: by the time a table is
+    reached, nothing else points at its rows, so the delete collector has
+    no cascade to load. Child rows bring their event along, which the
+    signals read, in one query per batch.
+    """
+    events = Q(event__organization_id=organization_id)
+    return [
+        ('expenses', Expense.objects.filter(events).prefetch_related('event')),
+        ('checklist_items', EventChecklist.objects.filter(events).prefetch_related('event')),
+        ('budget_items', BudgetItem.objects.filter(events).prefetch_related('event')),
+        ('events', Event.objects.filter(organization_id=organization_id)),
+        ('event_templates', EventTemplate.objects.filter(organization_id=organization_id)),
+        ('users', User.objects.filter(organization_id=organization_id)),
+    ]
+
+
+def request_teardown(organization, requested_by='', background=True):
+    """
+    Lock the organization out and queue its deletion; returns the job.
+
+    Users are deactivated at once, so their tokens stop working on the
+    next request. With `background`, the data is then deleted on a thread
+    once the transaction commits; otherwise the caller runs the job. A
+    repeat request returns the unfinished job, putting a failed one back
+    in the queue.
+    """
+    job = OrganizationTeardown.objects.filter(
+        organization=organization, status__in=('pending', 'running', 'failed')
+    ).first()
+    if job is None:
+        job = OrganizationTeardown.objects.create(
+            organization=organization,
+            organization_name=organization.name,
+            requested_by=requested_by
+        )
+    elif job.status == 'failed':
+        job.status = 'pending'
+        job.error = ''
+        job.save(update_fields=['status', 'error', 'updated_at'])
+
+    user_ids = list(User.objects.filter(
+        organization=organization
+    ).values_list('id', flat=True))
+    User.objects.filter(id__in=user_ids).update(is_active=False)
+    transaction.on_commit(lambda: forget_token_version(*user_ids))
+
+    if background:
+        job_id = job.id
+        transaction.on_commit(lambda: start_teardown(job_id))
+    return job
+
+
+def start_teardown(job_id):
+    thread = threading.Thread(target=_run_in_thread, args=(job_id,), daemon=True)
+    thread.start()
+    return thread
+
+
+def _run_in_thread(job_id):
+    try:
+        run_teardown(job_id)
+    finally:
+        connection.close()
+
+
+def resumable(include_failed=False):
+    """
+    Jobs a runner may pick up: pending ones, and running ones whose
+    heartbeat is older than ORGANIZATION_TEARDOWN_STALE_AFTER, which are
+    assumed to have crashed.
+    """
+    stale = timezone.now() - timedelta(seconds=settings.ORGANIZATION_TEARDOWN_STALE_AFTER)
+    condition = Q(status='pending') | Q(status='running', updated_at__lt=stale)
+    if include_failed:
+        condition |= Q(status='failed')
+    return OrganizationTeardown.objects.filter(condition)
+
+
+def claim(job_id, include_failed=False):
+    """Mark a resumable job as running; False if another runner holds it"""
+    return resumable(include_failed).filter(pk=job_id).update(
+        status='running', error='', updated_at=timezone.now()
+    ) == 1
+
+
+def run_teardown(job_id, batch_size=None, claimed=False, on_batch=None):
+    """
+    Delete the job's organization batch by batch, resuming where it
+    stopped, and finally the organization itself. `on_batch(job)` is
+    called after each committed batch.
+    """
+    if not claimed and not claim(job_id):
+        return None
+
+    batch_size = batch_size or settings.ORGANIZATION_TEARDOWN_BATCH_SIZE
+    job = OrganizationTeardown.objects.get(pk=job_id)
+    # Cleared once the organization row goes; a job resumed after that
+    # has nothing left to delete
+    organization_id = job.organization_id
+
+    try:
+        steps = _steps(organization_id) if organization_id else []
+        for name, queryset in steps:
+            job.step = name
+            while True:
+                ids = list(queryset.order_by().values_list('pk', flat=True)[:batch_size])
+                if not ids:
+                    break
+                with transaction.atomic():
+                    deleted = queryset.filter(pk__in=ids).delete()[1]
+                    # Saved with the batch, so progress never runs ahead of it
+                    job.progress[name] = (
+                        job.progress.get(name, 0) + deleted.get(queryset.model._meta.label, 0)
+                    )
+                    job.save(update_fields=['step', 'progress', 'updated_at'])
+                if on_batch:
+                    on_batch(job)
+
+        if organization_id:
+            job.step = 'organization'
+            # Raises ProtectedError if anything was added to the
+            # organization since its step ran; the job fails and can be
+            # retried
+            Organization.objects.filter(pk=organization_id).delete()
+            invalidate_org_access(organization_id)
+            invalidate_dashboard(organization_id)
+            bump_versions(organization_id=organization_id)
+    except Exception as exc:
+        job.status = 'failed'
+        job.error = repr(exc)
+        job.save(update_fields=['status', 'step', 'error', 'updated_at'])
+        raise
+
+    job.status = 'completed'
+    job.step = ''
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'step', 'finished_at', 'updated_at'])
+    return job
@@ -1,3 +1,658 @@
-from django.test import TestCase
+import json
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+import rsa
+from django.conf import settings
+from django.contrib.auth.hashers import check_password
+from django.core.cache import caches
+from django.core.management import CommandError, call_command
+from django.db import DatabaseError, connection
+from django.db.migrations.executor import MigrationExecutor
+from django.db.models import ProtectedError
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from google.auth import crypt, jwt
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from events.management.commands._benchmark import seed_organization
+from events.models import Event, BudgetItem, Expense, EventChecklist, EventTemplate
+from . import hashing
+from .authentication import ClaimsJWTAuthentication, current_token_version, user_rows
+from .dashboard import get_dashboard_stats
+from .google import GoogleCertificates, verify_google_id_token
+from .hashing import hash_passwords
+from .models import Organization, OrganizationTeardown, User
+from .serializers import MyTokenObtainPairSerializer
+from .teardown import request_teardown, run_teardown
 
-# Create your tests here.
+
+def clear_caches():
+    # Cached access sets, version stamps and token versions outlive the
+    # test transaction; start every test from empty caches
+    for cache in caches.all():
+        cache.clear()
+
+
+class Interrupted(Exception):
+    pass
+
+
+class OrganizationTeardownTests(TestCase):
+    def setUp(self):
+        clear_caches()
+        self.manager, _, _ = seed_organization(
+            'Gone', events=3, items_per_event=2, expenses_per_event=3,
+            tasks_per_event=2, members=3
+        )
+        self.kept, _, _ = seed_organization(
+            'Kept', events=1, items_per_event=1, expenses_per_event=1,
+            tasks_per_event=1, members=1
+        )
+        self.gone = Organization.objects.get(name='Gone')
+        self.expenses = Expense.objects.filter(event__organization__name='Gone').count()
+        self.users = User.objects.filter(organization__name='Gone').count()
+
+    def run_command(self, *args):
+        out = StringIO()
+        call_command('teardown_organizations', *args, stdout=out)
+        return out.getvalue()
+
+    def assert_torn_down(self):
+        self.assertFalse(Organization.objects.filter(name='Gone').exists())
+        self.assertFalse(User.objects.filter(organization_name='Gone').exists())
+        self.assertFalse(Event.objects.filter(organization_name='Gone').exists())
+        for model in (Expense, BudgetItem, EventChecklist):
+            self.assertFalse(model.objects.filter(event__organization_name='Gone').exists())
+
+        # The other organization is untouched
+        self.assertTrue(User.objects.filter(pk=self.kept.pk, is_active=True).exists())
+        self.assertEqual(Event.objects.filter(organization_name='Kept').count(), 1)
+
+    def test_command_deletes_children_before_users(self):
+        output = self.run_command('--organization', 'Gone', '--batch-size', '2')
+
+        steps = list(dict.fromkeys(re.findall(r'\[(\w+)\]', output)))
+        self.assertEqual(steps, ['expenses', 'checklist_items', 'budget_items', 'events', 'users'])
+        self.assert_torn_down()
+
+        job = OrganizationTeardown.objects.get()
+        self.assertEqual(job.status, 'completed')
+        self.assertEqual(job.progress['expenses'], self.expenses)
+        self.assertEqual(job.progress['users'], self.users)
+
+    def test_interrupted_job_resumes(self):
+        job = request_teardown(self.gone, background=False)
+
+        def crash(job):
+            raise Interrupted
+
+        with self.assertRaises(Interrupted):
+            run_teardown(job.id, batch_size=2, on_batch=crash)
+
+        # Make it look like a runner that died mid-batch long ago
+        OrganizationTeardown.objects.filter(pk=job.pk).update(
+            status='running', updated_at=timezone.now() - timedelta(hours=1)
+        )
+        self.assertEqual(
+            Expense.objects.filter(event__organization_name='Gone').count(),
+            self.expenses - 2
+        )
+
+        self.run_command('--batch-size', '2')
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'completed')
+        self.assertEqual(job.progress['expenses'], self.expenses)
+        self.assert_torn_down()
+
+    def test_batches_commit_with_their_progress(self):
+        job = request_teardown(self.gone, background=False)
+        seen = []
+
+        def check(job):
+            if job.step == 'expenses':
+                remaining = Expense.objects.filter(event__organization=self.gone).count()
+                seen.append((job.progress['expenses'], remaining))
+
+        run_teardown(job.id, batch_size=4, on_batch=check)
+
+        # 9 expenses: two full batches and a partial one
+        self.assertEqual(seen, [(4, 5), (8, 1), (9, 0)])
+        self.assert_torn_down()
+
+    def test_failed_organization_delete_can_be_retried(self):
+        job = request_teardown(self.gone, background=False)
+
+        def add_template(job):
+            # Written after its step ran, so it protects the organization
+            if job.step == 'users' and not EventTemplate.objects.filter(name='Late').exists():
+                EventTemplate.objects.create(
+                    name='Late', organization=self.gone,
+                    organization_name='Gone', created_by=self.kept
+                )
+
+        with self.assertRaises(ProtectedError):
+            run_teardown(job.id, batch_size=2, on_batch=add_template)
+
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.step), ('failed', 'organization'))
+        self.assertIn('ProtectedError', job.error)
+        self.assertTrue(Organization.objects.filter(pk=self.gone.pk).exists())
+
+        # A repeat request queues the failed job again
+        retry = request_teardown(self.gone, background=False)
+        self.assertEqual((retry.pk, retry.status), (job.pk, 'pending'))
+
+        self.run_command()
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'completed')
+        self.assertEqual(job.progress['event_templates'], 1)
+        self.assertIsNone(job.organization_id)
+        self.assert_torn_down()
+
+    def test_unknown_organization_is_a_command_error(self):
+        with self.assertRaises(CommandError):
+            self.run_command('--organization', 'Nobody')
+
+    def test_running_job_is_not_resumed(self):
+        job = request_teardown(self.gone, background=False)
+        OrganizationTeardown.objects.filter(pk=job.pk).update(status='running')
+
+        output = self.run_command()
+
+        self.assertIn('No teardown jobs to run', output)
+        self.assertTrue(User.objects.filter(pk=self.manager.pk).exists())
+
+    def test_request_forgets_token_versions(self):
+        self.assertEqual(current_token_version(self.manager.id), (0, True))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            request_teardown(self.gone, background=False)
+
+        with self.assertRaises(AuthenticationFailed):
+            current_token_version(self.manager.id)
+        self.assertEqual(current_token_version(self.kept.id), (0, True))
+
+
+class ClaimsJWTAuthenticationTests(TestCase):
+    def setUp(self):
+        clear_caches()
+        user_rows.clear()
+        self.user = User.objects.create_user(
+            email='lead@example.com',
+            name='Lead',
+            organization_name='Acme',
+            role='Team Member'
+        )
+        self.token = self.access_token(self.user)
+
+    def access_token(self, user):
+        return str(MyTokenObtainPairSerializer.get_token(user).access_token)
+
+    def authenticate(self, token=None):
+        request = APIRequestFactory().get(
+            '/', HTTP_AUTHORIZATION=f'Bearer {token or self.token}'
+        )
+        user, _ = ClaimsJWTAuthentication().authenticate(request)
+        return user
+
+    def reload(self):
+        # A row loaded from the database, as views edit users
+        return User.objects.get(pk=self.user.pk)
+
+    def test_current_token_builds_user_from_claims_without_queries(self):
+        self.authenticate()  # caches the token version
+
+        with self.assertNumQueries(0):
+            user = self.authenticate()
+            self.assertEqual(
+                (user.id, user.email, user.name, user.role),
+                (self.user.id, 'lead@example.com', 'Lead', 'Team Member')
+            )
+            self.assertEqual(user.organization_id, self.user.organization_id)
+            self.assertEqual(user.organization_name, 'Acme')
+            self.assertTrue(user.is_active)
+
+    def test_role_change_falls_back_to_the_database(self):
+        user = self.reload()
+        user.role = 'Team Lead'
+        with self.captureOnCommitCallbacks(execute=True):
+            user.save()
+
+        self.assertEqual(self.reload().token_version, 1)
+        self.assertEqual(self.authenticate().role, 'Team Lead')
+
+        # A token issued after the change is trusted again
+        token = self.access_token(self.reload())
+        with self.assertNumQueries(0):
+            self.assertEqual(self.authenticate(token).role, 'Team Lead')
+
+    def test_organization_change_falls_back_to_the_database(self):
+        other = Organization.objects.for_name('Globex')
+        user = self.reload()
+        user.organization = other
+        user.organization_name = other.name
+        with self.captureOnCommitCallbacks(execute=True):
+            user.save(update_fields=['organization', 'organization_name'])
+
+        self.assertEqual(self.reload().token_version, 1)
+        user = self.authenticate()
+        self.assertEqual(user.organization_id, other.id)
+        self.assertEqual(user.organization_name, 'Globex')
+
+    def test_unrelated_change_keeps_tokens_current(self):
+        user = self.reload()
+        user.google_id = 'abc'
+        with self.captureOnCommitCallbacks(execute=True):
+            user.save()
+
+        self.assertEqual(self.reload().token_version, 0)
+        self.authenticate()
+        with self.assertNumQueries(0):
+            self.authenticate()
+
+    def test_deactivated_user_is_refused(self):
+        self.authenticate()
+        user = self.reload()
+        user.is_active = False
+        with self.captureOnCommitCallbacks(execute=True):
+            user.save()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    def test_deleted_user_is_refused(self):
+        self.authenticate()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.reload().delete()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+
+    def test_token_versions_live_in_the_shared_cache(self):
+        self.authenticate()
+
+        self.assertEqual(
+            caches['versions'].get(f'token-version:{self.user.id}'), (0, True)
+        )
+
+    @override_settings(VERSION_CACHE_SHARED=False)
+    def test_unshared_cache_reads_the_version_every_request(self):
+        self.authenticate()
+        # No signal, so nothing would drop a cached entry
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+class DashboardStatsTests(TestCase):
+    def setUp(self):
+        clear_caches()
+        self.user = User.objects.create_user(
+            email='manager@example.com',
+            name='Manager',
+            organization_name='Acme',
+        )
+        Event.objects.create(
+            name='Launch',
+            location='Nairobi',
+            event_date=timezone.now().date() + timedelta(days=10),
+            expected_budget=Decimal('1000'),
+            organization_name='Acme',
+            created_by=self.user
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = reverse('dashboard_stats')
+
+    def test_warm_cache_runs_no_queries(self):
+        first = self.client.get(self.url)
+        self.assertEqual(first.json()['stats']['active_events']['value'], 1)
+
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url)
+        self.assertEqual(second.json(), first.json())
+
+    def test_failed_query_is_logged_and_degrades(self):
+        with mock.patch('events.progress.checklist_totals', side_effect=DatabaseError):
+            with self.assertLogs('accounts.dashboard', 'ERROR') as logs:
+                stats = get_dashboard_stats(self.user.organization_id)
+
+        self.assertIn('Error fetching task counts', logs.output[0])
+        self.assertEqual(stats['stats']['pending_tasks']['value'], 0)
+        self.assertEqual(stats['stats']['active_events']['value'], 1)
+
+
+class FakeCertsTransport:
+    """Stands in for google.auth's Request, counting certificate fetches"""
+
+    def __init__(self, certs, max_age=3600, delay=0):
+        self.certs = certs
+        self.max_age = max_age
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, url, method='GET', **kwargs):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        return mock.Mock(
+            status=200,
+            data=json.dumps(self.certs).encode(),
+            headers={'Cache-Control': f'public, max-age={self.max_age}'}
+        )
+
+
+class GoogleIdTokenTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        public_key, private_key = rsa.newkeys(1024)
+        cls.signer = crypt.RSASigner.from_string(private_key.save_pkcs1(), 'key-1')
+        cls.certs = {'key-1': public_key.save_pkcs1().decode()}
+
+    def setUp(self):
+        self.transport = FakeCertsTransport(self.certs)
+        self.certificates = GoogleCertificates('https://certs.test/', request=self.transport)
+
+    def id_token(self, **claims):
+        now = int(time.time())
+        payload = {
+            'iss': 'https://accounts.google.com',
+            'aud': settings.GOOGLE_OAUTH_CLIENT_ID,
+            'sub': 'google-1',
+            'email': 'new@example.com',
+            'email_verified': True,
+            'name': 'New',
+            'iat': now,
+            'exp': now + 600,
+            **claims,
+        }
+        return jwt.encode(self.signer, payload).decode()
+
+    def verify(self, token):
+        return verify_google_id_token(token, settings.GOOGLE_OAUTH_CLIENT_ID, self.certificates)
+
+    def login(self, token):
+        with mock.patch('accounts.google.get_google_certificates', return_value=self.certificates):
+            return APIClient().post(
+                reverse('google_login'), {'token': token, 'organization_name': 'Acme'}
+            )
+
+    def test_valid_token_logs_in(self):
+        self.assertEqual(self.verify(self.id_token())['sub'], 'google-1')
+
+        response = self.login(self.id_token())
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('access', response.json())
+        user = User.objects.get(email='new@example.com')
+        self.assertEqual((user.google_id, user.auth_provider), ('google-1', 'google'))
+        self.assertEqual(self.transport.calls, 1)
+
+    def test_wrong_audience_is_refused(self):
+        token = self.id_token(aud='someone-else.apps.googleusercontent.com')
+
+        with self.assertRaises(ValueError):
+            self.verify(token)
+        self.assertEqual(self.login(token).status_code, 400)
+        self.assertFalse(User.objects.filter(email='new@example.com').exists())
+
+    def test_expired_token_is_refused(self):
+        now = int(time.time())
+        token = self.id_token(iat=now - 7200, exp=now - 3600)
+
+        with self.assertRaises(ValueError):
+            self.verify(token)
+        self.assertEqual(self.login(token).status_code, 400)
+
+    def test_wrong_issuer_is_refused(self):
+        with self.assertRaises(ValueError):
+            self.verify(self.id_token(iss='https://issuer.example.com'))
+
+    def test_concurrent_cold_logins_fetch_once(self):
+        self.transport.delay = 0.05
+        tokens = [self.id_token(sub=f'google-{n}') for n in range(8)]
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            claims = list(pool.map(self.verify, tokens))
+
+        self.assertEqual([idinfo['sub'] for idinfo in claims], [f'google-{n}' for n in range(8)])
+        self.assertEqual(self.transport.calls, 1)
+
+    @mock.patch('accounts.google.time')
+    def test_certificates_are_refreshed_in_the_background(self, clock):
+        clock.monotonic.return_value = 1000
+        self.certificates.get('key-1')
+        clock.monotonic.return_value = 1000 + 1800
+        self.certificates.get('key-1')
+        self.assertEqual(self.transport.calls, 1)
+
+        # Past 90% of max-age: served from cache while a thread refetches
+        clock.monotonic.return_value = 1000 + 3300
+        self.assertEqual(self.certificates.get('key-1'), self.certs)
+        deadline = time.monotonic() + 5
+        while self.transport.calls < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.transport.calls, 2)
+
+    @mock.patch('accounts.google.time')
+    def test_expired_certificates_are_fetched_again(self, clock):
+        clock.monotonic.return_value = 1000
+        self.certificates.get('key-1')
+
+        clock.monotonic.return_value = 1000 + 3600
+        self.certificates.get('key-1')
+
+        self.assertEqual(self.transport.calls, 2)
+
+    @mock.patch('accounts.google.time')
+    def test_unknown_key_id_refetches_at_most_once_a_minute(self, clock):
+        clock.monotonic.return_value = 1000
+        self.certificates.get('key-1')
+
+        clock.monotonic.return_value = 1030
+        self.certificates.get('rotated')
+        self.assertEqual(self.transport.calls, 1)
+
+        clock.monotonic.return_value = 1060
+        self.certificates.get('rotated')
+        self.assertEqual(self.transport.calls, 2)
+
+
+class TeamInviteTests(TestCase):
+    def setUp(self):
+        clear_caches()
+        self.manager = User.objects.create_user(
+            email='manager@example.com',
+            name='Manager',
+            organization_name='Acme',
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.manager)
+
+    def invite_csv(self, lines):
+        body = b'\r\n'.join([b'email,name,role,password', *lines]) + b'\r\n'
+        return self.client.post(reverse('bulk_invite_team'), body, content_type='text/csv')
+
+    def test_csv_rows_are_created_or_reported(self):
+        response = self.invite_csv([
+            b'lead@example.com,Lead,Team Lead,Str0ng-passphrase',
+            b'LEAD@Example.com,Lead Again,Team Member,',
+            b'not-an-email,Bad,Team Member,',
+            b'member@example.com,Member,Team Member,',
+            b'manager@example.com,Taken,Team Member,',
+            b'caf\xe9@example.com,Latin-1,Team Member,',
+            b'guest@example.com,Guest,Guest,',
+        ])
+
+        self.assertEqual(response.status_code, 201)
+        report = response.json()
+        self.assertEqual((report['created'], report['failed']), (2, 5))
+        self.assertEqual(
+            {error['row']: list(error['errors']) for error in report['errors']},
+            {2: ['email'], 3: ['email'], 5: ['email'], 6: ['non_field_errors'], 7: ['role']}
+        )
+        self.assertEqual(
+            report['errors'][0]['errors']['email'], ["Appears more than once in this invite"]
+        )
+        self.assertEqual(
+            [user['email'] for user in report['users']],
+            ['lead@example.com', 'member@example.com']
+        )
+        self.assertEqual([user['email'] for user in report['invited']], ['member@example.com'])
+
+        lead = User.objects.get(email='lead@example.com')
+        self.assertTrue(lead.check_password('Str0ng-passphrase'))
+        self.assertEqual((lead.organization_id, lead.role), (self.manager.organization_id, 'Team Lead'))
+        self.assertFalse(User.objects.get(email='member@example.com').has_usable_password())
+
+    def test_no_valid_rows_is_a_bad_request(self):
+        response = self.invite_csv([b'manager@example.com,Taken,Team Member,'])
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['created'], 0)
+
+    def test_accepted_invite_sets_a_usable_password(self):
+        report = self.invite_csv([b'member@example.com,Member,Team Member,']).json()
+        invite = report['invited'][0]
+        accept = {'uid': invite['uid'], 'token': invite['token'], 'password': 'Str0ng-passphrase'}
+
+        response = APIClient().post(reverse('accept_invite'), accept)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('access', response.json())
+        member = User.objects.get(email='member@example.com')
+        self.assertTrue(member.check_password('Str0ng-passphrase'))
+        login = APIClient().post(
+            reverse('token_obtain_pair'),
+            {'email': 'member@example.com', 'password': 'Str0ng-passphrase'}
+        )
+        self.assertEqual(login.status_code, 200)
+
+        # The token only works while the password is unusable
+        accept['password'] = 'Another-passphrase1'
+        self.assertEqual(APIClient().post(reverse('accept_invite'), accept).status_code, 400)
+
+
+@override_settings(PASSWORD_HASHING_POOL_MIN_BATCH=2, PASSWORD_HASHING_WORKERS=2)
+class HashPasswordsTests(SimpleTestCase):
+    def tearDown(self):
+        if hashing._pool is not None:
+            hashing._pool.shutdown()
+        hashing._reset_pool()
+
+    def test_pooled_hashes_check_out(self):
+        passwords = ['first-passphrase', 'second-passphrase', 'first-passphrase']
+
+        encoded = hash_passwords(passwords)
+
+        self.assertIsNotNone(hashing._pool)
+        self.assertTrue(all(map(check_password, passwords, encoded)))
+        # Each hash gets its own salt
+        self.assertNotEqual(encoded[0], encoded[2])
+
+    def test_small_batches_are_hashed_inline(self):
+        encoded = hash_passwords(['only-passphrase'])
+
+        self.assertIsNone(hashing._pool)
+        self.assertTrue(check_password('only-passphrase', encoded[0]))
+
+    def test_broken_pool_falls_back_to_inline(self):
+        broken = mock.Mock()
+        broken.map.side_effect = BrokenProcessPool
+        hashing._pool = broken
+
+        encoded = hash_passwords(['first-passphrase', 'second-passphrase'])
+
+        self.assertIsNone(hashing._pool)
+        self.assertTrue(check_password('second-passphrase', encoded[1]))
+
+
+class OrganizationBackfillMigrationTests(TransactionTestCase):
+    before = [('accounts', '0007_organization_teardown'), ('events', '0009_eventtemplate')]
+    after = [
+        ('accounts', '0010_organization_teardown_organization'),
+        ('events', '0010_event_organization'),
+    ]
+    names = {
+        'a@example.com': 'Acme',
+        'b@example.com': 'Acme',
+        # Tenants were told apart by exact name, so these stay separate
+        # organizations rather than being merged into Acme
+        'c@example.com': 'acme',
+        'd@example.com': ' Acme ',
+        'e@example.com': 'Globex',
+    }
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def setUp(self):
+        apps = self.migrate(self.before)
+        User = apps.get_model('accounts', 'User')
+        Event = apps.get_model('events', 'Event')
+        OrganizationTeardown = apps.get_model('accounts', 'OrganizationTeardown')
+
+        for email, name in self.names.items():
+            user = User.objects.create(
+                email=email, name=email, organization_name=name, password='!'
+            )
+            Event.objects.create(
+                name=f'{name} launch', location='Nairobi', event_date='2030-01-01',
+                expected_budget=Decimal('1000'), organization_name=name, created_by=user
+            )
+        OrganizationTeardown.objects.create(organization_name='Globex')
+        OrganizationTeardown.objects.create(organization_name='Gone', status='completed')
+
+    def test_rows_are_linked_to_their_own_organization(self):
+        apps = self.migrate(self.after)
+        Organization = apps.get_model('accounts', 'Organization')
+        User = apps.get_model('accounts', 'User')
+        Event = apps.get_model('events', 'Event')
+        OrganizationTeardown = apps.get_model('accounts', 'OrganizationTeardown')
+
+        self.assertEqual(
+            sorted(Organization.objects.values_list('name', flat=True)),
+            [' Acme ', 'Acme', 'Globex', 'acme']
+        )
+        for user in User.objects.select_related('organization'):
+            self.assertEqual(user.organization.name, self.names[user.email])
+        self.assertEqual(User.objects.filter(organization__name='Acme').count(), 2)
+        for event in Event.objects.select_related('organization', 'created_by'):
+            self.assertEqual(event.organization_id, event.created_by.organization_id)
+
+        jobs = OrganizationTeardown.objects.values_list('organization_name', 'organization__name')
+        self.assertEqual(dict(jobs), {'Globex': 'Globex', 'Gone': None})
+
+    def test_backfill_reverses_and_reapplies(self):
+        self.migrate(self.after)
+
+        apps = self.migrate(self.before)
+
+        self.assertNotIn('accounts_organization', connection.introspection.table_names())
+        User = apps.get_model('accounts', 'User')
+        users = User.objects.values_list('email', 'organization_name')
+        self.assertEqual(dict(users), self.names)
+
+        apps = self.migrate(self.after)
+        self.assertEqual(apps.get_model('accounts', 'Organization').objects.count(), 4)
+        User = apps.get_model('accounts', 'User')
+        self.assertFalse(User.objects.filter(organization=None).exists())
@@ -3,6 +3,8 @@ from .views import (
     RegisterUserView, 
     MyTokenObtainPairView,
     CreateTeamUserView,
+    BulkInviteTeamView,
+    AcceptInviteView,
     ListTeamUsersView,
     GoogleLoginView,
     DeleteAccountView,
@@ -17,6 +19,8 @@ urlpatterns = [
     path('login/google/', GoogleLoginView.as_view(), name='google_login'),
     path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
     path('team/create/', CreateTeamUserView.as_view(), name='create_team_user'),
+    path('team/invite/', BulkInviteTeamView.as_view(), name='bulk_invite_team'),
+    path('invite/accept/', AcceptInviteView.as_view(), name='accept_invite'),
     path('team/', ListTeamUsersView.as_view(), name='list_team_users'),
     
     # Delete account endpoints
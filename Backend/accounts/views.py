@@ -1,20 +1,29 @@
+import time
 from rest_framework import generics
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework.exceptions import PermissionDenied
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework.exceptions import PermissionDenied, ValidationError
 from rest_framework.views import APIView
 from .serializers import (
     UserRegistrationSerializer,
     MyTokenObtainPairSerializer,
     TeamUserCreateSerializer,
-    GoogleLoginSerializer,TeamUserListSerializer
+    GoogleLoginSerializer,TeamUserListSerializer,
+    AcceptInviteSerializer
 )
 from rest_framework_simplejwt.views import TokenObtainPairView
+from django.conf import settings
+from plantra.async_views import AsyncAPIView
+from plantra.conditional import ConditionalGetMixin
+from plantra.pagination import TeamKeysetPagination
+from events.imports import CSV_CONTENT_TYPES, iter_rows
+from events.versions import organization_version, as_timestamp, bump_versions
 from .models import User
-from django.db.models import Count, Q, Sum
-from django.utils import timezone
+from django.db.models import Count, Q
+from .dashboard import aget_dashboard_stats, invalidate_dashboard
+from .invites import TeamInviter
+from .teardown import request_teardown
 
 class RegisterUserView(generics.CreateAPIView):
     serializer_class = UserRegistrationSerializer
@@ -76,12 +85,7 @@ class GoogleLoginView(generics.GenericAPIView):
             user.save()
         
         # Generate JWT tokens
-        refresh = RefreshToken.for_user(user)
-        
-        # Add custom claims
-        refresh['name'] = user.name
-        refresh['role'] = user.role
-        refresh['organization_name'] = user.organization_name
+        refresh = MyTokenObtainPairSerializer.get_token(user)
         
         return Response({
             'refresh': str(refresh),
@@ -105,6 +109,70 @@ class CreateTeamUserView(generics.CreateAPIView):
         serializer.save()
 
 
+class BulkInviteTeamView(APIView):
+    """
+    Create many team users at once from a JSON list (or {"users": [...]})
+    or a CSV body (text/csv, header row email,name,role,password).
+
+    Rows with a password can log in straight away; rows without one
+    become invite accounts, returned with the uid and token they need to
+    set a password. Returns a per-row error report; valid rows are saved.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        if not request.user.is_account_manager():
+            raise PermissionDenied("Only Account Managers can create team users")
+
+        content_type = request.content_type.split(';')[0].strip().lower()
+        if content_type in CSV_CONTENT_TYPES:
+            if request.stream is None:
+                raise ValidationError({'detail': 'Request body is empty'})
+            rows = iter_rows(request.stream, content_type)
+        else:
+            rows = request.data.get('users') if isinstance(request.data, dict) else request.data
+            if not isinstance(rows, list):
+                raise ValidationError({'users': 'Send a list of users'})
+
+        organization = request.user.organization
+        report = TeamInviter(organization).run(rows)
+
+        if report['created']:
+            # bulk_create skips the user signals
+            invalidate_dashboard(organization.id)
+            bump_versions(organization_id=organization.id)
+
+        return Response(
+            report,
+            status=status.HTTP_201_CREATED if report['created'] else status.HTTP_400_BAD_REQUEST
+        )
+
+
+class AcceptInviteView(generics.GenericAPIView):
+    """
+    Set an invite account's password and log it in
+    """
+    serializer_class = AcceptInviteSerializer
+    permission_classes = [AllowAny]
+
+    def post(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        user = serializer.save()
+
+        refresh = MyTokenObtainPairSerializer.get_token(user)
+        return Response({
+            'refresh': str(refresh),
+            'access': str(refresh.access_token),
+            'user': {
+                'email': user.email,
+                'name': user.name,
+                'role': user.role,
+                'organization_name': user.organization_name,
+            }
+        }, status=status.HTTP_200_OK)
+
+
 class ListTeamUsersView(generics.ListAPIView):
     """
     List all users in the same organization.
@@ -112,29 +180,32 @@ class ListTeamUsersView(generics.ListAPIView):
     """
     permission_classes = [IsAuthenticated]
     serializer_class = TeamUserListSerializer  # Use the detailed serializer
+    pagination_class = TeamKeysetPagination
 
     def get_queryset(self):
         user = self.request.user
         
         # Return all users in the same organization, excluding the current user
         return User.objects.filter(
-            organization_name=user.organization_name
+            organization_id=user.organization_id
         ).exclude(id=user.id).order_by('role', 'name')
     
     def list(self, request, *args, **kwargs):
         queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
-        
-        # Add summary information
-        team_summary = {
-            'total_members': queryset.count(),
-            'account_managers': queryset.filter(role='Account Manager').count(),
-            'team_leads': queryset.filter(role='Team Lead').count(),
-            'team_members': queryset.filter(role='Team Member').count(),
-        }
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        
+        # Add summary information (one query for the whole team)
+        team_summary = queryset.aggregate(
+            total_members=Count('id'),
+            account_managers=Count('id', filter=Q(role='Account Manager')),
+            team_leads=Count('id', filter=Q(role='Team Lead')),
+            team_members=Count('id', filter=Q(role='Team Member')),
+        )
         
         return Response({
             'summary': team_summary,
+            'next': self.paginator.get_next_link(),
             'members': serializer.data
         })
 
@@ -161,7 +232,7 @@ class DeleteAccountView(APIView):
             try:
                 user_to_delete = User.objects.get(
                     id=user_id,
-                    organization_name=user.organization_name
+                    organization_id=user.organization_id
                 )
                 
                 # Prevent Account Manager from deleting another Account Manager
@@ -186,23 +257,21 @@ class DeleteAccountView(APIView):
         # User is deleting their own account
         else:
             if user.is_account_manager():
-                # Warn: deleting Account Manager will delete all team members
+                # Deleting the Account Manager deletes the whole organization:
+                # every user and all their events. That is too much for one
+                # request, so it runs as a background teardown job.
                 team_count = User.objects.filter(
-                    organization_name=user.organization_name
+                    organization_id=user.organization_id
                 ).exclude(id=user.id).count()
-                
-                if team_count > 0:
-                    # Optional: You can choose to prevent deletion or cascade delete
-                    # For now, we'll delete all team members as well
-                    User.objects.filter(
-                        organization_name=user.organization_name
-                    ).delete()
-                    return Response(
-                        {
-                            'message': f'Your account and {team_count} team member(s) have been deleted successfully'
-                        },
-                        status=status.HTTP_200_OK
-                    )
+                job = request_teardown(user.organization, requested_by=user.email)
+                return Response(
+                    {
+                        'message': f'Your account and {team_count} team member(s) are being deleted',
+                        'teardown_id': job.id,
+                        'status': job.status,
+                    },
+                    status=status.HTTP_202_ACCEPTED
+                )
             
             # Delete the user's own account
             user.delete()
@@ -224,7 +293,7 @@ class DeleteOwnAccountView(APIView):
         if user.is_account_manager():
             # Count team members
             team_count = User.objects.filter(
-                organization_name=user.organization_name
+                organization_id=user.organization_id
             ).exclude(id=user.id).count()
             
             if team_count > 0:
@@ -238,6 +307,18 @@ class DeleteOwnAccountView(APIView):
         
         # Delete user account
         email = user.email
+        if user.is_account_manager():
+            # The last user of the organization; its events go with it
+            job = request_teardown(user.organization, requested_by=email)
+            return Response(
+                {
+                    'message': f'Account {email} is being deleted',
+                    'teardown_id': job.id,
+                    'status': job.status,
+                },
+                status=status.HTTP_202_ACCEPTED
+            )
+
         user.delete()
         
         return Response(
@@ -247,287 +328,19 @@ class DeleteOwnAccountView(APIView):
     
 
 
-class DashboardStatsView(APIView):
+class DashboardStatsView(ConditionalGetMixin, AsyncAPIView):
     """
     Get dashboard statistics for the authenticated user's organization
     """
     permission_classes = [IsAuthenticated]
-    
-    def get(self, request):
-        # Import here to avoid circular imports
-        try:
-            from events.models import Event, EventChecklist, BudgetItem, Expense
-        except ImportError as e:
-            # If models don't exist, return empty data
-            return Response({
-                'stats': {
-                    'active_events': {
-                        'value': 0,
-                        'change': '+0 this month',
-                        'trend': 'neutral'
-                    },
-                    'team_members': {
-                        'value': 0,
-                        'change': '+0 this week',
-                        'trend': 'neutral'
-                    },
-                    'pending_tasks': {
-                        'value': 0,
-                        'change': '0 overdue',
-                        'trend': 'neutral'
-                    },
-                    'total_budget': {
-                        'value': '$0',
-                        'change': '0% spent',
-                        'trend': 'neutral'
-                    }
-                },
-                'upcoming_events': [],
-                'urgent_tasks': [],
-                'recent_activity': []
-            })
-        
-        user = request.user
-        organization = user.organization_name
-        
-        # Get events for the organization
-        events = Event.objects.filter(organization_name=organization)
-        
-        # Count active events (future or ongoing events)
-        active_events_count = events.filter(
-            Q(event_date__gte=timezone.now().date()) | Q(event_date__isnull=True)
-        ).count()
-        
-        # Count team members
-        team_members_count = User.objects.filter(
-            organization_name=organization
-        ).count()
-        
-        # Count pending tasks across all events
-        try:
-            pending_tasks_count = EventChecklist.objects.filter(
-                event__organization_name=organization,
-                status__in=['pending', 'in_progress']
-            ).count()
-            
-            # Count overdue tasks
-            overdue_tasks_count = EventChecklist.objects.filter(
-                event__organization_name=organization,
-                status__in=['pending', 'in_progress'],
-                due_date__lt=timezone.now().date()
-            ).count()
-        except Exception:
-            pending_tasks_count = 0
-            overdue_tasks_count = 0
-        
-        # Calculate total budget and spent amount
-        try:
-            total_budget = events.aggregate(
-                total=Sum('expected_budget')
-            )['total'] or 0
-            
-            total_spent = Expense.objects.filter(
-                event__organization_name=organization
-            ).aggregate(total=Sum('amount'))['total'] or 0
-        except Exception:
-            total_budget = 0
-            total_spent = 0
-        
-        budget_percentage = 0
-        if total_budget > 0:
-            budget_percentage = round((total_spent / total_budget) * 100, 1)
-        
-        # Get upcoming events (next 5)
-        upcoming_events = events.filter(
-            event_date__gte=timezone.now().date()
-        ).order_by('event_date')[:5]
-        
-        upcoming_events_data = []
-        for event in upcoming_events:
-            try:
-                total_tasks = event.checklist_items.count()
-                completed_tasks = event.checklist_items.filter(status='completed').count()
-            except Exception:
-                total_tasks = 0
-                completed_tasks = 0
-            
-            progress = 0
-            if total_tasks > 0:
-                progress = round((completed_tasks / total_tasks) * 100)
-            
-            status_label = 'Planning'
-            if progress > 75:
-                status_label = 'In Progress'
-            elif progress < 30:
-                status_label = 'Early Stage'
-            
-            upcoming_events_data.append({
-                'id': event.id,
-                'name': event.name,
-                'date': event.event_date,
-                'status': status_label,
-                'progress': progress,
-                'location': event.location or 'TBD'
-            })
-        
-        # Get urgent tasks (overdue or due soon)
-        urgent_tasks_data = []
-        try:
-            urgent_tasks = EventChecklist.objects.filter(
-                event__organization_name=organization,
-                status__in=['pending', 'in_progress'],
-                due_date__lte=timezone.now().date() + timezone.timedelta(days=3)
-            ).select_related('event').order_by('due_date')[:5]
-            
-            for task in urgent_tasks:
-                days_until = (task.due_date - timezone.now().date()).days
-                if days_until < 0:
-                    deadline = f"{abs(days_until)} days overdue"
-                elif days_until == 0:
-                    deadline = "Today"
-                elif days_until == 1:
-                    deadline = "Tomorrow"
-                else:
-                    deadline = f"In {days_until} days"
-                
-                urgent_tasks_data.append({
-                    'id': task.id,
-                    'task': task.title,
-                    'event': task.event.name,
-                    'event_id': task.event.id,
-                    'deadline': deadline,
-                    'due_date': task.due_date
-                })
-        except Exception as e:
-            print(f"Error fetching urgent tasks: {e}")
-            pass
-        
-        # Get recent activity
-        recent_activity = []
-        
-        # Recent expenses
-        try:
-            recent_expenses = Expense.objects.filter(
-                event__organization_name=organization
-            ).select_related('event').order_by('-created_at')[:3]
-            
-            for expense in recent_expenses:
-                recent_activity.append({
-                    'action': 'Expense added',
-                    'detail': f"{expense.name} - ${expense.amount}",
-                    'time': self._get_time_ago(expense.created_at),
-                    'icon': 'DollarSign',
-                    'created_at': expense.created_at
-                })
-        except Exception as e:
-            print(f"Error fetching expenses: {e}")
-            pass
-        
-        # Recent completed tasks
-        try:
-            recent_tasks = EventChecklist.objects.filter(
-                event__organization_name=organization,
-                status='completed'
-            ).select_related('event').order_by('-created_at')[:3]
-            
-            for task in recent_tasks:
-                recent_activity.append({
-                    'action': 'Task completed',
-                    'detail': task.title,
-                    'time': self._get_time_ago(task.created_at),
-                    'icon': 'CheckSquare',
-                    'created_at': task.created_at
-                })
-        except Exception as e:
-            print(f"Error fetching tasks: {e}")
-            pass
-        
-        # Recent events
-        try:
-            recent_events = Event.objects.filter(
-                organization_name=organization
-            ).order_by('-created_at')[:2]
-            
-            for event in recent_events:
-                recent_activity.append({
-                    'action': 'Event created',
-                    'detail': event.name,
-                    'time': self._get_time_ago(event.created_at),
-                    'icon': 'Calendar',
-                    'created_at': event.created_at
-                })
-        except Exception as e:
-            print(f"Error fetching events: {e}")
-            pass
-        
-        # Sort by created_at and take top 10
-        recent_activity.sort(key=lambda x: x.get('created_at', timezone.now()), reverse=True)
-        recent_activity = recent_activity[:10]
-        
-        # Remove created_at from response
-        for activity in recent_activity:
-            activity.pop('created_at', None)
-        
-        # Calculate recent additions
-        events_this_month = events.filter(
-            created_at__gte=timezone.now() - timezone.timedelta(days=30)
-        ).count()
-        
-        team_this_week = User.objects.filter(
-            organization_name=organization,
-            date_joined__gte=timezone.now() - timezone.timedelta(days=7)
-        ).count()
-        
-        return Response({
-            'stats': {
-                'active_events': {
-                    'value': active_events_count,
-                    'change': f'+{events_this_month} this month',
-                    'trend': 'up' if events_this_month > 0 else 'neutral'
-                },
-                'team_members': {
-                    'value': team_members_count,
-                    'change': f'+{team_this_week} this week',
-                    'trend': 'up' if team_this_week > 0 else 'neutral'
-                },
-                'pending_tasks': {
-                    'value': pending_tasks_count,
-                    'change': f'{overdue_tasks_count} overdue',
-                    'trend': 'down' if overdue_tasks_count > 0 else 'neutral'
-                },
-                'total_budget': {
-                    'value': f'${total_budget:,.0f}',
-                    'change': f'{budget_percentage}% spent',
-                    'trend': 'neutral'
-                }
-            },
-            'upcoming_events': upcoming_events_data,
-            'urgent_tasks': urgent_tasks_data,
-            'recent_activity': recent_activity
-        })
-    
-    def _get_time_ago(self, dt):
-        """Helper method to get human-readable time difference"""
-        if not dt:
-            return 'Recently'
-        
-        diff = timezone.now() - dt
-        
-        if diff.days > 0:
-            if diff.days == 1:
-                return '1 day ago'
-            return f'{diff.days} days ago'
-        
-        hours = diff.seconds // 3600
-        if hours > 0:
-            if hours == 1:
-                return '1 hour ago'
-            return f'{hours} hours ago'
-        
-        minutes = diff.seconds // 60
-        if minutes > 0:
-            if minutes == 1:
-                return '1 minute ago'
-            return f'{minutes} minutes ago'
-        
-        return 'Just now'
\ No newline at end of file
+
+    def get_version(self, request):
+        # The snapshot also has date-relative fields, so the version rolls
+        # over as often as the cached snapshot expires
+        timeout = settings.DASHBOARD_CACHE_TIMEOUT
+        bucket = int(time.time() // timeout)
+        version = organization_version(request.user.organization_id)
+        return (version, bucket), max(as_timestamp(version), bucket * timeout)
+
+    async def get(self, request):
+        return Response(await aget_dashboard_stats(request.user.organization_id))
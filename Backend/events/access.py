@@ -0,0 +1,119 @@
+import time
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Exists, OuterRef
+from .models import Event, EventChecklist
+
+
+def _org_key(organization_id):
+    return f'event-access:org:{organization_id}'
+
+
+def _user_key(user_id):
+    return f'event-access:user:{user_id}'
+
+
+def _cache():
+    """
+    Where access sets are cached: the shared version cache, or nowhere
+    when it isn't shared by every worker, as a stale set would keep
+    revoked access alive on the workers that didn't see the change.
+    """
+    if settings.VERSION_CACHE_SHARED:
+        return caches[settings.VERSION_CACHE_ALIAS]
+    return None
+
+
+def visible_events(user):
+    """Events a user may see, as a single queryset"""
+    if user.is_account_manager():
+        return Event.objects.filter(organization_id=user.organization_id)
+
+    if user.is_team_lead():
+        return Event.objects.filter(team_lead=user)
+
+    if user.is_team_member():
+        # A correlated EXISTS per org event, answered from the
+        # (assigned_to, event) index, instead of joining the checklist
+        # table and de-duplicating the result with DISTINCT
+        return Event.objects.filter(
+            Exists(EventChecklist.objects.filter(
+                event=OuterRef('pk'), assigned_to=user
+            )),
+            organization_id=user.organization_id
+        )
+
+    return Event.objects.none()
+
+
+def _org_version(cache, organization_id):
+    key = _org_key(organization_id)
+    version = cache.get(key)
+    if version is None:
+        version = time.time_ns()
+        if not cache.add(key, version, None):
+            version = cache.get(key, version)
+    return version
+
+
+def accessible_event_ids(request):
+    """
+    The set of event ids the requesting user can access.
+
+    Computed with one query, memoized on the request and, when there is a
+    shared cache, cached per user. A cached entry is only trusted while the
+    user's role and organization and the organization's access version are
+    unchanged; see invalidate_org_access and invalidate_user_access.
+    """
+    ids = getattr(request, '_accessible_event_ids', None)
+    if ids is not None:
+        return ids
+
+    user = request.user
+    cache = _cache()
+    if cache is None:
+        ids = frozenset(visible_events(user).values_list('id', flat=True))
+        request._accessible_event_ids = ids
+        return ids
+
+    version = _org_version(cache, user.organization_id)
+    stamp = (version, user.role, user.organization_id)
+
+    entry = cache.get(_user_key(user.id))
+    if entry and entry[0] == stamp:
+        ids = entry[1]
+    else:
+        ids = frozenset(visible_events(user).values_list('id', flat=True))
+        cache.set(
+            _user_key(user.id), (stamp, ids), settings.EVENT_ACCESS_CACHE_TIMEOUT
+        )
+
+    request._accessible_event_ids = ids
+    return ids
+
+
+def invalidate_org_access(organization_id):
+    """Drop every cached access set in an organization"""
+    cache = _cache()
+    if cache is not None:
+        cache.set(_org_key(organization_id), time.time_ns(), None)
+
+
+def invalidate_user_access(*user_ids):
+    cache = _cache()
+    if cache is not None:
+        cache.delete_many([_user_key(user_id) for user_id in user_ids if user_id])
+
+
+class EventAccessMixin:
+    """
+    Scope an event-nested view to its event. Pair with HasEventAccess,
+    which rejects events outside the user's accessible set.
+    """
+    event_lookup = 'event_id'
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if 'event_id' in self.kwargs:
+            queryset = queryset.filter(**{self.event_lookup: self.kwargs['event_id']})
+        return queryset
@@ -0,0 +1,143 @@
+from django.core.cache import cache
+from .broker import get_broker, event_alert_topic
+from .models import Event, BudgetItem
+
+
+def budget_item_overruns(event_id):
+    """Budget items spent over their estimate, found with one grouped query"""
+    return list(BudgetItem.objects.filter(event_id=event_id).over_estimate().values(
+        'name', 'estimated_cost', 'spent'
+    ))
+
+
+def build_budget_alerts(event, overruns=None):
+    """
+    Build the alert list for an event.
+
+    Event-level figures come from the cached rollup columns and every
+    over-estimate budget item is found with a single grouped query, so the
+    cost does not grow with the number of budget items. Pass `overruns`
+    when budget_item_overruns() has already been fetched.
+    """
+    alerts = []
+
+    # Overall budget alerts
+    if event.is_over_budget:
+        alerts.append({
+            "level": "critical",
+            "type": "over_budget",
+            "message": f"Event is over budget by {abs(event.budget_remaining)}"
+        })
+    elif event.check_budget_threshold(90):
+        alerts.append({
+            "level": "warning",
+            "type": "near_budget_limit",
+            "message": f"Event has used {event.budget_utilization_percent:.1f}% of budget"
+        })
+
+    # Budget item alerts
+    if overruns is None:
+        overruns = budget_item_overruns(event.id)
+    for item in overruns:
+        variance = item['estimated_cost'] - item['spent']
+        alerts.append({
+            "level": "warning",
+            "type": "budget_item_exceeded",
+            "message": f"'{item['name']}' has exceeded estimate by {abs(variance)}",
+            "budget_item": item['name']
+        })
+
+    return alerts
+
+
+def alert_state(event_id):
+    """
+    The parts of an event's alerts that streams report transitions of:
+    the budget status and the budget items spent over their estimate.
+    """
+    event = Event.objects.only('expected_budget', 'expenses_total').get(pk=event_id)
+    overruns = BudgetItem.objects.filter(event_id=event_id).over_estimate().values(
+        'id', 'name', 'estimated_cost', 'spent'
+    )
+    return {
+        'budget_status': event.budget_status,
+        'utilization_percent': round(float(event.budget_utilization_percent), 2),
+        'total_expenses': float(event.total_expenses),
+        'approved_budget': float(event.expected_budget),
+        'over_estimate': {
+            str(item['id']): {
+                'name': item['name'],
+                'estimated_cost': float(item['estimated_cost']),
+                'spent': float(item['spent']),
+            }
+            for item in overruns
+        },
+    }
+
+
+def _state_key(event_id):
+    return f'alert-state:{event_id}'
+
+
+def remember_alert_state(event_id, state):
+    cache.set(_state_key(event_id), state, None)
+
+
+def alert_transitions(event_id, previous, current):
+    """Messages describing how the alert state moved from previous to current"""
+    messages = []
+    if previous['budget_status'] != current['budget_status']:
+        messages.append({
+            'type': 'budget_status',
+            'event_id': event_id,
+            'from': previous['budget_status'],
+            'to': current['budget_status'],
+            'utilization_percent': current['utilization_percent'],
+            'total_expenses': current['total_expenses'],
+            'approved_budget': current['approved_budget'],
+        })
+
+    for item_id, item in current['over_estimate'].items():
+        if item_id not in previous['over_estimate']:
+            messages.append({
+                'type': 'budget_item_exceeded',
+                'event_id': event_id,
+                'budget_item_id': int(item_id),
+                **item,
+            })
+    for item_id, item in previous['over_estimate'].items():
+        if item_id not in current['over_estimate']:
+            messages.append({
+                'type': 'budget_item_recovered',
+                'event_id': event_id,
+                'budget_item_id': int(item_id),
+                'name': item['name'],
+            })
+    return messages
+
+
+def publish_alert_transitions(event_id):
+    """
+    Recompute an event's alert state after a write and publish what
+    changed to its stream subscribers. Runs once per write no matter how
+    many streams are open, and not at all when nobody is listening.
+    """
+    broker = get_broker()
+    topic = event_alert_topic(event_id)
+    if not broker.has_subscribers(topic):
+        # Re-seeded from the snapshot the next subscriber takes
+        cache.delete(_state_key(event_id))
+        return
+
+    try:
+        current = alert_state(event_id)
+    except Event.DoesNotExist:
+        cache.delete(_state_key(event_id))
+        return
+
+    previous = cache.get(_state_key(event_id))
+    remember_alert_state(event_id, current)
+    if previous is None:
+        return
+    for message in alert_transitions(event_id, previous, current):
+        broker.publish(topic, message)
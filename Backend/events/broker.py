@@ -0,0 +1,89 @@
+import asyncio
+import threading
+from functools import lru_cache
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+class Subscription:
+    """
+    A subscriber's queue on one topic. Use as an async context manager so
+    the queue is registered before the first publish you care about and
+    dropped when the consumer goes away.
+    """
+
+    def __init__(self, broker, topic, max_queue):
+        self.broker = broker
+        self.topic = topic
+        self.loop = None
+        self.queue = asyncio.Queue(maxsize=max_queue)
+
+    async def __aenter__(self):
+        self.loop = asyncio.get_running_loop()
+        self.broker._add(self)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.broker._remove(self)
+
+    async def get(self):
+        return await self.queue.get()
+
+    def deliver(self, message):
+        """Called on the subscriber's loop; slow consumers lose the oldest message"""
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(message)
+
+
+class InProcessBroker:
+    """
+    Publish/subscribe between request threads and async consumers in this
+    process. publish() is safe to call from any thread; each message is
+    handed to the subscriber's own event loop.
+
+    Another broker only needs the same three methods; point
+    settings.EVENT_ALERT_BROKER at it.
+    """
+
+    def __init__(self, max_queue=100):
+        self.max_queue = max_queue
+        self._lock = threading.Lock()
+        self._subscriptions = {}
+
+    def subscribe(self, topic):
+        return Subscription(self, topic, self.max_queue)
+
+    def has_subscribers(self, topic):
+        return bool(self._subscriptions.get(topic))
+
+    def publish(self, topic, message):
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(topic, ()))
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.deliver, message)
+            except RuntimeError:
+                # The subscriber's loop has closed
+                self._remove(subscription)
+
+    def _add(self, subscription):
+        with self._lock:
+            self._subscriptions.setdefault(subscription.topic, set()).add(subscription)
+
+    def _remove(self, subscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.topic)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.topic]
+
+
+@lru_cache(maxsize=None)
+def get_broker():
+    return import_string(settings.EVENT_ALERT_BROKER)()
+
+
+def event_alert_topic(event_id):
+    return f'event-alerts:{event_id}'
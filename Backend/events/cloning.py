@@ -0,0 +1,142 @@
+from datetime import timedelta
+from decimal import Decimal
+from django.db import transaction
+from .models import Event, BudgetItem, EventChecklist, EventTemplate, BudgetExceeded
+
+
+def _budget_rows(event):
+    return list(event.budget_items.order_by('id').values(
+        'category', 'name', 'description', 'estimated_cost'
+    ))
+
+
+def _checklist_rows(event):
+    """Checklist items with due dates expressed as offsets from the event date"""
+    rows = []
+    for item in event.checklist_items.order_by('id').values(
+        'title', 'description', 'assigned_to_id', 'due_date'
+    ):
+        due_date = item.pop('due_date')
+        item['due_offset_days'] = (
+            (due_date - event.event_date).days if due_date else None
+        )
+        rows.append(item)
+    return rows
+
+
+def create_event_from_rows(event_fields, budget_rows, checklist_rows):
+    """
+    Create an event with its budget and checklist items in one transaction:
+    one INSERT for the event and one bulk INSERT per child table.
+
+    `checklist_rows` carry `due_offset_days` relative to the new event date.
+    The event's allocation rollup is set up front instead of being bumped
+    once per budget item.
+    """
+    allocated = sum(
+        (Decimal(str(row['estimated_cost'])) for row in budget_rows), Decimal('0')
+    )
+
+    with transaction.atomic():
+        event = Event(**event_fields)
+        if allocated > event.expected_budget:
+            raise BudgetExceeded(event, 'budget_allocated_total', allocated)
+        event.budget_allocated_total = allocated
+        event.save()
+
+        BudgetItem.objects.bulk_create([
+            BudgetItem(
+                event=event,
+                category=row.get('category') or 'General',
+                name=row['name'],
+                description=row.get('description'),
+                estimated_cost=row['estimated_cost'],
+            )
+            for row in budget_rows
+        ], batch_size=500)
+
+        EventChecklist.objects.bulk_create([
+            EventChecklist(
+                event=event,
+                title=row['title'],
+                description=row.get('description'),
+                assigned_to_id=row.get('assigned_to_id'),
+                due_date=(
+                    event.event_date + timedelta(days=row['due_offset_days'])
+                    if row.get('due_offset_days') is not None else None
+                ),
+            )
+            for row in checklist_rows
+        ], batch_size=500)
+
+    return event
+
+
+def clone_event(source, created_by, **overrides):
+    """
+    Copy an event with all of its budget items and checklist items.
+    Payment state and progress are reset; checklist due dates move with
+    the new event_date.
+    """
+    if 'team_lead' in overrides:
+        # Otherwise the source's team_lead_id below wins over the override
+        team_lead = overrides.pop('team_lead')
+        overrides['team_lead_id'] = team_lead.pk if team_lead else None
+
+    event_fields = {
+        'name': source.name,
+        'description': source.description,
+        'location': source.location,
+        'event_date': source.event_date,
+        'expected_budget': source.expected_budget,
+        'expected_attendance': source.expected_attendance,
+        'expected_revenue': source.expected_revenue,
+        'team_lead_id': source.team_lead_id,
+        **overrides,
+        'organization_id': source.organization_id,
+        'organization_name': source.organization_name,
+        'created_by': created_by,
+    }
+    return create_event_from_rows(
+        event_fields, _budget_rows(source), _checklist_rows(source)
+    )
+
+
+def save_as_template(source, created_by, name, description=None):
+    """Snapshot an event's budget and checklist into a reusable template"""
+    budget_rows = [
+        {**row, 'estimated_cost': str(row['estimated_cost'])}
+        for row in _budget_rows(source)
+    ]
+    checklist_rows = [
+        {key: value for key, value in row.items() if key != 'assigned_to_id'}
+        for row in _checklist_rows(source)
+    ]
+    return EventTemplate.objects.create(
+        name=name,
+        description=description,
+        organization_id=source.organization_id,
+        organization_name=source.organization_name,
+        created_by=created_by,
+        location=source.location,
+        expected_budget=source.expected_budget,
+        expected_attendance=source.expected_attendance,
+        budget_items=budget_rows,
+        checklist_items=checklist_rows,
+    )
+
+
+def create_event_from_template(template, created_by, **event_fields):
+    event_fields = {
+        'location': template.location,
+        'expected_budget': template.expected_budget,
+        'expected_attendance': template.expected_attendance,
+        'description': template.description,
+        **event_fields,
+        'organization_id': template.organization_id,
+        'organization_name': template.organization_name,
+        'created_by': created_by,
+    }
+    return create_event_from_rows(
+        event_fields, template.budget_items, template.checklist_items
+    )
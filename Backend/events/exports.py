@@ -0,0 +1,132 @@
+import csv
+import io
+import tempfile
+from rest_framework.exceptions import ValidationError
+from .models import BudgetItem, Expense
+
+
+EXPENSE_COLUMNS = [
+    ('id', lambda expense: expense.id),
+    ('event_id', lambda expense: expense.event_id),
+    ('event', lambda expense: expense.event.name),
+    ('date', lambda expense: expense.date),
+    ('name', lambda expense: expense.name),
+    ('amount', lambda expense: expense.amount),
+    ('payment_method', lambda expense: expense.payment_method),
+    ('receipt_number', lambda expense: expense.receipt_number or ''),
+    ('budget_item', lambda expense: expense.budget_item_id or ''),
+    ('budget_item_name', lambda expense: expense.budget_item.name if expense.budget_item else ''),
+    ('category', lambda expense: expense.budget_item.category if expense.budget_item else ''),
+    ('approved_by', lambda expense: expense.approved_by.name if expense.approved_by else ''),
+    ('description', lambda expense: expense.description or ''),
+]
+
+BUDGET_ITEM_COLUMNS = [
+    ('id', lambda item: item.id),
+    ('event_id', lambda item: item.event_id),
+    ('event', lambda item: item.event.name),
+    ('event_date', lambda item: item.event.event_date),
+    ('category', lambda item: item.category),
+    ('name', lambda item: item.name),
+    ('estimated_cost', lambda item: item.estimated_cost),
+    ('actual_cost', lambda item: item.actual_cost if item.actual_cost is not None else ''),
+    ('status', lambda item: item.status),
+    ('description', lambda item: item.description or ''),
+]
+
+
+def expense_export_queryset(organization_id, date_from=None, date_to=None):
+    queryset = Expense.objects.filter(
+        event__organization_id=organization_id
+    ).select_related('budget_item', 'approved_by', 'event')
+    if date_from:
+        queryset = queryset.filter(date__gte=date_from)
+    if date_to:
+        queryset = queryset.filter(date__lte=date_to)
+    return queryset.order_by('date', 'id')
+
+
+def budget_item_export_queryset(organization_id, date_from=None, date_to=None):
+    # Budget items have no date of their own; use their event's
+    queryset = BudgetItem.objects.filter(
+        event__organization_id=organization_id
+    ).select_related('event')
+    if date_from:
+        queryset = queryset.filter(event__event_date__gte=date_from)
+    if date_to:
+        queryset = queryset.filter(event__event_date__lte=date_to)
+    return queryset.order_by('event__event_date', 'event_id', 'id')
+
+
+class _Buffer(io.StringIO):
+    def drain(self):
+        value = self.getvalue()
+        self.seek(0)
+        self.truncate()
+        return value
+
+
+# Spreadsheet apps run a cell starting with one of these as a formula
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def cell(value):
+    """
+    `value` made safe for a spreadsheet cell: text that would be read as
+    a formula gets a leading apostrophe. Numbers and dates are kept as
+    they are, so negative amounts still read as numbers.
+    """
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def stream_csv(queryset, columns, chunk_size=2000):
+    """
+    Yield a CSV document for `queryset`, one piece per `chunk_size` rows.
+
+    Rows come from `iterator(chunk_size=...)`, which reads through a
+    server-side cursor on PostgreSQL, so memory use doesn't grow with the
+    export. The header goes out before the first query runs. Starts with
+    a BOM so spreadsheet apps read the file as UTF-8.
+    """
+    buffer = _Buffer()
+    writer = csv.writer(buffer)
+
+    writer.writerow([header for header, _ in columns])
+    yield '\ufeff' + buffer.drain()
+
+    rows = 0
+    for obj in queryset.iterator(chunk_size=chunk_size):
+        writer.writerow([cell(value(obj)) for _, value in columns])
+        rows += 1
+        if rows % chunk_size == 0:
+            yield buffer.drain()
+
+    tail = buffer.drain()
+    if tail:
+        yield tail
+
+
+def write_xlsx(queryset, columns, title, chunk_size=2000):
+    """
+    Write `queryset` to a temporary XLSX file and return it, rewound.
+
+    Uses openpyxl's write-only mode, which keeps constant memory by
+    spooling rows to disk; the file can only be sent once it is complete.
+    """
+    try:
+        from openpyxl import Workbook
+    except ImportError:
+        raise ValidationError({'format': "XLSX export is not available; install openpyxl"})
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(title)
+    sheet.append([header for header, _ in columns])
+    for obj in queryset.iterator(chunk_size=chunk_size):
+        sheet.append([cell(value(obj)) for _, value in columns])
+
+    output = tempfile.TemporaryFile()
+    workbook.save(output)
+    output.seek(0)
+    return output
@@ -0,0 +1,208 @@
+import csv
+import json
+from itertools import islice
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import serializers
+from accounts.models import User
+from .models import Event, BudgetItem, Expense, BudgetExceeded
+from .serializers import ExpenseSerializer
+
+
+CSV_CONTENT_TYPES = ('text/csv', 'application/csv')
+NDJSON_CONTENT_TYPES = ('application/x-ndjson', 'application/ndjson', 'application/jsonl')
+
+
+class ExpenseImportSerializer(ExpenseSerializer):
+    """
+    Row serializer for bulk imports. Related ids are taken as plain
+    integers and resolved per chunk, so validating a row runs no queries.
+    """
+    budget_item = serializers.IntegerField(required=False, allow_null=True)
+    approved_by = serializers.IntegerField(required=False, allow_null=True)
+
+    def to_internal_value(self, data):
+        # CSV cells are always strings; treat empty cells as missing
+        if isinstance(data, dict):
+            data = {key: value for key, value in data.items() if value != ''}
+        return super().to_internal_value(data)
+
+
+class UnreadableRow:
+    """Stands in for a row that couldn't be decoded or parsed"""
+
+    def __init__(self, reason):
+        self.reason = reason
+
+
+def iter_rows(stream, content_type):
+    """
+    Yield row dicts from a CSV or NDJSON request body, line by line.
+
+    Rows that aren't valid UTF-8 (or, for NDJSON, valid JSON) come out as
+    UnreadableRow so they can be reported with the other row errors; a
+    CSV header that can't be decoded rejects the whole body.
+    """
+    undecodable = []
+
+    def decode(lines):
+        for line in lines:
+            try:
+                yield line.decode('utf-8')
+            except UnicodeDecodeError:
+                undecodable.append(line)
+                yield line.decode('utf-8', errors='replace')
+
+    lines = decode(stream)
+
+    if content_type in CSV_CONTENT_TYPES:
+        first = next(lines, '').lstrip('\ufeff')
+        if undecodable:
+            raise serializers.ValidationError(
+                "The header row is not valid UTF-8. Save the file as UTF-8 CSV."
+            )
+        fieldnames = next(csv.reader([first]), [])
+        reader = csv.DictReader(lines, fieldnames=[name.strip() for name in fieldnames])
+        for row in reader:
+            if undecodable:
+                # csv reads no further than the row it returns
+                undecodable.clear()
+                yield UnreadableRow("Row is not valid UTF-8 text")
+            else:
+                yield row
+    elif content_type in NDJSON_CONTENT_TYPES:
+        for line in lines:
+            if undecodable:
+                undecodable.clear()
+                yield UnreadableRow("Row is not valid UTF-8 text")
+                continue
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                yield UnreadableRow("Row is not valid JSON")
+    else:
+        raise serializers.ValidationError(
+            f"Unsupported content type '{content_type}'. "
+            f"Send text/csv or application/x-ndjson."
+        )
+
+
+class ExpenseImporter:
+    """
+    Validate and insert expenses for one event in fixed-size chunks.
+
+    The budget is read once; each row is checked against a running total
+    and each chunk's total is reserved with the same conditional UPDATE
+    that single-expense writes use before it is bulk inserted, so
+    concurrent writers can't push the event over budget either.
+    """
+    chunk_size = 500
+
+    def __init__(self, event):
+        self.event = event
+        self.created = 0
+        self.errors = []
+        self.running_total = event.expenses_total
+
+    def run(self, rows):
+        numbered = enumerate(rows, start=1)
+        while True:
+            chunk = list(islice(numbered, self.chunk_size))
+            if not chunk:
+                break
+            self.import_chunk(chunk)
+
+        return {
+            'created': self.created,
+            'failed': len(self.errors),
+            'errors': sorted(self.errors, key=lambda error: error['row']),
+        }
+
+    def import_chunk(self, chunk):
+        valid = []
+        for row_number, row in chunk:
+            if isinstance(row, UnreadableRow):
+                self.fail(row_number, {'non_field_errors': [row.reason]})
+                continue
+            if not isinstance(row, dict):
+                self.fail(row_number, {'non_field_errors': ['Row is not a valid object']})
+                continue
+            serializer = ExpenseImportSerializer(data=row)
+            if serializer.is_valid():
+                valid.append((row_number, serializer.validated_data))
+            else:
+                self.fail(row_number, serializer.errors)
+
+        valid = self.resolve_relations(valid)
+
+        expenses = []
+        chunk_total = 0
+        today = timezone.now().date()
+        for row_number, data in valid:
+            if self.running_total + chunk_total + data['amount'] > self.event.expected_budget:
+                self.fail(row_number, {'amount': [
+                    f"Would exceed the approved budget ({self.event.expected_budget})"
+                ]})
+                continue
+            chunk_total += data['amount']
+            data.setdefault('date', today)
+            expenses.append((row_number, Expense(event_id=self.event.id, **data)))
+
+        if not expenses:
+            return
+
+        try:
+            with transaction.atomic():
+                Event.apply_rollup_delta(
+                    self.event.id,
+                    enforce_budget=True,
+                    expenses_total=chunk_total,
+                    expense_count=len(expenses)
+                )
+                Expense.objects.bulk_create(
+                    [expense for _, expense in expenses],
+                    batch_size=self.chunk_size
+                )
+        except BudgetExceeded:
+            # Another writer used the budget since we read it
+            for row_number, _ in expenses:
+                self.fail(row_number, {'amount': [
+                    "The event budget changed during the import; this row was not saved"
+                ]})
+            return
+
+        self.running_total += chunk_total
+        self.created += len(expenses)
+
+    def resolve_relations(self, valid):
+        """Swap budget_item/approved_by ids for instances, one query each"""
+        item_ids = {data['budget_item'] for _, data in valid if data.get('budget_item')}
+        user_ids = {data['approved_by'] for _, data in valid if data.get('approved_by')}
+
+        items = BudgetItem.objects.filter(event=self.event, id__in=item_ids).in_bulk()
+        users = User.objects.filter(
+            organization_id=self.event.organization_id, id__in=user_ids
+        ).in_bulk()
+
+        resolved = []
+        for row_number, data in valid:
+            errors = {}
+            if data.get('budget_item'):
+                data['budget_item'] = items.get(data['budget_item'])
+                if data['budget_item'] is None:
+                    errors['budget_item'] = ["No such budget item on this event"]
+            if data.get('approved_by'):
+                data['approved_by'] = users.get(data['approved_by'])
+                if data['approved_by'] is None:
+                    errors['approved_by'] = ["No such user in this organization"]
+
+            if errors:
+                self.fail(row_number, errors)
+            else:
+                resolved.append((row_number, data))
+        return resolved
+
+    def fail(self, row_number, errors):
+        self.errors.append({'row': row_number, 'errors': errors})
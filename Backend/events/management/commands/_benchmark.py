@@ -0,0 +1,147 @@
+"""
+Shared helpers for the benchmark management commands.
+
+The benchmarks seed synthetic organizations inside a transaction that is
+rolled back at the end, so they can be pointed at a development database
+without leaving data behind.
+"""
+import inspect
+import random
+import statistics
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from asgiref.sync import async_to_sync
+from django.utils import timezone
+from accounts.models import Organization, User
+from events.models import Event, BudgetItem, Expense, EventChecklist
+
+
+CATEGORIES = ['Venue', 'Catering', 'Entertainment', 'Marketing', 'Logistics']
+
+
+class Rollback(Exception):
+    """Raised to unwind the benchmark transaction"""
+
+
+def seed_organization(name, events=50, items_per_event=20, expenses_per_event=40,
+                      tasks_per_event=30, members=20, seed=0):
+    """
+    Bulk-insert one organization's worth of data and return its
+    account manager, team leads and team members.
+    """
+    rng = random.Random(seed)
+    today = timezone.now().date()
+    slug = name.lower().replace(' ', '-')
+    organization = Organization.objects.for_name(name)
+
+    manager = User.objects.create(
+        email=f'manager@{slug}.test',
+        name=f'{name} Manager',
+        organization=organization,
+        organization_name=name,
+        role='Account Manager'
+    )
+    leads = User.objects.bulk_create([
+        User(
+            email=f'lead{i}@{slug}.test',
+            name=f'Lead {i}',
+            organization=organization,
+            organization_name=name,
+            role='Team Lead'
+        )
+        for i in range(max(members // 5, 1))
+    ])
+    team = User.objects.bulk_create([
+        User(
+            email=f'member{i}@{slug}.test',
+            name=f'Member {i}',
+            organization=organization,
+            organization_name=name,
+            role='Team Member'
+        )
+        for i in range(members)
+    ])
+
+    event_rows = Event.objects.bulk_create([
+        Event(
+            name=f'{name} Event {i}',
+            location='Nairobi',
+            event_date=today + timedelta(days=rng.randint(-180, 180)),
+            expected_budget=Decimal('1000000'),
+            organization=organization,
+            organization_name=name,
+            created_by=manager,
+            team_lead=rng.choice(leads)
+        )
+        for i in range(events)
+    ])
+
+    items = BudgetItem.objects.bulk_create([
+        BudgetItem(
+            event=event,
+            category=rng.choice(CATEGORIES),
+            name=f'Item {i}',
+            description='Line item description ' * 5,
+            estimated_cost=Decimal(rng.randint(100, 5000))
+        )
+        for event in event_rows
+        for i in range(items_per_event)
+    ])
+    items_by_event = {}
+    for item in items:
+        items_by_event.setdefault(item.event_id, []).append(item)
+
+    Expense.objects.bulk_create([
+        Expense(
+            event=event,
+            budget_item=rng.choice(items_by_event.get(event.id) or [None]),
+            name=f'Expense {i}',
+            amount=Decimal(rng.randint(10, 2000)),
+            date=today - timedelta(days=rng.randint(0, 365))
+        )
+        for event in event_rows
+        for i in range(expenses_per_event)
+    ], batch_size=1000)
+
+    EventChecklist.objects.bulk_create([
+        EventChecklist(
+            event=event,
+            title=f'Task {i}',
+            assigned_to=rng.choice(team),
+            due_date=event.event_date - timedelta(days=rng.randint(0, 60)),
+            status=rng.choice(['pending', 'in_progress', 'completed'])
+        )
+        for event in event_rows
+        for i in range(tasks_per_event)
+    ], batch_size=1000)
+
+    for event in event_rows:
+        Event.objects.filter(pk=event.pk).update(**event.compute_rollups())
+
+    return manager, leads, team
+
+
+def time_call(func, repeat=20):
+    """Run `func` `repeat` times and return (median_ms, p95_ms)"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+    return statistics.median(samples), p95
+
+
+async def _await(awaitable):
+    return await awaitable
+
+
+def call_view(view, request, **kwargs):
+    """Call a sync or async view function and return its rendered response"""
+    response = view(request, **kwargs)
+    if inspect.isawaitable(response):
+        response = async_to_sync(_await)(response)
+    return response.render()
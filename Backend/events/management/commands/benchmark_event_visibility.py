@@ -0,0 +1,85 @@
+import random
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.test import APIRequestFactory, force_authenticate
+from events.access import visible_events
+from events.models import Event, EventChecklist
+from events.views import ListEventsView
+from ._benchmark import Rollback, call_view, seed_organization, time_call
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure how listing a team member's events scales as their "
+        "organization's checklist grows, comparing the old JOIN + DISTINCT "
+        "query with the EXISTS query ListEventsView now uses. Runs in a "
+        "transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--events', type=int, default=200)
+        parser.add_argument('--members', type=int, default=5)
+        parser.add_argument(
+            '--tasks', type=int, default=50,
+            help="Checklist items added per event at each step"
+        )
+        parser.add_argument('--steps', type=int, default=5)
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.run(options)
+                raise Rollback
+        except Rollback:
+            pass
+
+    def run(self, options):
+        _, _, team = seed_organization(
+            'Visibility Org',
+            events=options['events'],
+            items_per_event=0,
+            expenses_per_event=0,
+            tasks_per_event=0,
+            members=options['members']
+        )
+        member = team[0]
+        events = list(Event.objects.filter(organization_id=member.organization_id))
+        rng = random.Random(0)
+
+        factory = APIRequestFactory(SERVER_NAME='localhost')
+        view = ListEventsView.as_view()
+
+        def distinct_query():
+            list(Event.objects.filter(
+                checklist_items__assigned_to=member
+            ).distinct().order_by('-created_at')[:50])
+
+        def exists_query():
+            list(visible_events(member).order_by('-created_at')[:50])
+
+        def list_view():
+            # Measure the uncached path
+            cache.clear()
+            request = factory.get('/api/events/')
+            force_authenticate(request, user=member)
+            call_view(view, request)
+
+        self.stdout.write(
+            f"{'checklist rows':>14}  {'distinct ms':>12}  {'exists ms':>10}  {'view ms':>8}"
+        )
+        for _ in range(options['steps']):
+            EventChecklist.objects.bulk_create([
+                EventChecklist(event=event, title='Task', assigned_to=rng.choice(team))
+                for event in events
+                for _ in range(options['tasks'])
+            ], batch_size=1000)
+
+            total = EventChecklist.objects.count()
+            distinct, _ = time_call(distinct_query, options['repeat'])
+            exists, _ = time_call(exists_query, options['repeat'])
+            view_ms, _ = time_call(list_view, options['repeat'])
+            self.stdout.write(
+                f"{total:>14}  {distinct:>12.2f}  {exists:>10.2f}  {view_ms:>8.2f}"
+            )
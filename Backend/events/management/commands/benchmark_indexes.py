@@ -0,0 +1,117 @@
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+from accounts.models import User
+from accounts.views import DashboardStatsView
+from events.models import Event, BudgetItem, Expense, EventChecklist
+from events.views import ListEventsView, EventSummaryView
+from ._benchmark import Rollback, call_view, seed_organization, time_call
+
+
+INDEXED_MODELS = [User, Event, BudgetItem, Expense, EventChecklist]
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a large synthetic dataset, then compare EXPLAIN plans and view "
+        "latencies with and without the composite indexes. Everything runs in "
+        "a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--orgs', type=int, default=5)
+        parser.add_argument('--events', type=int, default=200, help="Events per organization")
+        parser.add_argument('--tasks', type=int, default=50, help="Checklist items per event")
+        parser.add_argument('--expenses', type=int, default=50, help="Expenses per event")
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.run(options)
+                raise Rollback
+        except Rollback:
+            pass
+
+    def run(self, options):
+        self.stdout.write("Seeding data...")
+        for i in range(options['orgs']):
+            manager, _, _ = seed_organization(
+                f'Bench Org {i}',
+                events=options['events'],
+                expenses_per_event=options['expenses'],
+                tasks_per_event=options['tasks'],
+                seed=i
+            )
+        event = Event.objects.filter(created_by=manager).first()
+
+        self.report("with indexes", manager, event, options['repeat'])
+
+        # Plain DROP INDEX - the schema editor refuses to run inside the
+        # open transaction on SQLite.
+        with connection.cursor() as cursor:
+            for model in INDEXED_MODELS:
+                for index in model._meta.indexes:
+                    cursor.execute(f"DROP INDEX {connection.ops.quote_name(index.name)}")
+
+        self.report("without indexes", manager, event, options['repeat'])
+
+    def explain(self, queryset, label):
+        # The label comment makes the SQL text unique per phase so SQLite's
+        # statement cache can't hand back a plan prepared before the drop.
+        sql, params = queryset.query.sql_with_params()
+        prefix = connection.ops.explain_query_prefix()
+        with connection.cursor() as cursor:
+            cursor.execute(f"{prefix} {sql} /* {label} */", params)
+            return "\n".join(
+                " ".join(str(column) for column in row)
+                for row in cursor.fetchall()
+            )
+
+    def report(self, label, manager, event, repeat):
+        self.stdout.write(self.style.MIGRATE_HEADING(f"\n=== {label} ==="))
+        organization_id = manager.organization_id
+        today = timezone.now().date()
+
+        plans = {
+            'events for org': Event.objects.filter(
+                organization_id=organization_id
+            ).order_by('-created_at'),
+            'open tasks for org': EventChecklist.objects.filter(
+                event__organization_id=organization_id,
+                status__in=['pending', 'in_progress'],
+                due_date__lt=today
+            ),
+            'expenses for event': Expense.objects.filter(
+                event=event
+            ).order_by('-created_at'),
+            'team by role': User.objects.filter(
+                organization_id=organization_id, role='Team Member'
+            ),
+        }
+        for name, queryset in plans.items():
+            self.stdout.write(f"-- {name}")
+            self.stdout.write(self.explain(queryset, label))
+
+        factory = APIRequestFactory(SERVER_NAME='localhost')
+        views = {
+            'ListEventsView': (ListEventsView.as_view(), '/api/events/', {}),
+            'DashboardStatsView': (DashboardStatsView.as_view(), '/api/accounts/dashboard/stats/', {}),
+            'EventSummaryView': (
+                EventSummaryView.as_view(),
+                f'/api/events/{event.id}/summary/',
+                {'event_id': event.id}
+            ),
+        }
+        for name, (view, path, kwargs) in views.items():
+            def call():
+                # Measure the uncached path
+                cache.clear()
+                request = factory.get(path)
+                force_authenticate(request, user=manager)
+                call_view(view, request, **kwargs)
+
+            median, p95 = time_call(call, repeat)
+            self.stdout.write(f"{name:<20} median {median:8.2f} ms   p95 {p95:8.2f} ms")
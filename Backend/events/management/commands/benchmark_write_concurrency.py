@@ -0,0 +1,142 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from decimal import Decimal
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection
+from accounts.models import Organization, User
+from events.models import Event, Expense
+from ._benchmark import seed_organization
+
+
+ORGANIZATION = 'Write Bench Org'
+
+# Environment for each configuration; SQLite ones get a fresh temp file
+CONFIGURATIONS = {
+    'sqlite-default': {'PLANTRA_DB_ENGINE': 'sqlite', 'SQLITE_TUNED': '0', 'DB_CONN_MAX_AGE': '0'},
+    'sqlite-tuned': {'PLANTRA_DB_ENGINE': 'sqlite', 'SQLITE_TUNED': '1'},
+    'postgres': {'PLANTRA_DB_ENGINE': 'postgres'},
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure concurrent expense-write throughput for each database "
+        "configuration. Each configuration runs in its own process with the "
+        "matching PLANTRA_DB_ENGINE/SQLITE_* environment; SQLite runs use a "
+        "throwaway database file. Postgres uses the POSTGRES_* settings and "
+        "removes the rows it wrote."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--config', action='append', choices=sorted(CONFIGURATIONS), dest='configs',
+            help="Configuration to run (repeatable; default: both SQLite ones)"
+        )
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument('--writes', type=int, default=200, help="Expenses per thread")
+        parser.add_argument('--events', type=int, default=4)
+        parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+
+    def handle(self, *args, **options):
+        if options['worker']:
+            self.stdout.write(json.dumps(self.run_worker(options)))
+            return
+
+        configs = options['configs'] or ['sqlite-default', 'sqlite-tuned']
+        self.stdout.write(
+            f"{'configuration':<15} {'writes/s':>9} {'ok':>7} {'locked':>7} {'p99 ms':>8}"
+        )
+        for name in configs:
+            result = self.run_configuration(name, options)
+            self.stdout.write(
+                f"{name:<15} {result['throughput']:>9.1f} {result['ok']:>7} "
+                f"{result['locked']:>7} {result['p99_ms']:>8.1f}"
+            )
+
+    def run_configuration(self, name, options):
+        env = {**os.environ, **CONFIGURATIONS[name]}
+        with tempfile.TemporaryDirectory() as directory:
+            if env['PLANTRA_DB_ENGINE'] == 'sqlite':
+                env['SQLITE_PATH'] = os.path.join(directory, 'bench.sqlite3')
+
+            command = [
+                sys.executable, str(settings.BASE_DIR / 'manage.py'), 'benchmark_write_concurrency', '--worker',
+                '--threads', str(options['threads']),
+                '--writes', str(options['writes']),
+                '--events', str(options['events']),
+            ]
+            process = subprocess.run(command, env=env, capture_output=True, text=True)
+        if process.returncode != 0:
+            raise CommandError(f"{name} failed:\n{process.stderr}")
+        return json.loads(process.stdout.strip().splitlines()[-1])
+
+    def run_worker(self, options):
+        if settings.DATABASES['default']['ENGINE'].endswith('sqlite3'):
+            call_command('migrate', verbosity=0)
+        self.cleanup()
+
+        seed_organization(
+            ORGANIZATION, events=options['events'], items_per_event=0,
+            expenses_per_event=0, tasks_per_event=0, members=1
+        )
+        event_ids = list(
+            Event.objects.filter(organization__name=ORGANIZATION).values_list('id', flat=True)
+        )
+        connection.close()
+
+        latencies, counts = [], {'ok': 0, 'locked': 0}
+        lock = threading.Lock()
+
+        def writer(index):
+            try:
+                for i in range(options['writes']):
+                    start = time.perf_counter()
+                    try:
+                        # Goes through Expense.save: rollup UPDATE with the
+                        # budget check, then the INSERT, in one transaction
+                        Expense.objects.create(
+                            event_id=event_ids[(index + i) % len(event_ids)],
+                            name=f'Write {index}-{i}',
+                            amount=Decimal('1.00')
+                        )
+                        outcome = 'ok'
+                    except OperationalError:
+                        outcome = 'locked'
+                    with lock:
+                        counts[outcome] += 1
+                        latencies.append((time.perf_counter() - start) * 1000)
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=writer, args=(index,))
+            for index in range(options['threads'])
+        ]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        self.cleanup()
+        latencies.sort()
+        return {
+            'throughput': counts['ok'] / elapsed,
+            'ok': counts['ok'],
+            'locked': counts['locked'],
+            'p99_ms': latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+        }
+
+    def cleanup(self):
+        Event.objects.filter(organization__name=ORGANIZATION).delete()
+        User.objects.filter(organization__name=ORGANIZATION).delete()
+        Organization.objects.filter(name=ORGANIZATION).delete()
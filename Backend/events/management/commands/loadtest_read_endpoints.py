@@ -0,0 +1,207 @@
+import asyncio
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+from accounts.models import Organization, User
+from events.models import Event
+from ._benchmark import seed_organization
+
+
+ORGANIZATION = 'Loadtest Org'
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test the summary, alerts, dashboard and event list endpoints "
+        "through the project's ASGI and WSGI applications in-process, with N "
+        "concurrent clients, and report p50/p99 latency and requests/sec. "
+        "Seeds a throwaway organization (committed, then deleted) because "
+        "concurrent requests use their own database connections."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--server', choices=['asgi', 'wsgi', 'both'], default='both')
+        parser.add_argument('--concurrency', type=int, default=32)
+        parser.add_argument('--requests', type=int, default=500, help="Requests per endpoint")
+        parser.add_argument('--events', type=int, default=100)
+        parser.add_argument('--tasks', type=int, default=30, help="Checklist items per event")
+        parser.add_argument('--expenses', type=int, default=30, help="Expenses per event")
+        parser.add_argument(
+            '--cold', action='store_true',
+            help="Run with a dummy cache so every request does the full work"
+        )
+
+    def handle(self, *args, **options):
+        self.cleanup()
+        manager, _, _ = seed_organization(
+            ORGANIZATION,
+            events=options['events'],
+            tasks_per_event=options['tasks'],
+            expenses_per_event=options['expenses'],
+        )
+        event = Event.objects.filter(organization__name=ORGANIZATION).first()
+        token = str(AccessToken.for_user(manager))
+
+        endpoints = {
+            'summary': reverse('event_summary', args=[event.id]),
+            'alerts': reverse('budget_alerts', args=[event.id]),
+            'dashboard': reverse('dashboard_stats'),
+            'events': reverse('list_events'),
+        }
+        servers = ['asgi', 'wsgi'] if options['server'] == 'both' else [options['server']]
+
+        cache_override = override_settings(CACHES={
+            'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}
+        }) if options['cold'] else None
+
+        try:
+            if cache_override:
+                cache_override.enable()
+            self.stdout.write(
+                f"{'server':<6} {'endpoint':<10} {'p50 ms':>9} {'p99 ms':>9} "
+                f"{'req/s':>9} {'errors':>7}"
+            )
+            for server in servers:
+                for name, path in endpoints.items():
+                    run = self.run_asgi if server == 'asgi' else self.run_wsgi
+                    latencies, errors, elapsed = run(
+                        path, token, options['requests'], options['concurrency']
+                    )
+                    self.stdout.write(
+                        f"{server:<6} {name:<10} {percentile(latencies, 0.5):>9.2f} "
+                        f"{percentile(latencies, 0.99):>9.2f} "
+                        f"{len(latencies) / elapsed:>9.1f} {errors:>7}"
+                    )
+        finally:
+            if cache_override:
+                cache_override.disable()
+            connections.close_all()
+            self.cleanup()
+
+    def cleanup(self):
+        Event.objects.filter(organization__name=ORGANIZATION).delete()
+        User.objects.filter(organization__name=ORGANIZATION).delete()
+        Organization.objects.filter(name=ORGANIZATION).delete()
+
+    def run_asgi(self, path, token, total, concurrency):
+        from plantra.asgi import application
+
+        scope = {
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': '1.1',
+            'method': 'GET',
+            'scheme': 'http',
+            'path': path,
+            'raw_path': path.encode(),
+            'query_string': b'',
+            'root_path': '',
+            'headers': [
+                (b'host', b'localhost'),
+                (b'authorization', f'Bearer {token}'.encode()),
+            ],
+            'client': ('127.0.0.1', 0),
+            'server': ('localhost', 80),
+        }
+
+        async def request():
+            status = None
+            received = False
+            never = asyncio.Event()
+
+            async def receive():
+                nonlocal received
+                if not received:
+                    received = True
+                    return {'type': 'http.request', 'body': b'', 'more_body': False}
+                # Only a disconnect may follow the body; never send one
+                await never.wait()
+
+            async def send(message):
+                nonlocal status
+                if message['type'] == 'http.response.start':
+                    status = message['status']
+
+            await application(dict(scope), receive, send)
+            return status
+
+        async def main():
+            remaining = iter(range(total))
+            latencies, errors = [], 0
+
+            async def client():
+                nonlocal errors
+                for _ in remaining:
+                    start = time.perf_counter()
+                    status = await request()
+                    latencies.append((time.perf_counter() - start) * 1000)
+                    errors += status != 200
+
+            start = time.perf_counter()
+            await asyncio.gather(*(client() for _ in range(concurrency)))
+            return latencies, errors, time.perf_counter() - start
+
+        return asyncio.run(main())
+
+    def run_wsgi(self, path, token, total, concurrency):
+        from plantra.wsgi import application
+
+        remaining = iter(range(total))
+        lock = threading.Lock()
+        latencies, errors = [], [0]
+
+        def request():
+            environ = {
+                'REQUEST_METHOD': 'GET',
+                'PATH_INFO': path,
+                'QUERY_STRING': '',
+                'SERVER_NAME': 'localhost',
+                'SERVER_PORT': '80',
+                'SERVER_PROTOCOL': 'HTTP/1.1',
+                'HTTP_HOST': 'localhost',
+                'HTTP_AUTHORIZATION': f'Bearer {token}',
+                'wsgi.version': (1, 0),
+                'wsgi.url_scheme': 'http',
+                'wsgi.input': BytesIO(b''),
+                'wsgi.errors': sys.stderr,
+                'wsgi.multithread': True,
+                'wsgi.multiprocess': False,
+                'wsgi.run_once': False,
+            }
+            status = []
+            body = application(environ, lambda code, headers: status.append(code))
+            try:
+                for _ in body:
+                    pass
+            finally:
+                body.close()
+            return int(status[0].split()[0])
+
+        def client():
+            while True:
+                with lock:
+                    if next(remaining, None) is None:
+                        return
+                start = time.perf_counter()
+                status = request()
+                with lock:
+                    latencies.append((time.perf_counter() - start) * 1000)
+                    errors[0] += status != 200
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for future in [pool.submit(client) for _ in range(concurrency)]:
+                future.result()
+        return latencies, errors[0], time.perf_counter() - start
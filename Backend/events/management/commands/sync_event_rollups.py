@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from events.models import Event
+
+
+class Command(BaseCommand):
+    help = "Recompute the cached budget/expense rollups stored on each event"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help="Only report events whose rollups have drifted; don't write"
+        )
+        parser.add_argument(
+            '--event',
+            type=int,
+            action='append',
+            dest='event_ids',
+            help="Limit to the given event id (can be repeated)"
+        )
+
+    def handle(self, *args, **options):
+        events = Event.objects.only('id', 'name', *Event.ROLLUP_FIELDS)
+        if options['event_ids']:
+            events = events.filter(id__in=options['event_ids'])
+
+        drifted = []
+        for event in events.iterator():
+            with transaction.atomic():
+                expected = event.compute_rollups()
+                changed = {
+                    field: value
+                    for field, value in expected.items()
+                    if getattr(event, field) != value
+                }
+                if not changed:
+                    continue
+
+                drifted.append(event)
+                for field, value in changed.items():
+                    self.stdout.write(
+                        f"Event {event.id} ({event.name}): {field} "
+                        f"cached={getattr(event, field)} actual={value}"
+                    )
+
+                if not options['check']:
+                    Event.objects.filter(pk=event.pk).update(**expected)
+
+        if options['check']:
+            if drifted:
+                raise CommandError(f"{len(drifted)} event(s) have stale rollups")
+            self.stdout.write(self.style.SUCCESS("All event rollups are up to date"))
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f"Rebuilt rollups for {len(drifted)} event(s)"
+            ))
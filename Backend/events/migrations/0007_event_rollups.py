@@ -0,0 +1,59 @@
+# Generated by Django 5.2 on 2026-10-18 12:51
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def backfill_rollups(apps, schema_editor):
+    Event = apps.get_model('events', 'Event')
+    BudgetItem = apps.get_model('events', 'BudgetItem')
+    Expense = apps.get_model('events', 'Expense')
+
+    allocated = dict(
+        BudgetItem.objects.values('event_id').annotate(
+            total=Sum('estimated_cost')
+        ).values_list('event_id', 'total')
+    )
+    spent = {
+        row['event_id']: row
+        for row in Expense.objects.values('event_id').annotate(
+            total=Sum('amount'), count=Count('id')
+        )
+    }
+
+    events = list(Event.objects.only('id'))
+    for event in events:
+        event.budget_allocated_total = allocated.get(event.id) or 0
+        event.expenses_total = spent.get(event.id, {}).get('total') or 0
+        event.expense_count = spent.get(event.id, {}).get('count', 0)
+    Event.objects.bulk_update(
+        events,
+        ['budget_allocated_total', 'expenses_total', 'expense_count'],
+        batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0006_alter_budgetitem_id_alter_event_id_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='budget_allocated_total',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=14),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='expense_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='expenses_total',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=14),
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2 on 2026-10-18 12:53
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0007_event_rollups'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='budgetitem',
+            index=models.Index(fields=['event', '-created_at'], name='budgetitem_event_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['organization_name', 'event_date'], name='event_org_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['organization_name', '-created_at'], name='event_org_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['team_lead', 'event_date'], name='event_lead_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='eventchecklist',
+            index=models.Index(fields=['event', 'status', 'due_date'], name='checklist_event_status_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='eventchecklist',
+            index=models.Index(fields=['event', 'due_date', '-created_at'], name='checklist_event_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='eventchecklist',
+            index=models.Index(fields=['assigned_to', 'event'], name='checklist_assignee_event_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='expense',
+            index=models.Index(fields=['event', '-created_at'], name='expense_event_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='expense',
+            index=models.Index(fields=['event', '-date'], name='expense_event_date_idx'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2 on 2026-10-18 12:59
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0008_hot_query_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventTemplate',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+                ('description', models.TextField(blank=True, null=True)),
+                ('organization_name', models.CharField(max_length=255)),
+                ('location', models.CharField(blank=True, max_length=255)),
+                ('expected_budget', models.DecimalField(blank=True, decimal_places=2, max_digits=12, null=True)),
+                ('expected_attendance', models.PositiveIntegerField(default=0)),
+                ('budget_items', models.JSONField(blank=True, default=list)),
+                ('checklist_items', models.JSONField(blank=True, default=list)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('created_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='event_templates', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['organization_name', '-created_at'], name='template_org_created_idx')],
+            },
+        ),
+    ]
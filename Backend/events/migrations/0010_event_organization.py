@@ -0,0 +1,35 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def link_events(apps, schema_editor):
+    Organization = apps.get_model('accounts', 'Organization')
+
+    for model_name in ('Event', 'EventTemplate'):
+        model = apps.get_model('events', model_name)
+        names = model.objects.order_by().values_list('organization_name', flat=True).distinct()
+        for name in names:
+            organization, _ = Organization.objects.get_or_create(name=name)
+            model.objects.filter(organization_name=name).update(organization=organization)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_organization'),
+        ('events', '0009_eventtemplate'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='organization',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='events', to='accounts.organization'),
+        ),
+        migrations.AddField(
+            model_name='eventtemplate',
+            name='organization',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='event_templates', to='accounts.organization'),
+        ),
+        migrations.RunPython(link_events, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,46 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0010_event_organization'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='event',
+            name='organization',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='events', to='accounts.organization'),
+        ),
+        migrations.AlterField(
+            model_name='eventtemplate',
+            name='organization',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='event_templates', to='accounts.organization'),
+        ),
+        migrations.RemoveIndex(
+            model_name='event',
+            name='event_org_date_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='event',
+            name='event_org_created_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='eventtemplate',
+            name='template_org_created_idx',
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['organization', 'event_date'], name='event_org_id_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['organization', '-created_at'], name='event_org_id_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='eventtemplate',
+            index=models.Index(fields=['organization', '-created_at'], name='template_org_id_created_idx'),
+        ),
+    ]
@@ -1,9 +1,31 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F, OuterRef, Subquery, Sum, Value, DecimalField
+from django.db.models.functions import Coalesce
 from django.core.exceptions import ValidationError
 from django.utils import timezone
-from accounts.models import User
+from accounts.models import Organization, User
 from django.conf import settings
 
+class BudgetExceeded(ValidationError):
+    """
+    Raised when a write would push an event's expenses or budget allocation
+    past its expected budget. `field` is the rollup column that would have
+    overshot and `current` its committed value when the write was refused.
+    """
+
+    def __init__(self, event, field, delta):
+        self.event = event
+        self.field = field
+        self.delta = delta
+        self.current = getattr(event, field)
+        super().__init__(
+            f"This change would exceed the event budget. "
+            f"Budget: {event.expected_budget}, "
+            f"Current total: {self.current}, "
+            f"Would total: {self.current + delta}"
+        )
+
+
 class Event(models.Model):
     STATUS_CHOICES = [
         ('Pending', 'Pending'),
@@ -45,6 +67,11 @@ class Event(models.Model):
     )
 
     # Relations
+    organization = models.ForeignKey(
+        Organization,
+        related_name="events",
+        on_delete=models.PROTECT
+    )
     organization_name = models.CharField(max_length=255)
     created_by = models.ForeignKey(
         User, 
@@ -61,22 +88,108 @@ class Event(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # Cached rollups - kept in step by BudgetItem/Expense writes.
+    # Run `manage.py sync_event_rollups` to verify or rebuild them.
+    budget_allocated_total = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        default=0,
+        editable=False
+    )
+    expenses_total = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        default=0,
+        editable=False
+    )
+    expense_count = models.PositiveIntegerField(default=0, editable=False)
+
+    ROLLUP_FIELDS = ('budget_allocated_total', 'expenses_total', 'expense_count')
+
     def __str__(self):
         return f"{self.name} - {self.organization_name}"
 
+    def save(self, *args, **kwargs):
+        if self.organization_id is None and self.organization_name:
+            self.organization = Organization.objects.for_name(self.organization_name)
+
+        # The rollups are only moved by apply_rollup_delta; writing back the
+        # values this instance loaded would undo deltas applied since
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.ROLLUP_FIELDS
+                and field.attname not in deferred
+            ]
+        super().save(*args, **kwargs)
+
+    # Rollup columns that must never exceed expected_budget
+    BUDGET_CAPPED_FIELDS = ('budget_allocated_total', 'expenses_total')
+
+    @staticmethod
+    def apply_rollup_delta(event_id, enforce_budget=False, **deltas):
+        """
+        Shift cached rollup columns by the given amounts in one UPDATE.
+
+        With enforce_budget, increases to the budget-capped columns are
+        made conditional on the new total staying within expected_budget.
+        The check and the write are the same statement, so concurrent
+        writers serialize on the event row and can't overshoot together.
+        Raises BudgetExceeded when the condition fails.
+        """
+        changes = {
+            field: F(field) + delta
+            for field, delta in deltas.items() if delta
+        }
+        if not event_id or not changes:
+            return
+
+        events = Event.objects.filter(pk=event_id)
+        capped = {}
+        if enforce_budget:
+            capped = {
+                field: delta for field, delta in deltas.items()
+                if field in Event.BUDGET_CAPPED_FIELDS and delta and delta > 0
+            }
+            for field, delta in capped.items():
+                events = events.filter(**{
+                    f'{field}__lte': F('expected_budget') - delta
+                })
+
+        while events.update(**changes) == 0 and capped:
+            # Either the event is gone (DoesNotExist), a cap was hit, or
+            # another writer freed budget in between - then try again
+            event = Event.objects.get(pk=event_id)
+            for field, delta in capped.items():
+                if getattr(event, field) + delta > event.expected_budget:
+                    raise BudgetExceeded(event, field, delta)
+
+    def compute_rollups(self):
+        """Recompute rollup values from the underlying rows"""
+        allocated = self.budget_items.aggregate(
+            total=models.Sum('estimated_cost')
+        )['total'] or 0
+        spent = self.expenses.aggregate(
+            total=models.Sum('amount'),
+            count=models.Count('id')
+        )
+        return {
+            'budget_allocated_total': allocated,
+            'expenses_total': spent['total'] or 0,
+            'expense_count': spent['count'],
+        }
+
     @property
     def total_budget_allocated(self):
         """Sum of all budget item estimates"""
-        return self.budget_items.aggregate(
-            total=models.Sum('estimated_cost')
-        )['total'] or 0
+        return self.budget_allocated_total
 
     @property
     def total_expenses(self):
         """Sum of all actual expenses"""
-        return self.expenses.aggregate(
-            total=models.Sum('amount')
-        )['total'] or 0
+        return self.expenses_total
 
     @property
     def budget_remaining(self):
@@ -117,6 +230,60 @@ class Event(models.Model):
         else:
             return "healthy"
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['organization', 'event_date'],
+                name='event_org_id_date_idx'
+            ),
+            models.Index(
+                fields=['organization', '-created_at'],
+                name='event_org_id_created_idx'
+            ),
+            models.Index(
+                fields=['team_lead', 'event_date'],
+                name='event_lead_date_idx'
+            ),
+        ]
+
+
+class BudgetItemQuerySet(models.QuerySet):
+    def with_spent(self):
+        """Annotate each item with the sum of its linked expenses as `spent`"""
+        return self.annotate(
+            spent=Coalesce(
+                Sum('expenses__amount'),
+                Value(0),
+                output_field=DecimalField(max_digits=14, decimal_places=2)
+            )
+        )
+
+    def over_estimate(self):
+        """Items whose linked expenses exceed their estimate"""
+        return self.with_spent().filter(spent__gt=F('estimated_cost'))
+
+    def by_category(self):
+        """
+        Estimated cost and linked spend per category, largest estimate first.
+
+        Each item's spend is pre-aggregated in a correlated subquery, so an
+        estimate is counted once however many expenses the item has; joining
+        expenses and summing both sides would multiply it by that number.
+        """
+        item_spend = Expense.objects.filter(
+            budget_item=OuterRef('pk')
+        ).order_by().values('budget_item').annotate(
+            total=Sum('amount')
+        ).values('total')
+        money = DecimalField(max_digits=14, decimal_places=2)
+
+        return self.order_by().alias(
+            item_spent=Coalesce(Subquery(item_spend), Value(0), output_field=money)
+        ).values('category').annotate(
+            estimated=Sum('estimated_cost'),
+            actual=Sum('item_spent', output_field=money)
+        ).order_by('-estimated', 'category')
+
 
 class BudgetItem(models.Model):
     """
@@ -169,9 +336,40 @@ class BudgetItem(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = BudgetItemQuerySet.as_manager()
+
     def __str__(self):
         return f"{self.name} - {self.event.name}"
 
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            previous = None
+            if not self._state.adding:
+                previous = BudgetItem.objects.select_for_update().filter(
+                    pk=self.pk
+                ).values('event_id', 'estimated_cost').first()
+
+            # Reserve the allocation before writing the row
+            if previous and previous['event_id'] == self.event_id:
+                Event.apply_rollup_delta(
+                    self.event_id,
+                    enforce_budget=True,
+                    budget_allocated_total=self.estimated_cost - previous['estimated_cost']
+                )
+            else:
+                if previous:
+                    Event.apply_rollup_delta(
+                        previous['event_id'],
+                        budget_allocated_total=-previous['estimated_cost']
+                    )
+                Event.apply_rollup_delta(
+                    self.event_id,
+                    enforce_budget=True,
+                    budget_allocated_total=self.estimated_cost
+                )
+
+            super().save(*args, **kwargs)
+
     @property
     def total_expenses(self):
         """Sum of all expenses linked to this budget item"""
@@ -198,6 +396,12 @@ class BudgetItem(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(
+                fields=['event', '-created_at'],
+                name='budgetitem_event_created_idx'
+            ),
+        ]
 
 
 class Expense(models.Model):
@@ -279,22 +483,58 @@ class Expense(models.Model):
         # Auto-set date to today if not provided
         if not self.date:
             self.date = timezone.now().date()
-        super().save(*args, **kwargs)
+
+        with transaction.atomic():
+            previous = None
+            if not self._state.adding:
+                previous = Expense.objects.select_for_update().filter(
+                    pk=self.pk
+                ).values('event_id', 'amount').first()
+
+            # Reserve the spend before writing the row
+            if previous and previous['event_id'] == self.event_id:
+                Event.apply_rollup_delta(
+                    self.event_id,
+                    enforce_budget=True,
+                    expenses_total=self.amount - previous['amount']
+                )
+            else:
+                if previous:
+                    Event.apply_rollup_delta(
+                        previous['event_id'],
+                        expenses_total=-previous['amount'],
+                        expense_count=-1
+                    )
+                Event.apply_rollup_delta(
+                    self.event_id,
+                    enforce_budget=True,
+                    expenses_total=self.amount,
+                    expense_count=1
+                )
+
+            super().save(*args, **kwargs)
 
     def clean(self):
-        """Validate expense against event budget"""
-        if self.event_id:
-            event = self.event
-            # Calculate what total expenses would be with this expense
-            current_expenses = event.total_expenses
-            
-            # If updating existing expense, subtract old amount
+        """
+        Validate expense against event budget, with the same numbers
+        save() enforces: the event's spend rollup plus this change.
+        """
+        if self.event_id and self.amount is not None:
+            event = Event.objects.only('expected_budget', 'expenses_total').get(
+                pk=self.event_id
+            )
+            current_expenses = event.expenses_total
+
+            # If updating an expense on the same event, only the difference counts
             if self.pk:
-                old_expense = Expense.objects.get(pk=self.pk)
-                current_expenses -= old_expense.amount
-            
+                previous = Expense.objects.filter(pk=self.pk).values(
+                    'event_id', 'amount'
+                ).first()
+                if previous and previous['event_id'] == self.event_id:
+                    current_expenses -= previous['amount']
+
             new_total = current_expenses + self.amount
-            
+
             if new_total > event.expected_budget:
                 raise ValidationError(
                     f"This expense would exceed the event budget. "
@@ -306,6 +546,16 @@ class Expense(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(
+                fields=['event', '-created_at'],
+                name='expense_event_created_idx'
+            ),
+            models.Index(
+                fields=['event', '-date'],
+                name='expense_event_date_idx'
+            ),
+        ]
 
 
 class EventChecklist(models.Model):
@@ -341,8 +591,82 @@ class EventChecklist(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remembered so an assignee change can be told apart on save
+        instance._loaded_assigned_to_id = instance.__dict__.get('assigned_to_id')
+        return instance
+
     def __str__(self):
         return f"{self.title} - {self.event.name}"
 
     class Meta:
-        ordering = ['due_date', '-created_at']
\ No newline at end of file
+        ordering = ['due_date', '-created_at']
+        indexes = [
+            models.Index(
+                fields=['event', 'status', 'due_date'],
+                name='checklist_event_status_due_idx'
+            ),
+            models.Index(
+                fields=['event', 'due_date', '-created_at'],
+                name='checklist_event_due_idx'
+            ),
+            models.Index(
+                fields=['assigned_to', 'event'],
+                name='checklist_assignee_event_idx'
+            ),
+        ]
+
+class EventTemplate(models.Model):
+    """
+    Reusable event blueprint. Budget items and checklist items are stored
+    as snapshots; checklist due dates are kept as day offsets from the
+    event date so they can be laid out against any new date.
+    """
+    name = models.CharField(max_length=255)
+    description = models.TextField(blank=True, null=True)
+    organization = models.ForeignKey(
+        Organization,
+        related_name="event_templates",
+        on_delete=models.PROTECT
+    )
+    organization_name = models.CharField(max_length=255)
+    created_by = models.ForeignKey(
+        User,
+        related_name="event_templates",
+        on_delete=models.CASCADE
+    )
+
+    location = models.CharField(max_length=255, blank=True)
+    expected_budget = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        null=True,
+        blank=True
+    )
+    expected_attendance = models.PositiveIntegerField(default=0)
+
+    # [{"category", "name", "description", "estimated_cost"}]
+    budget_items = models.JSONField(default=list, blank=True)
+    # [{"title", "description", "due_offset_days"}]
+    checklist_items = models.JSONField(default=list, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.name} - {self.organization_name}"
+
+    def save(self, *args, **kwargs):
+        if self.organization_id is None and self.organization_name:
+            self.organization = Organization.objects.for_name(self.organization_name)
+        super().save(*args, **kwargs)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(
+                fields=['organization', '-created_at'],
+                name='template_org_id_created_idx'
+            ),
+        ]
@@ -1,4 +1,6 @@
 from rest_framework.permissions import BasePermission
+from .access import accessible_event_ids
+from .models import Event
 
 
 class IsAccountManager(BasePermission):
@@ -7,3 +9,22 @@ class IsAccountManager(BasePermission):
             request.user.is_authenticated and
             request.user.is_account_manager()
         )
+
+
+class HasEventAccess(BasePermission):
+    """
+    Allow access only to events the user can see: their organization's
+    events for account managers, led events for team leads, and events
+    with an assigned checklist item for team members.
+    """
+    message = "You do not have access to this event"
+
+    def has_permission(self, request, view):
+        event_id = view.kwargs.get('event_id')
+        if event_id is None:
+            return True
+        return int(event_id) in accessible_event_ids(request)
+
+    def has_object_permission(self, request, view, obj):
+        event_id = obj.pk if isinstance(obj, Event) else obj.event_id
+        return event_id in accessible_event_ids(request)
@@ -0,0 +1,56 @@
+from django.db.models import Count, Q
+from django.utils import timezone
+from .models import EventChecklist
+
+
+OPEN_STATUSES = ('pending', 'in_progress')
+
+
+def _progress_aggregates():
+    today = timezone.now().date()
+    return {
+        'total': Count('id'),
+        'completed': Count('id', filter=Q(status='completed')),
+        'pending': Count('id', filter=Q(status='pending')),
+        'in_progress': Count('id', filter=Q(status='in_progress')),
+        'overdue': Count('id', filter=Q(
+            status__in=OPEN_STATUSES, due_date__lt=today
+        )),
+    }
+
+
+def _with_percent(counts):
+    total = counts['total']
+    counts['progress_percent'] = (
+        round((counts['completed'] / total) * 100, 2) if total > 0 else 0
+    )
+    return counts
+
+
+def checklist_progress(event_ids):
+    """
+    Checklist progress for each of the given events, keyed by event id.
+
+    All counts come from one conditional-aggregation query; events with no
+    checklist items are included with zero counts.
+    """
+    event_ids = list(event_ids)
+    empty = {key: 0 for key in _progress_aggregates()}
+    progress = {event_id: _with_percent(dict(empty)) for event_id in event_ids}
+
+    rows = EventChecklist.objects.filter(event_id__in=event_ids).order_by().values(
+        'event_id'
+    ).annotate(**_progress_aggregates())
+
+    for row in rows:
+        event_id = row.pop('event_id')
+        progress[event_id] = _with_percent(row)
+    return progress
+
+
+def checklist_totals(**filters):
+    """Checklist counts across every item matching `filters`, in one query"""
+    counts = EventChecklist.objects.filter(**filters).aggregate(
+        **_progress_aggregates()
+    )
+    return _with_percent(counts)
@@ -0,0 +1,134 @@
+from decimal import Decimal
+from django.db import connection
+from django.db.models import DecimalField, F, Value
+from django.db.models.functions import Coalesce, TruncMonth
+from .models import BudgetItem, Expense
+
+
+UNCATEGORIZED = 'Uncategorized'
+
+_ZERO = Value(Decimal('0'), output_field=DecimalField(max_digits=12, decimal_places=2))
+
+
+def _prefixed(event_filters):
+    return {f'event__{lookup}': value for lookup, value in event_filters.items()}
+
+
+def budget_variance_query(event_filters):
+    """
+    SQL and params for the budget variance report over the events matching
+    `event_filters` (Event lookups).
+
+    Budget items contribute their estimated cost and expenses their amount,
+    each bucketed by category, the event's month and the event's status.
+    Both sides are stacked with UNION ALL and summed by one GROUP BY, so
+    an estimate is never repeated once per matching expense the way a
+    join would. Expenses without a budget item fall under UNCATEGORIZED.
+    """
+    filters = _prefixed(event_filters)
+    estimates = BudgetItem.objects.filter(**filters).annotate(
+        report_category=F('category'),
+        report_month=TruncMonth('event__event_date'),
+        report_status=F('event__status'),
+        report_estimated=F('estimated_cost'),
+        report_actual=_ZERO,
+    ).values_list(
+        'report_category', 'report_month', 'report_status',
+        'report_estimated', 'report_actual'
+    ).order_by()
+    actuals = Expense.objects.filter(**filters).annotate(
+        report_category=Coalesce(F('budget_item__category'), Value(UNCATEGORIZED)),
+        report_month=TruncMonth('event__event_date'),
+        report_status=F('event__status'),
+        report_estimated=_ZERO,
+        report_actual=F('amount'),
+    ).values_list(
+        'report_category', 'report_month', 'report_status',
+        'report_estimated', 'report_actual'
+    ).order_by()
+
+    rows_sql, params = estimates.union(actuals, all=True).query.sql_with_params()
+    sql = (
+        'SELECT report_category, report_month, report_status, '
+        'SUM(report_estimated), SUM(report_actual) '
+        f'FROM ({rows_sql}) report_rows '
+        'GROUP BY report_category, report_month, report_status '
+        'ORDER BY report_category, report_month, report_status'
+    )
+    return sql, params
+
+
+_CENTS = Decimal('0.01')
+
+
+def _money(value):
+    # SQLite sums decimals as floats, other backends return Decimals;
+    # going through str() keeps a float's shortest form, not its binary
+    # expansion
+    return Decimal(str(value or 0)).quantize(_CENTS)
+
+
+def _variance_row(category, month, status, estimated, actual):
+    estimated, actual = _money(estimated), _money(actual)
+    return {
+        'category': category,
+        # A date on most backends, an ISO string on SQLite
+        'month': str(month)[:7],
+        'status': status,
+        'estimated': estimated,
+        'actual': actual,
+        'variance': estimated - actual,
+    }
+
+
+def budget_variance_rows(event_filters, chunk_size=500):
+    """
+    Yield the report rows, ordered by category, month and status. Amounts
+    are Decimals.
+
+    Rows are fetched `chunk_size` at a time from a chunked cursor (a
+    server-side cursor on PostgreSQL), so the whole result is never held
+    in memory.
+    """
+    sql, params = budget_variance_query(event_filters)
+
+    with connection.chunked_cursor() as cursor:
+        cursor.execute(sql, params)
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                return
+            for row in rows:
+                yield _variance_row(*row)
+
+
+class VarianceTotals:
+    """Running per-category, per-month, per-status and overall totals"""
+
+    def __init__(self):
+        self.by_category = {}
+        self.by_month = {}
+        self.by_status = {}
+        self.overall = self._empty()
+
+    @staticmethod
+    def _empty():
+        return {key: Decimal('0.00') for key in ('estimated', 'actual', 'variance')}
+
+    def add(self, row):
+        for totals in (
+            self.by_category.setdefault(row['category'], self._empty()),
+            self.by_month.setdefault(row['month'], self._empty()),
+            self.by_status.setdefault(row['status'], self._empty()),
+            self.overall,
+        ):
+            for key in ('estimated', 'actual', 'variance'):
+                totals[key] += row[key]
+
+    def as_dict(self):
+        return {
+            'by_category': self.by_category,
+            'by_month': dict(sorted(self.by_month.items())),
+            'by_status': self.by_status,
+            'overall': self.overall,
+        }
@@ -1,13 +1,15 @@
 from rest_framework import serializers
-from .models import Event,BudgetItem,Expense,EventChecklist
+from plantra.fieldsets import SparseFieldsSerializerMixin
+from .models import Event,BudgetItem,Expense,EventChecklist,EventTemplate
 from accounts.models import User
 
-class EventSerializer(serializers.ModelSerializer):
+class EventSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Event
         fields = '__all__'
         read_only_fields = (
             'id',
+            'organization',
             'organization_name',
             'created_by',
             'created_at',
@@ -24,30 +26,148 @@ class EventSerializer(serializers.ModelSerializer):
         user = self.context["request"].user
 
         validated_data["created_by"] = user
+        validated_data["organization_id"] = user.organization_id
         validated_data["organization_name"] = user.organization_name
 
         return super().create(validated_data)
 
 
+class EventListSerializer(EventSerializer):
+    """Event without its long description, for list screens"""
+    class Meta(EventSerializer.Meta):
+        fields = None
+        exclude = ('description',)
 
-class BudgetItemSerializer(serializers.ModelSerializer):
+
+
+class BudgetItemSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = BudgetItem
         fields = "__all__"
         read_only_fields = ("id", "event")
 
 
+class BudgetItemListSerializer(BudgetItemSerializer):
+    class Meta(BudgetItemSerializer.Meta):
+        fields = None
+        exclude = ('description',)
+
 
-class ExpenseSerializer(serializers.ModelSerializer):
+
+class ExpenseSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Expense
         fields = "__all__"
         read_only_fields = ("id", "event")
 
 
-class EventChecklistSerializer(serializers.ModelSerializer):
+class ExpenseListSerializer(ExpenseSerializer):
+    class Meta(ExpenseSerializer.Meta):
+        fields = None
+        exclude = ('description',)
+
+
+class EventChecklistSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = EventChecklist
         fields = '__all__'
         read_only_fields = ('id', 'event')
 
+
+class EventChecklistListSerializer(EventChecklistSerializer):
+    class Meta(EventChecklistSerializer.Meta):
+        fields = None
+        exclude = ('description',)
+
+
+
+class ChecklistBulkCreateSerializer(EventChecklistSerializer):
+    # Plain id; resolved for the whole batch in one query
+    assigned_to = serializers.IntegerField(required=False, allow_null=True)
+
+
+class ChecklistBulkUpdateSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    status = serializers.ChoiceField(
+        choices=EventChecklist.STATUS_CHOICES, required=False
+    )
+    assigned_to = serializers.IntegerField(required=False, allow_null=True)
+    due_date = serializers.DateField(required=False, allow_null=True)
+
+
+class ChecklistBulkSerializer(serializers.Serializer):
+    """
+    Batch of checklist changes for a single event:
+    {"create": [...], "update": [{"id": 1, "status": "completed"}], "delete": [2, 3]}
+    """
+    create = ChecklistBulkCreateSerializer(many=True, required=False)
+    update = ChecklistBulkUpdateSerializer(many=True, required=False)
+    delete = serializers.ListField(
+        child=serializers.IntegerField(), required=False
+    )
+
+    def validate(self, attrs):
+        if not any(attrs.get(key) for key in ('create', 'update', 'delete')):
+            raise serializers.ValidationError(
+                "Provide at least one of create, update or delete"
+            )
+
+        update_ids = [row['id'] for row in attrs.get('update', [])]
+        if len(update_ids) != len(set(update_ids)):
+            raise serializers.ValidationError(
+                {'update': "Each checklist item can only be updated once per batch"}
+            )
+        if set(update_ids) & set(attrs.get('delete', [])):
+            raise serializers.ValidationError(
+                "The same checklist item cannot be updated and deleted"
+            )
+        return attrs
+
+
+class EventTemplateSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = EventTemplate
+        fields = '__all__'
+        read_only_fields = (
+            'id',
+            'organization',
+            'organization_name',
+            'created_by',
+            'created_at',
+            'budget_items',
+            'checklist_items',
+        )
+
+
+class SaveAsTemplateSerializer(serializers.Serializer):
+    name = serializers.CharField(max_length=255)
+    description = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+
+
+class EventFromBlueprintSerializer(serializers.Serializer):
+    """
+    Fields for an event created by cloning or from a template. Anything
+    left out is taken from the source event or template.
+    """
+    name = serializers.CharField(max_length=255)
+    event_date = serializers.DateField()
+    location = serializers.CharField(max_length=255, required=False)
+    description = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+    expected_budget = serializers.DecimalField(
+        max_digits=12, decimal_places=2, required=False
+    )
+    expected_attendance = serializers.IntegerField(min_value=0, required=False)
+    team_lead = serializers.PrimaryKeyRelatedField(
+        queryset=User.objects.none(),
+        required=False,
+        allow_null=True
+    )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Only team leads from the requesting user's organization
+        request = self.context.get('request')
+        if request is not None:
+            self.fields['team_lead'].queryset = User.objects.filter(
+                role='Team Lead', organization_id=request.user.organization_id
+            )
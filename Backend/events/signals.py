@@ -0,0 +1,107 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_delete
+from django.dispatch import receiver
+from .access import invalidate_org_access, invalidate_user_access
+from .versions import bump_versions
+from .alerts import publish_alert_transitions
+from .models import Event, BudgetItem, Expense, EventChecklist
+
+
+# Organization of each event whose delete is in progress, by event id. A
+# cascade sends post_delete for every child row between the event's
+# pre_delete and post_delete; this spares each of them a lookup query.
+_deleting_events = {}
+
+
+@receiver(pre_delete, sender=Event)
+def event_deleting(sender, instance, **kwargs):
+    _deleting_events[instance.pk] = instance.organization_id
+
+
+def event_organization_id(instance):
+    """
+    The organization of a child row's event: from the loaded event, the
+    event being deleted, or one query that is remembered on the row.
+    """
+    event = instance._state.fields_cache.get('event')
+    if event is not None:
+        return event.organization_id
+    if instance.event_id in _deleting_events:
+        return _deleting_events[instance.event_id]
+    if not hasattr(instance, '_event_organization_id'):
+        instance._event_organization_id = Event.objects.filter(
+            pk=instance.event_id
+        ).values_list('organization_id', flat=True).first()
+    return instance._event_organization_id
+
+
+@receiver(post_delete, sender=BudgetItem)
+def release_budget_allocation(sender, instance, **kwargs):
+    """Remove a deleted budget item from its event's allocated total"""
+    Event.apply_rollup_delta(
+        instance.event_id,
+        budget_allocated_total=-instance.estimated_cost
+    )
+
+
+@receiver(post_delete, sender=Expense)
+def release_expense(sender, instance, **kwargs):
+    """Remove a deleted expense from its event's spent total"""
+    Event.apply_rollup_delta(
+        instance.event_id,
+        expenses_total=-instance.amount,
+        expense_count=-1
+    )
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def event_access_changed(sender, instance, **kwargs):
+    """New/removed events and team lead changes affect the whole org"""
+    organization_id = instance.organization_id
+    transaction.on_commit(lambda: invalidate_org_access(organization_id))
+
+
+@receiver(post_save, sender=EventChecklist)
+@receiver(post_delete, sender=EventChecklist)
+def checklist_assignment_changed(sender, instance, **kwargs):
+    """Only the previous and the new assignee can gain or lose an event"""
+    previous = getattr(instance, '_loaded_assigned_to_id', None)
+    if kwargs.get('created') is False and previous == instance.assigned_to_id:
+        return
+    users = (previous, instance.assigned_to_id)
+    instance._loaded_assigned_to_id = instance.assigned_to_id
+    transaction.on_commit(lambda: invalidate_user_access(*users))
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def event_written(sender, instance, **kwargs):
+    event_id, organization_id = instance.pk, instance.organization_id
+    transaction.on_commit(lambda: bump_versions([event_id], organization_id))
+    if kwargs['signal'] is post_delete:
+        _deleting_events.pop(event_id, None)
+
+
+@receiver(post_save, sender=BudgetItem)
+@receiver(post_delete, sender=BudgetItem)
+@receiver(post_save, sender=Expense)
+@receiver(post_delete, sender=Expense)
+@receiver(post_save, sender=EventChecklist)
+@receiver(post_delete, sender=EventChecklist)
+def event_child_written(sender, instance, **kwargs):
+    """Bump the event's and its organization's version stamps"""
+    organization_id = event_organization_id(instance)
+    event_id = instance.event_id
+    transaction.on_commit(lambda: bump_versions([event_id], organization_id))
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_save, sender=BudgetItem)
+@receiver(post_delete, sender=BudgetItem)
+@receiver(post_save, sender=Expense)
+@receiver(post_delete, sender=Expense)
+def budget_changed(sender, instance, **kwargs):
+    """Push alert transitions to open budget alert streams"""
+    event_id = instance.pk if sender is Event else instance.event_id
+    transaction.on_commit(lambda: publish_alert_transitions(event_id))
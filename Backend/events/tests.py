@@ -1,3 +1,1352 @@
-from django.test import TestCase
+import asyncio
+import base64
+import csv
+import io
+import json
+import os
+import random
+import runpy
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock, skipUnless
+from datetime import timedelta
+from decimal import Decimal
+from asgiref.sync import async_to_sync, sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured, ValidationError
+from django.db import OperationalError, connection, connections
+from django.http import Http404
+from django.test import AsyncClient, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.test import APIClient, APIRequestFactory, force_authenticate
+from accounts.models import User
+from accounts.serializers import MyTokenObtainPairSerializer
+from plantra.async_views import AsyncAPIView, gather_queries
+from .alerts import publish_alert_transitions
+from .exports import EXPENSE_COLUMNS, cell
+from .models import Event, BudgetItem, Expense, EventChecklist, BudgetExceeded
+from .views import ExportView
 
-# Create your tests here.
+
+def clear_caches():
+    # Cached access sets, version stamps and token versions outlive the
+    # test transaction; start every test from empty caches
+    for cache in caches.all():
+        cache.clear()
+
+
+class BudgetAlertQueryCountTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='manager@example.com',
+            name='Manager',
+            organization_name='Acme',
+            password='pass1234'
+        )
+        self.event = Event.objects.create(
+            name='Launch',
+            location='Nairobi',
+            event_date='2030-01-01',
+            expected_budget=Decimal('100000'),
+            organization_name='Acme',
+            created_by=self.user
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = reverse('budget_alerts', args=[self.event.id])
+
+        # Start from a cold cache, then resolve the user's accessible
+        # events once so only the alert queries are counted below
+        clear_caches()
+        self.client.get(self.url)
+
+    def add_items(self, count):
+        for i in range(count):
+            item = BudgetItem.objects.create(
+                event=self.event, name=f'Item {i}', estimated_cost=Decimal('10')
+            )
+            # Every other item goes over its estimate
+            amount = Decimal('15') if i % 2 == 0 else Decimal('5')
+            Expense.objects.create(
+                event=self.event, budget_item=item, name=f'Spend {i}', amount=amount
+            )
+
+    def test_query_count_does_not_grow_with_budget_items(self):
+        for count in (3, 60):
+            self.add_items(count)
+            with self.assertNumQueries(2):
+                response = self.client.get(self.url)
+            self.assertEqual(response.status_code, 200)
+
+    def test_alerts_match_item_overruns(self):
+        self.add_items(4)
+        response = self.client.get(self.url)
+
+        item_alerts = [
+            alert for alert in response.data['alerts']
+            if alert['type'] == 'budget_item_exceeded'
+        ]
+        self.assertEqual(
+            sorted(alert['budget_item'] for alert in item_alerts),
+            ['Item 0', 'Item 2']
+        )
+        self.assertIn('exceeded estimate by 5.00', item_alerts[0]['message'])
+
+
+class BudgetByCategoryPropertyTests(TestCase):
+    """
+    Compare BudgetItem.objects.by_category() with a plain Python sum over
+    randomly generated events. Each seed is a separate, reproducible case.
+    """
+    SEEDS = range(25)
+    CATEGORIES = ['Venue', 'Catering', 'Marketing', 'General', '']
+
+    def setUp(self):
+        clear_caches()
+        self.user = User.objects.create_user(
+            email='manager@example.com',
+            name='Manager',
+            organization_name='Acme',
+        )
+
+    def generate_event(self, rng):
+        event = Event.objects.create(
+            name='Generated',
+            location='Nairobi',
+            event_date='2030-01-01',
+            expected_budget=Decimal('10000000'),
+            organization_name='Acme',
+            created_by=self.user
+        )
+        items = [
+            BudgetItem.objects.create(
+                event=event,
+                name=f'Item {i}',
+                category=rng.choice(self.CATEGORIES),
+                estimated_cost=Decimal(rng.randint(0, 500000)) / 100
+            )
+            for i in range(rng.randint(0, 8))
+        ]
+        for i in range(rng.randint(0, 20)):
+            # Some expenses are linked to no budget item at all
+            Expense.objects.create(
+                event=event,
+                budget_item=rng.choice(items + [None]),
+                name=f'Expense {i}',
+                amount=Decimal(rng.randint(1, 200000)) / 100
+            )
+        return event
+
+    @staticmethod
+    def reference(event):
+        totals = {}
+        for item in event.budget_items.all():
+            entry = totals.setdefault(
+                item.category, {'estimated': Decimal('0'), 'actual': Decimal('0')}
+            )
+            entry['estimated'] += item.estimated_cost
+            entry['actual'] += sum(
+                (expense.amount for expense in item.expenses.all()), Decimal('0')
+            )
+        return totals
+
+    def test_matches_reference(self):
+        for seed in self.SEEDS:
+            with self.subTest(seed=seed):
+                event = self.generate_event(random.Random(seed))
+                rows = BudgetItem.objects.filter(event=event).by_category()
+                result = {
+                    row['category']: {
+                        'estimated': Decimal(row['estimated']).quantize(Decimal('0.01')),
+                        'actual': Decimal(row['actual']).quantize(Decimal('0.01')),
+                    }
+                    for row in rows
+                }
+
+                self.assertEqual(result, self.reference(event))
+                self.assertEqual(
+                    [row['estimated'] for row in rows],
+                    sorted((row['estimated'] for row in rows), reverse=True)
+                )
+
+    def test_summary_uses_category_rollups(self):
+        event = self.generate_event(random.Random(0))
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        response = client.get(reverse('event_summary', args=[event.id]))
+
+        self.assertEqual(response.status_code, 200)
+        expected = self.reference(event)
+        self.assertEqual(
+            {row['category'] for row in response.data['budget_by_category']},
+            set(expected)
+        )
+        for row in response.data['budget_by_category']:
+            self.assertEqual(
+                Decimal(row['actual']).quantize(Decimal('0.01')),
+                expected[row['category']]['actual']
+            )
+
+
+class EventRollupSaveTests(TestCase):
+    def setUp(self):
+        clear_caches()
+        self.user = User.objects.create_user(
+            email='manager@example.com',
+            name='Manager',
+            organization_name='Acme',
+        )
+        self.event = Event.objects.create(
+            name='Launch',
+            location='Nairobi',
+            event_date='2030-01-01',
+            expected_budget=Decimal('1000'),
+            organization_name='Acme',
+            created_by=self.user
+        )
+
+    def test_saving_a_stale_event_keeps_rollups(self):
+        stale = Event.objects.get(pk=self.event.pk)
+        Expense.objects.create(event=self.event, name='Venue', amount=Decimal('400'))
+        BudgetItem.objects.create(event=self.event, name='Venue', estimated_cost=Decimal('600'))
+
+        stale.name = 'Relaunch'
+        stale.save()
+
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.name, 'Relaunch')
+        self.assertEqual(self.event.expenses_total, Decimal('400'))
+        self.assertEqual(self.event.expense_count, 1)
+        self.assertEqual(self.event.budget_allocated_total, Decimal('600'))
+
+    def test_expense_clean_matches_enforcement(self):
+        expense = Expense.objects.create(event=self.event, name='Venue', amount=Decimal('900'))
+
+        # Raising the same expense to the whole budget fits...
+        expense.amount = Decimal('1000')
+        expense.clean()
+        expense.save()
+
+        # ...and anything past it is refused by both
+        extra = Expense(event=self.event, name='Catering', amount=Decimal('1'))
+        with self.assertRaises(ValidationError):
+            extra.clean()
+        with self.assertRaises(BudgetExceeded):
+            extra.save()
+
+
+class EventCascadeDeleteTests(TestCase):
+    def setUp(self):
+        clear_caches()
+        self.user = User.objects.create_user(
+            email='manager@example.com',
+            name='Manager',
+            organization_name='Acme',
+        )
+
+    def make_event(self, rows):
+        event = Event.objects.create(
+            name='Launch',
+            location='Nairobi',
+            event_date='2030-01-01',
+            expected_budget=Decimal('100000'),
+            organization_name='Acme',
+            created_by=self.user
+        )
+        for i in range(rows):
+            BudgetItem.objects.create(event=event, name=f'Item {i}', estimated_cost=Decimal('10'))
+            Expense.objects.create(event=event, name=f'Expense {i}', amount=Decimal('10'))
+            EventChecklist.objects.create(event=event, title=f'Task {i}')
+        # Fresh from the database, as the delete view loads it
+        return Event.objects.get(pk=event.pk)
+
+    def test_cascade_looks_up_no_organizations(self):
+        # Collecting and deleting each table, plus the per-row rollup
+        # updates; the child rows' organization comes from the event
+        for rows in (2, 6):
+            event = self.make_event(rows)
+            with self.assertNumQueries(8 + 2 * rows):
+                with self.captureOnCommitCallbacks(execute=True):
+                    event.delete()
+
+
+class BulkExpenseImportTests(TestCase):
+    def setUp(self):
+        clear_caches()
+        self.user = User.objects.create_user(
+            email='manager@example.com',
+            name='Manager',
+            organization_name='Acme',
+        )
+        self.event = Event.objects.create(
+            name='Launch',
+            location='Nairobi',
+            event_date='2030-01-01',
+            expected_budget=Decimal('100'),
+            organization_name='Acme',
+            created_by=self.user
+        )
+        self.item = BudgetItem.objects.create(
+            event=self.event, name='Venue', estimated_cost=Decimal('50')
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = reverse('bulk_import_expenses', args=[self.event.id])
+
+    def post(self, body, content_type='text/csv'):
+        return self.client.generic('POST', self.url, body, content_type=content_type)
+
+    def test_csv_rows_are_created(self):
+        response = self.post(
+            '\ufeffname,amount,budget_item,date\n'
+            f'Hall,40.00,{self.item.id},2030-01-01\n'
+            'Flyers,"10.50",,\n'.encode('utf-8')
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json(), {'created': 2, 'failed': 0, 'errors': []})
+        hall = Expense.objects.get(name='Hall')
+        self.assertEqual(hall.budget_item, self.item)
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.expenses_total, Decimal('50.50'))
+        self.assertEqual(self.event.expense_count, 2)
+
+    def test_invalid_rows_are_reported_and_valid_rows_kept(self):
+        rows = [
+            {'name': 'Hall', 'amount': '40'},
+            {'name': 'Flyers', 'amount': 'lots'},
+            {'name': 'Chairs', 'amount': '5', 'budget_item': 999},
+        ]
+        body = '\n'.join(json.dumps(row) for row in rows) + '\nnot json\n'
+        response = self.post(body.encode(), 'application/x-ndjson')
+
+        self.assertEqual(response.status_code, 201)
+        report = response.json()
+        self.assertEqual((report['created'], report['failed']), (1, 3))
+        self.assertEqual([error['row'] for error in report['errors']], [2, 3, 4])
+        self.assertIn('amount', report['errors'][0]['errors'])
+        self.assertIn('budget_item', report['errors'][1]['errors'])
+        self.assertEqual(
+            report['errors'][2]['errors'], {'non_field_errors': ['Row is not valid JSON']}
+        )
+        self.assertEqual(list(Expense.objects.values_list('name', flat=True)), ['Hall'])
+
+    def test_rows_over_budget_are_rejected(self):
+        response = self.post(b'name,amount\nHall,60\nCatering,50\nFlyers,40\n')
+
+        report = response.json()
+        self.assertEqual((report['created'], report['failed']), (2, 1))
+        self.assertEqual(report['errors'][0]['row'], 2)
+        self.assertIn('budget', report['errors'][0]['errors']['amount'][0])
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.expenses_total, Decimal('100'))
+
+    def test_nothing_valid_is_a_bad_request(self):
+        response = self.post(b'name,amount\nCatering,500\n')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Expense.objects.exists())
+
+    def test_rows_that_are_not_utf8_are_reported(self):
+        body = 'name,amount\nCaf\u00e9,10\nHall,20\n'.encode('latin-1')
+        response = self.post(body)
+
+        self.assertEqual(response.status_code, 201)
+        report = response.json()
+        self.assertEqual((report['created'], report['failed']), (1, 1))
+        self.assertEqual(report['errors'], [{
+            'row': 1, 'errors': {'non_field_errors': ['Row is not valid UTF-8 text']}
+        }])
+
+    def test_header_that_is_not_utf8_is_a_bad_request(self):
+        response = self.post('name,amount\nHall,20\n'.encode('utf-16'))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Expense.objects.exists())
+
+
+class BulkChecklistTests(TestCase):
+    def setUp(self):
+        clear_caches()
+        self.manager = User.objects.create_user(
+            email='manager@example.com',
+            name='Manager',
+            organization_name='Acme',
+        )
+        self.member = User.objects.create_user(
+            email='member@example.com',
+            name='Member',
+            organization_name='Acme',
+            role='Team Member'
+        )
+        self.event = self.create_event('Launch')
+        self.other_event = self.create_event('Retreat')
+        self.first = EventChecklist.objects.create(event=self.event, title='Book venue')
+        self.second = EventChecklist.objects.create(event=self.event, title='Print flyers')
+        self.elsewhere = EventChecklist.objects.create(event=self.other_event, title='Hire bus')
+        self.client = APIClient()
+        self.client.force_authenticate(self.manager)
+        self.url = reverse('bulk_checklist', args=[self.event.id])
+
+    def create_event(self, name):
+        return Event.objects.create(
+            name=name,
+            location='Nairobi',
+            event_date='2030-01-01',
+            expected_budget=Decimal('1000'),
+            organization_name='Acme',
+            created_by=self.manager
+        )
+
+    def post(self, batch):
+        return self.client.post(self.url, batch, format='json')
+
+    def titles(self):
+        return sorted(self.event.checklist_items.values_list('title', flat=True))
+
+    def test_creates_updates_and_deletes_in_one_batch(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.post({
+                'create': [{'title': 'Order food', 'assigned_to': self.member.id}],
+                'update': [{'id': self.first.id, 'status': 'completed'}],
+                'delete': [self.second.id],
+            })
+
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual((len(body['created']), body['updated'], body['deleted']), (1, 1, 1))
+        self.assertEqual(self.titles(), ['Book venue', 'Order food'])
+        self.first.refresh_from_db()
+        self.assertEqual(self.first.status, 'completed')
+
+        # The new assignee can see the event straight away
+        self.client.force_authenticate(self.member)
+        self.assertEqual(
+            self.client.get(reverse('event_summary', args=[self.event.id])).status_code, 200
+        )
+
+    def test_one_invalid_row_rolls_back_the_batch(self):
+        response = self.post({
+            'create': [{'title': 'Order food'}],
+            'update': [{'id': self.first.id, 'assigned_to': 999}],
+            'delete': [self.second.id],
+        })
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('assigned_to', response.json())
+        self.assertEqual(self.titles(), ['Book venue', 'Print flyers'])
+
+    def test_items_of_another_event_are_rejected(self):
+        for batch, key in (
+            ({'update': [{'id': self.elsewhere.id, 'status': 'completed'}]}, 'update'),
+            ({'create': [{'title': 'Order food'}], 'delete': [self.elsewhere.id]}, 'delete'),
+        ):
+            response = self.post(batch)
+            self.assertEqual(response.status_code, 400)
+            self.assertIn(key, response.json())
+
+        self.elsewhere.refresh_from_db()
+        self.assertEqual(self.elsewhere.status, 'pending')
+        self.assertEqual(self.titles(), ['Book venue', 'Print flyers'])
+
+    def test_access_follows_the_event_access_rules(self):
+        # A member assigned to the event may manage its checklist, like the
+        # single-item endpoints; other events stay off limits
+        EventChecklist.objects.create(
+            event=self.event, title='Greet guests', assigned_to=self.member
+        )
+        self.client.force_authenticate(self.member)
+
+        response = self.post({'update': [{'id': self.first.id, 'status': 'in_progress'}]})
+        self.assertEqual(response.status_code, 200)
+
+        self.url = reverse('bulk_checklist', args=[self.other_event.id])
+        response = self.post({'update': [{'id': self.elsewhere.id, 'status': 'completed'}]})
+        self.assertEqual(response.status_code, 403)
+
+
+class EventAccessCacheTests(TestCase):
+    def setUp(self):
+        clear_caches()
+        self.manager = User.objects.create_user(
+            email='manager@example.com',
+            name='Manager',
+            organization_name='Acme',
+        )
+        self.lead = User.objects.create_user(
+            email='lead@example.com',
+            name='Lead',
+            organization_name='Acme',
+            role='Team Lead'
+        )
+        self.member = User.objects.create_user(
+            email='member@example.com',
+            name='Member',
+            organization_name='Acme',
+            role='Team Member'
+        )
+        self.event = Event.objects.create(
+            name='Launch',
+            location='Nairobi',
+            event_date='2030-01-01',
+            expected_budget=Decimal('1000'),
+            organization_name='Acme',
+            created_by=self.manager,
+            team_lead=self.lead
+        )
+        self.task = EventChecklist.objects.create(
+            event=self.event, title='Book venue', assigned_to=self.member
+        )
+        self.client = APIClient()
+        self.url = reverse('list_checklist', args=[self.event.id])
+
+    def get(self, user):
+        self.client.force_authenticate(user)
+        return self.client.get(self.url).status_code
+
+    def test_replaced_team_lead_is_denied_on_the_next_request(self):
+        self.assertEqual(self.get(self.lead), 200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.event.team_lead = None
+            self.event.save()
+
+        self.assertEqual(self.get(self.lead), 403)
+
+    def test_unassigned_member_is_denied_on_the_next_request(self):
+        self.assertEqual(self.get(self.member), 200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.task.delete()
+
+        self.assertEqual(self.get(self.member), 403)
+
+    def test_sets_are_cached_in_the_shared_cache(self):
+        self.get(self.member)
+
+        key = f'event-access:user:{self.member.id}'
+        self.assertIsNotNone(caches[settings.VERSION_CACHE_ALIAS].get(key))
+        self.assertIsNone(caches['default'].get(key))
+
+    @override_settings(VERSION_CACHE_SHARED=False)
+    def test_without_a_shared_cache_access_is_resolved_per_request(self):
+        self.assertEqual(self.get(self.member), 200)
+
+        # A write handled by another worker: this process hears nothing
+        EventChecklist.objects.filter(pk=self.task.pk).update(assigned_to=None)
+
+        self.assertEqual(self.get(self.member), 403)
+        self.assertEqual(caches[settings.VERSION_CACHE_ALIAS].get(
+            f'event-access:user:{self.member.id}'
+        ), None)
+
+
+class ConcurrentBudgetEnforcementTests(TransactionTestCase):
+    WORKERS = 16
+
+    def setUp(self):
+        clear_caches()
+        self.user = User.objects.create_user(
+            email='manager@example.com',
+            name='Manager',
+            organization_name='Acme',
+        )
+        self.event = Event.objects.create(
+            name='Launch',
+            location='Nairobi',
+            event_date='2030-01-01',
+            expected_budget=Decimal('1000'),
+            organization_name='Acme',
+            created_by=self.user
+        )
+
+    def run_concurrently(self, write):
+        """Run `write` from many threads at once; return how many succeeded"""
+        barrier = threading.Barrier(self.WORKERS)
+        outcomes = []
+
+        def worker(i):
+            try:
+                barrier.wait()
+                while True:
+                    try:
+                        write(i)
+                        outcomes.append(True)
+                        return
+                    except BudgetExceeded:
+                        outcomes.append(False)
+                        return
+                    except OperationalError:
+                        # SQLite reports lock contention instead of blocking
+                        time.sleep(0.005)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(self.WORKERS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(outcomes), self.WORKERS)
+        return outcomes.count(True)
+
+    def test_parallel_expenses_never_overshoot_budget(self):
+        succeeded = self.run_concurrently(lambda i: Expense.objects.create(
+            event_id=self.event.id, name=f'Expense {i}', amount=Decimal('100')
+        ))
+
+        self.event.refresh_from_db()
+        self.assertEqual(succeeded, 10)
+        self.assertEqual(Expense.objects.filter(event=self.event).count(), 10)
+        self.assertEqual(self.event.expenses_total, Decimal('1000'))
+        self.assertEqual(self.event.compute_rollups()['expenses_total'], Decimal('1000'))
+
+    def test_parallel_budget_items_never_overshoot_allocation(self):
+        succeeded = self.run_concurrently(lambda i: BudgetItem.objects.create(
+            event_id=self.event.id, name=f'Item {i}', estimated_cost=Decimal('300')
+        ))
+
+        self.event.refresh_from_db()
+        self.assertEqual(succeeded, 3)
+        self.assertEqual(self.event.budget_allocated_total, Decimal('900'))
+        self.assertEqual(
+            self.event.compute_rollups()['budget_allocated_total'], Decimal('900')
+        )
+
+
+class CloneEventTeamLeadTests(TestCase):
+    def setUp(self):
+        clear_caches()
+        self.user = User.objects.create_user(
+            email='manager@example.com',
+            name='Manager',
+            organization_name='Acme',
+        )
+        self.lead = User.objects.create_user(
+            email='lead@example.com',
+            name='Lead',
+            organization_name='Acme',
+            role='Team Lead'
+        )
+        self.other_lead = User.objects.create_user(
+            email='lead2@example.com',
+            name='Other Lead',
+            organization_name='Acme',
+            role='Team Lead'
+        )
+        self.event = Event.objects.create(
+            name='Launch',
+            location='Nairobi',
+            event_date='2030-01-01',
+            expected_budget=Decimal('1000'),
+            organization_name='Acme',
+            created_by=self.user,
+            team_lead=self.lead
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = reverse('clone_event', args=[self.event.id])
+
+    def clone(self, **fields):
+        return self.client.post(
+            self.url, {'name': 'Copy', 'event_date': '2030-02-01', **fields}, format='json'
+        )
+
+    def test_keeps_source_team_lead_by_default(self):
+        response = self.clone()
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Event.objects.get(name='Copy').team_lead, self.lead)
+
+    def test_overrides_team_lead(self):
+        response = self.clone(team_lead=self.other_lead.id)
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Event.objects.get(name='Copy').team_lead, self.other_lead)
+
+    def test_clears_team_lead(self):
+        response = self.clone(team_lead=None)
+
+        self.assertEqual(response.status_code, 201)
+        self.assertIsNone(Event.objects.get(name='Copy').team_lead)
+
+    def test_rejects_team_lead_from_another_organization(self):
+        outsider = User.objects.create_user(
+            email='lead@other.example.com',
+            name='Outsider',
+            organization_name='Other',
+            role='Team Lead'
+        )
+
+        response = self.clone(team_lead=outsider.id)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('team_lead', response.data)
+        self.assertFalse(Event.objects.filter(name='Copy').exists())
+
+
+class SparseFieldsetTests(TestCase):
+    def setUp(self):
+        clear_caches()
+        self.user = User.objects.create_user(
+            email='manager@example.com',
+            name='Manager',
+            organization_name='Acme',
+        )
+        self.event = Event.objects.create(
+            name='Launch',
+            location='Nairobi',
+            description='A very long description',
+            event_date='2030-01-01',
+            expected_budget=Decimal('1000'),
+            organization_name='Acme',
+            created_by=self.user
+        )
+        item = BudgetItem.objects.create(
+            event=self.event, name='Venue', estimated_cost=Decimal('600')
+        )
+        Expense.objects.create(
+            event=self.event, budget_item=item, name='Hall',
+            amount=Decimal('400'), description='Deposit and balance'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def get(self, url, params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()['results'], ' '.join(q['sql'] for q in queries)
+
+    def test_fields_limits_the_payload_and_the_columns(self):
+        rows, sql = self.get(reverse('list_events'), {'fields': 'id,name'})
+
+        self.assertEqual(rows, [{'id': self.event.id, 'name': 'Launch'}])
+        self.assertNotIn('"events_event"."description"', sql)
+        self.assertNotIn('"events_event"."location"', sql)
+
+    def test_compact_leaves_out_descriptions(self):
+        rows, sql = self.get(
+            reverse('list_expenses', args=[self.event.id]), {'compact': 'true'}
+        )
+
+        self.assertNotIn('description', rows[0])
+        self.assertEqual((rows[0]['name'], rows[0]['amount']), ('Hall', '400.00'))
+        self.assertNotIn('"events_expense"."description"', sql)
+
+    def test_default_response_is_unchanged(self):
+        rows, _ = self.get(reverse('list_events'), {})
+
+        self.assertEqual(rows[0]['description'], 'A very long description')
+        self.assertIn('location', rows[0])
+
+    def test_related_fields_serialize_without_extra_queries(self):
+        url = reverse('list_expenses', args=[self.event.id])
+        self.client.get(url, {'fields': 'id,budget_item'})  # resolves access
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url, {'fields': 'id,budget_item'})
+        self.assertEqual(response.json()['results'][0]['budget_item'], BudgetItem.objects.get().id)
+
+    def test_unknown_fields_are_rejected(self):
+        response = self.client.get(reverse('list_events'), {'fields': 'id,secret'})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('secret', response.json()['fields'])
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        clear_caches()
+        self.user = User.objects.create_user(
+            email='manager@example.com',
+            name='Manager',
+            organization_name='Acme',
+        )
+        for i in range(5):
+            Event.objects.create(
+                name=f'Event {i}',
+                location='Nairobi',
+                event_date='2030-01-01',
+                expected_budget=Decimal('1000'),
+                organization_name='Acme',
+                created_by=self.user
+            )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = reverse('list_events')
+
+    def cursor(self, values):
+        return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+    def test_follows_next_through_every_page(self):
+        names = []
+        url = f'{self.url}?page_size=2'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            names += [event['name'] for event in response.data['results']]
+            url = response.data['next']
+
+        self.assertEqual(sorted(names), [f'Event {i}' for i in range(5)])
+
+    def test_malformed_cursors_are_not_found(self):
+        for cursor in (
+            'not-base64!',
+            self.cursor([1]),
+            self.cursor([{'a': 1}, 1]),
+            self.cursor(['2030-01-01T00:00:00Z', [1]]),
+            self.cursor(['yesterday', 1]),
+            self.cursor(['2030-01-01T00:00:00Z', 'one']),
+            self.cursor([None, 1]),
+        ):
+            with self.subTest(cursor=cursor):
+                response = self.client.get(self.url, {'cursor': cursor})
+                self.assertEqual(response.status_code, 404)
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        clear_caches()
+        self.user = User.objects.create_user(
+            email='manager@example.com',
+            name='Manager',
+            organization_name='Acme',
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = reverse('list_events')
+
+    def create_event(self, name):
+        return Event.objects.create(
+            name=name,
+            location='Nairobi',
+            event_date='2030-01-01',
+            expected_budget=Decimal('1000'),
+            organization_name='Acme',
+            created_by=self.user
+        )
+
+    def test_unchanged_list_is_not_modified_until_a_write(self):
+        self.create_event('Launch')
+        with self.captureOnCommitCallbacks(execute=True):
+            etag = self.client.get(self.url).headers['ETag']
+
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create_event('Relaunch')
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['ETag'], etag)
+
+    def test_checklist_progress_is_modified_at_midnight(self):
+        event = self.create_event('Launch')
+        EventChecklist.objects.create(
+            event=event, title='Book venue',
+            due_date=timezone.now().date() + timedelta(days=1)
+        )
+        url = reverse('checklist_progress')
+        response = self.client.get(url)
+        etag = response.headers['ETag']
+        self.assertEqual(response.json()[0]['overdue'], 0)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        # Nothing is written, but the task is overdue two days later
+        later = timezone.now() + timedelta(days=2)
+        with mock.patch('django.utils.timezone.now', return_value=later):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()[0]['overdue'], 1)
+
+    @override_settings(CONDITIONAL_GET_ENABLED=False)
+    def test_disabled_without_a_shared_version_cache(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('ETag', response.headers)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH='"x"').status_code, 200)
+
+
+class BudgetAlertStreamTests(TestCase):
+    def setUp(self):
+        clear_caches()
+        self.user = User.objects.create_user(
+            email='manager@example.com',
+            name='Manager',
+            organization_name='Acme',
+        )
+        self.event = Event.objects.create(
+            name='Launch',
+            location='Nairobi',
+            event_date='2030-01-01',
+            expected_budget=Decimal('1000'),
+            organization_name='Acme',
+            created_by=self.user
+        )
+        self.item = BudgetItem.objects.create(
+            event=self.event, name='Venue', estimated_cost=Decimal('100')
+        )
+        self.url = reverse('budget_alert_stream', args=[self.event.id])
+
+    def overspend(self):
+        Expense.objects.create(
+            event=self.event, budget_item=self.item, name='Hall', amount=Decimal('150')
+        )
+        publish_alert_transitions(self.event.id)
+
+    async def test_streams_a_snapshot_then_transitions(self):
+        token = str(MyTokenObtainPairSerializer.get_token(self.user).access_token)
+        response = await AsyncClient().get(self.url, {'token': token})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        frames = response.streaming_content
+        try:
+            snapshot = (await asyncio.wait_for(anext(frames), 5)).decode()
+            self.assertTrue(snapshot.startswith('event: snapshot\n'))
+            self.assertEqual(
+                json.loads(snapshot.split('data: ', 1)[1])['over_estimate'], {}
+            )
+
+            await sync_to_async(self.overspend)()
+
+            frame = (await asyncio.wait_for(anext(frames), 5)).decode()
+            self.assertTrue(frame.startswith('event: budget_item_exceeded\n'))
+            data = json.loads(frame.split('data: ', 1)[1])
+            self.assertEqual((data['budget_item_id'], data['name']), (self.item.id, 'Venue'))
+        finally:
+            await frames.aclose()
+
+    def test_wsgi_is_not_implemented(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        response = client.get(self.url)
+
+        self.assertEqual(response.status_code, 501)
+
+
+class MissingView(AsyncAPIView):
+    permission_classes = [IsAuthenticated]
+
+    async def get(self, request):
+        raise Http404("Nothing here")
+
+
+class AsyncAPIViewTests(TestCase):
+    def setUp(self):
+        clear_caches()
+        self.manager = User.objects.create_user(
+            email='manager@example.com',
+            name='Manager',
+            organization_name='Acme',
+        )
+        self.member = User.objects.create_user(
+            email='member@example.com',
+            name='Member',
+            organization_name='Acme',
+            role='Team Member'
+        )
+        outsider = User.objects.create_user(
+            email='manager@other.example.com',
+            name='Outsider',
+            organization_name='Other',
+        )
+        self.foreign_event = Event.objects.create(
+            name='Elsewhere',
+            location='Nairobi',
+            event_date='2030-01-01',
+            expected_budget=Decimal('1000'),
+            organization_name='Other',
+            created_by=outsider
+        )
+        self.client = APIClient()
+
+    def test_missing_credentials_are_unauthorized(self):
+        response = self.client.get(reverse('dashboard_stats'))
+
+        self.assertEqual(response.status_code, 401)
+        self.assertIn('WWW-Authenticate', response.headers)
+
+    def test_invalid_token_is_unauthorized(self):
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer not-a-token')
+
+        response = self.client.get(reverse('dashboard_stats'))
+
+        self.assertEqual(response.status_code, 401)
+
+    def test_failed_permission_is_forbidden(self):
+        self.client.force_authenticate(self.member)
+        response = self.client.get(reverse('budget_variance_report'))
+        self.assertEqual(response.status_code, 403)
+
+        self.client.force_authenticate(self.manager)
+        response = self.client.get(reverse('event_summary', args=[self.foreign_event.id]))
+        self.assertEqual(response.status_code, 403)
+
+    def test_http404_becomes_not_found(self):
+        request = APIRequestFactory().get('/missing/')
+        force_authenticate(request, self.manager)
+
+        response = async_to_sync(MissingView.as_view())(request)
+        response.render()
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(json.loads(response.content), {'detail': 'Nothing here'})
+
+
+class BudgetVarianceReportTests(TestCase):
+    def setUp(self):
+        clear_caches()
+        self.manager = User.objects.create_user(
+            email='manager@example.com',
+            name='Manager',
+            organization_name='Acme',
+        )
+        outsider = User.objects.create_user(
+            email='manager@other.example.com',
+            name='Outsider',
+            organization_name='Other',
+        )
+        launch = Event.objects.create(
+            name='Launch',
+            location='Nairobi',
+            event_date='2030-01-15',
+            expected_budget=Decimal('5000'),
+            organization_name='Acme',
+            created_by=self.manager
+        )
+        venue = BudgetItem.objects.create(
+            event=launch, name='Hall', category='Venue', estimated_cost=Decimal('600.10')
+        )
+        BudgetItem.objects.create(
+            event=launch, name='Lunch', category='Catering', estimated_cost=Decimal('200')
+        )
+        # Two expenses on one item: its estimate must still count once
+        Expense.objects.create(event=launch, budget_item=venue, name='Deposit', amount=Decimal('250.05'))
+        Expense.objects.create(event=launch, budget_item=venue, name='Balance', amount=Decimal('100'))
+        # 0.10 + 0.20 is not 0.30 in floating point
+        Expense.objects.create(event=launch, name='Flyers', amount=Decimal('0.10'))
+        Expense.objects.create(event=launch, name='Posters', amount=Decimal('0.20'))
+
+        wrap_up = Event.objects.create(
+            name='Wrap-up',
+            location='Nairobi',
+            event_date='2030-02-10',
+            expected_budget=Decimal('5000'),
+            organization_name='Acme',
+            status='Completed',
+            created_by=self.manager
+        )
+        terrace = BudgetItem.objects.create(
+            event=wrap_up, name='Terrace', category='Venue', estimated_cost=Decimal('300')
+        )
+        Expense.objects.create(event=wrap_up, budget_item=terrace, name='Hire', amount=Decimal('350'))
+
+        elsewhere = Event.objects.create(
+            name='Elsewhere',
+            location='Nairobi',
+            event_date='2030-01-20',
+            expected_budget=Decimal('5000'),
+            organization_name='Other',
+            created_by=outsider
+        )
+        hidden = BudgetItem.objects.create(
+            event=elsewhere, name='Hidden', category='Venue', estimated_cost=Decimal('999')
+        )
+        Expense.objects.create(event=elsewhere, budget_item=hidden, name='Hidden', amount=Decimal('999'))
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.manager)
+        self.url = reverse('budget_variance_report')
+
+    def read_report(self, response):
+        self.assertEqual(response.status_code, 200)
+        return json.loads(b''.join(response.streaming_content))
+
+    def test_rows_sum_estimates_and_spend_per_group(self):
+        report = self.read_report(self.client.get(self.url))
+
+        self.assertEqual(report['rows'], [
+            {'category': 'Catering', 'month': '2030-01', 'status': 'Pending',
+             'estimated': '200.00', 'actual': '0.00', 'variance': '200.00'},
+            {'category': 'Uncategorized', 'month': '2030-01', 'status': 'Pending',
+             'estimated': '0.00', 'actual': '0.30', 'variance': '-0.30'},
+            {'category': 'Venue', 'month': '2030-01', 'status': 'Pending',
+             'estimated': '600.10', 'actual': '350.05', 'variance': '250.05'},
+            {'category': 'Venue', 'month': '2030-02', 'status': 'Completed',
+             'estimated': '300.00', 'actual': '350.00', 'variance': '-50.00'},
+        ])
+        totals = report['totals']
+        self.assertEqual(
+            totals['overall'],
+            {'estimated': '1100.10', 'actual': '700.35', 'variance': '399.75'}
+        )
+        self.assertEqual(
+            totals['by_category']['Venue'],
+            {'estimated': '900.10', 'actual': '700.05', 'variance': '200.05'}
+        )
+        self.assertEqual(list(totals['by_month']), ['2030-01', '2030-02'])
+        self.assertEqual(totals['by_status']['Completed']['variance'], '-50.00')
+
+    def test_only_the_organizations_events_are_reported(self):
+        report = self.read_report(self.client.get(self.url))
+        self.assertNotIn('999.00', {row['estimated'] for row in report['rows']})
+
+        outsider = User.objects.get(email='manager@other.example.com')
+        self.client.force_authenticate(outsider)
+        report = self.read_report(self.client.get(self.url))
+
+        self.assertEqual(
+            [(row['category'], row['estimated'], row['actual']) for row in report['rows']],
+            [('Venue', '999.00', '999.00')]
+        )
+
+    def test_filters(self):
+        report = self.read_report(self.client.get(
+            self.url, {'status': 'Completed', 'date_from': '2030-02-01'}
+        ))
+
+        self.assertEqual(report['filters'], {'status': 'Completed', 'date_from': '2030-02-01'})
+        self.assertEqual([row['month'] for row in report['rows']], ['2030-02'])
+
+    async def test_streams_chunk_by_chunk_under_asgi(self):
+        token = str(MyTokenObtainPairSerializer.get_token(self.manager).access_token)
+        response = await AsyncClient().get(
+            self.url, headers={'Authorization': f'Bearer {token}'}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        # A sync body would be read whole into a list before sending
+        self.assertTrue(response.is_async)
+        body = b''.join([chunk async for chunk in response.streaming_content])
+        self.assertEqual(json.loads(body)['totals']['overall']['actual'], '700.35')
+
+    def test_unknown_status_is_a_bad_request(self):
+        response = self.client.get(self.url, {'status': 'Pending,Someday'})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('status', response.json())
+
+
+class ExportViewTests(TestCase):
+    def setUp(self):
+        clear_caches()
+        self.manager = User.objects.create_user(
+            email='manager@example.com',
+            name='Manager',
+            organization_name='Acme',
+        )
+        outsider = User.objects.create_user(
+            email='manager@other.example.com',
+            name='Outsider',
+            organization_name='Other',
+        )
+        event = Event.objects.create(
+            name='Launch',
+            location='Nairobi',
+            event_date='2030-01-01',
+            expected_budget=Decimal('1000'),
+            organization_name='Acme',
+            created_by=self.manager
+        )
+        venue = BudgetItem.objects.create(
+            event=event, name='Venue', category='venue', estimated_cost=Decimal('600')
+        )
+        Expense.objects.create(
+            event=event, budget_item=venue, name='Hall, deposit',
+            amount=Decimal('250.00'), date='2030-01-02'
+        )
+        Expense.objects.create(
+            event=event, name='Flyers', amount=Decimal('40.00'), date='2029-12-01'
+        )
+        foreign_event = Event.objects.create(
+            name='Elsewhere',
+            location='Nairobi',
+            event_date='2030-01-01',
+            expected_budget=Decimal('1000'),
+            organization_name='Other',
+            created_by=outsider
+        )
+        Expense.objects.create(event=foreign_event, name='Hidden', amount=Decimal('5'))
+        self.client = APIClient()
+        self.client.force_authenticate(self.manager)
+        self.url = reverse('export_expenses')
+
+    def read_csv(self, response):
+        body = b''.join(response.streaming_content)
+        return list(csv.reader(io.StringIO(body.decode('utf-8-sig'))))
+
+    def test_csv_lists_the_organizations_expenses_by_date(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.headers['Content-Disposition'], 'attachment; filename="expenses.csv"'
+        )
+        rows = self.read_csv(response)
+        self.assertEqual(rows[0], [header for header, _ in EXPENSE_COLUMNS])
+        self.assertEqual(
+            [(row[4], row[5], row[9], row[10]) for row in rows[1:]],
+            [('Flyers', '40.00', '', ''), ('Hall, deposit', '250.00', 'Venue', 'venue')]
+        )
+
+    def test_csv_date_range(self):
+        response = self.client.get(self.url, {'date_from': '2030-01-01'})
+
+        self.assertEqual(
+            response.headers['Content-Disposition'],
+            'attachment; filename="expenses-2030-01-01.csv"'
+        )
+        self.assertEqual([row[4] for row in self.read_csv(response)[1:]], ['Hall, deposit'])
+
+    def test_formulas_are_written_as_text(self):
+        Expense.objects.filter(name='Flyers').update(
+            name='=HYPERLINK("http://example.com")', description='@SUM(A1:A9)'
+        )
+
+        rows = self.read_csv(self.client.get(self.url))
+
+        self.assertEqual(
+            (rows[1][4], rows[1][5], rows[1][12]),
+            ('\'=HYPERLINK("http://example.com")', '40.00', "'@SUM(A1:A9)")
+        )
+        self.assertEqual(rows[2][4], 'Hall, deposit')
+
+    def test_cell_keeps_numbers_and_plain_text(self):
+        self.assertEqual(cell(Decimal('-5.00')), Decimal('-5.00'))
+        self.assertEqual(cell('-5'), "'-5")
+        self.assertEqual(cell('+254 700 000000'), "'+254 700 000000")
+        self.assertEqual(cell('Deposit = half'), 'Deposit = half')
+
+    async def test_csv_streams_under_asgi(self):
+        token = str(MyTokenObtainPairSerializer.get_token(self.manager).access_token)
+        response = await AsyncClient().get(
+            self.url, headers={'Authorization': f'Bearer {token}'}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_async)
+        body = b''.join([chunk async for chunk in response.streaming_content])
+        self.assertEqual(body.decode('utf-8-sig').count('\r\n'), 3)
+
+    def test_xlsx_without_openpyxl_is_a_bad_request(self):
+        with mock.patch.dict(sys.modules, {'openpyxl': None}):
+            response = self.client.get(self.url, {'format': 'xlsx'})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('format', response.json())
+
+    def test_unknown_format_is_a_bad_request(self):
+        response = self.client.get(self.url, {'format': 'pdf'})
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_subclass_without_a_queryset_fails_at_definition(self):
+        with self.assertRaises(ImproperlyConfigured):
+            class IncompleteExportView(ExportView):
+                export_name = 'nothing'
+                columns = EXPENSE_COLUMNS
+
+
+class DatabaseSettingsTests(TestCase):
+    def load_settings(self, **env):
+        with mock.patch.dict(os.environ, env):
+            for name in ('DB_CONN_MAX_AGE', 'PLANTRA_ASGI', 'PLANTRA_DB_ENGINE'):
+                if name not in env:
+                    os.environ.pop(name, None)
+            return runpy.run_path(os.path.join(settings.BASE_DIR, 'plantra', 'settings.py'))
+
+    def test_persistent_connections_are_off_under_asgi(self):
+        self.assertEqual(self.load_settings()['DATABASES']['default']['CONN_MAX_AGE'], 600)
+        self.assertEqual(
+            self.load_settings(PLANTRA_ASGI='1')['DATABASES']['default']['CONN_MAX_AGE'], 0
+        )
+
+    @skipUnless(connection.vendor == 'sqlite', "SQLite tuning")
+    def test_sqlite_connections_are_tuned(self):
+        options = self.load_settings()['DATABASES']['default']['OPTIONS']
+
+        # The test database lives in memory, where WAL doesn't apply, so
+        # open a file database with the configured options
+        with tempfile.TemporaryDirectory() as directory:
+            tuned = type(connections['default'])({
+                **connection.settings_dict,
+                'NAME': os.path.join(directory, 'tuned.sqlite3'),
+                'OPTIONS': options,
+            }, alias='tuned')
+            try:
+                with tuned.cursor() as cursor:
+                    pragmas = {}
+                    for pragma in ('journal_mode', 'synchronous', 'busy_timeout'):
+                        cursor.execute(f'PRAGMA {pragma}')
+                        pragmas[pragma] = cursor.fetchone()[0]
+            finally:
+                tuned.close()
+
+        self.assertEqual(pragmas, {
+            'journal_mode': 'wal',
+            'synchronous': 1,  # NORMAL
+            'busy_timeout': options['timeout'] * 1000,
+        })
+        self.assertEqual(options['transaction_mode'], 'IMMEDIATE')
+
+
+class GatherQueriesTests(TransactionTestCase):
+    def setUp(self):
+        # A pool of its own, so the threads connect during the test
+        self.executor = ThreadPoolExecutor(max_workers=2)
+        patcher = mock.patch(
+            'plantra.async_views._query_executor', return_value=self.executor
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.executor.shutdown)
+
+    def gather(self, count):
+        used, closed = [], []
+
+        def count_users():
+            used.append(connections['default'])
+            return User.objects.count()
+
+        # SQLite's close() is a no-op for the in-memory test database, so
+        # record the calls instead of checking the connections
+        wrapper = type(connections['default'])
+        with mock.patch.object(
+            wrapper, 'close', autospec=True, side_effect=closed.append
+        ):
+            results = async_to_sync(gather_queries)(*[count_users] * count)
+
+        self.assertEqual(results, [0] * count)
+        return used, closed
+
+    def test_worker_connections_are_kept_and_reused(self):
+        used, closed = self.gather(4)
+        more, more_closed = self.gather(4)
+
+        self.assertEqual(closed + more_closed, [])
+        connections_used = {id(worker_connection) for worker_connection in used + more}
+        self.assertLessEqual(len(connections_used), 2)
+        self.assertTrue(all(
+            worker_connection is not connection for worker_connection in used + more
+        ))
+
+    def test_worker_connections_close_without_conn_max_age(self):
+        with mock.patch.dict(connection.settings_dict, {'CONN_MAX_AGE': 0}):
+            used, closed = self.gather(2)
+
+        for worker_connection in used:
+            self.assertTrue(any(c is worker_connection for c in closed))
@@ -4,12 +4,26 @@ ListBudgetItemsView,CreateBudgetItemView,UpdateBudgetItemView,
 DeleteBudgetItemView,ListExpensesView,CreateExpenseView,
 UpdateExpenseView,DeleteExpenseView,ListChecklistItemsView,
 CreateChecklistItemView,UpdateChecklistItemView,DeleteChecklistItemView,
-EventSummaryView,BudgetAlertView
+EventSummaryView,BudgetAlertView,ChecklistProgressView,BulkExpenseImportView,
+BulkChecklistView,CloneEventView,SaveEventAsTemplateView,ListEventTemplatesView,
+DeleteEventTemplateView,CreateEventFromTemplateView,BudgetAlertStreamView,
+BudgetVarianceReportView,ExportExpensesView,ExportBudgetItemsView
 )
 
 urlpatterns = [
     path('create/', CreateEventView.as_view(), name='create_event'),
     path('', ListEventsView.as_view(), name='list_events'),
+    path('<int:event_id>/clone/', CloneEventView.as_view(), name='clone_event'),
+
+    # Event templates
+    path('<int:event_id>/save-as-template/', SaveEventAsTemplateView.as_view(), name='save_event_as_template'),
+    path('templates/', ListEventTemplatesView.as_view(), name='list_event_templates'),
+    path('templates/<int:pk>/delete/', DeleteEventTemplateView.as_view(), name='delete_event_template'),
+    path('templates/<int:pk>/create-event/', CreateEventFromTemplateView.as_view(), name='create_event_from_template'),
+    path('reports/budget-variance/', BudgetVarianceReportView.as_view(), name='budget_variance_report'),
+    path('exports/expenses/', ExportExpensesView.as_view(), name='export_expenses'),
+    path('exports/budget-items/', ExportBudgetItemsView.as_view(), name='export_budget_items'),
+    path('checklist-progress/', ChecklistProgressView.as_view(), name='checklist_progress'),
 
      # Budget endpoints
     path('<int:event_id>/budget-items/', ListBudgetItemsView.as_view(), name='list_budget_items'),
@@ -18,14 +32,17 @@ urlpatterns = [
     path('budget-items/<int:pk>/delete/', DeleteBudgetItemView.as_view(), name='delete_budget_item'),
     # Budget Alerts endpoint
     path('<int:event_id>/budget-alerts/', BudgetAlertView.as_view(), name='budget_alerts'),
+    path('<int:event_id>/budget-alerts/stream/', BudgetAlertStreamView.as_view(), name='budget_alert_stream'),
     # Event endpoints
     path('<int:event_id>/expenses/', ListExpensesView.as_view(), name='list_expenses'),
     path('<int:event_id>/expenses/create/', CreateExpenseView.as_view(), name='create_expense'),
+    path('<int:event_id>/expenses/bulk/', BulkExpenseImportView.as_view(), name='bulk_import_expenses'),
     path('expenses/<int:pk>/update/', UpdateExpenseView.as_view(), name='update_expense'),
     path('expenses/<int:pk>/delete/', DeleteExpenseView.as_view(), name='delete_expense'),
     # Checklist Endpoints
     path('<int:event_id>/checklist/', ListChecklistItemsView.as_view(), name='list_checklist'),
     path('<int:event_id>/checklist/create/', CreateChecklistItemView.as_view(), name='create_checklist_item'),
+    path('<int:event_id>/checklist/bulk/', BulkChecklistView.as_view(), name='bulk_checklist'),
     path('checklist/<int:pk>/update/', UpdateChecklistItemView.as_view(), name='update_checklist_item'),
     path('checklist/<int:pk>/delete/', DeleteChecklistItemView.as_view(), name='delete_checklist_item'),
     # Event Summary
@@ -0,0 +1,59 @@
+"""
+Version stamps for conditional GETs.
+
+Each event and each organization has a stamp in the cache that is bumped
+on every write behind their read endpoints (see events.signals). A stamp
+is a nanosecond timestamp, so it doubles as the Last-Modified time. A
+missing stamp - never written or evicted - is started at the current time,
+which only costs clients one full response.
+
+The stamps are kept in the VERSION_CACHE_ALIAS cache, which has to be
+shared by every worker process; see CACHES in settings.
+"""
+import time
+from django.conf import settings
+from django.core.cache import caches
+
+
+def _event_key(event_id):
+    return f'version:event:{event_id}'
+
+
+def _org_key(organization_id):
+    return f'version:org:{organization_id}'
+
+
+def _cache():
+    return caches[settings.VERSION_CACHE_ALIAS]
+
+
+def _get(key):
+    cache = _cache()
+    version = cache.get(key)
+    if version is None:
+        version = time.time_ns()
+        if not cache.add(key, version, None):
+            # Another request started the stamp first
+            version = cache.get(key, version)
+    return version
+
+
+def event_version(event_id):
+    return _get(_event_key(event_id))
+
+
+def organization_version(organization_id):
+    return _get(_org_key(organization_id))
+
+
+def bump_versions(event_ids=(), organization_id=None):
+    now = time.time_ns()
+    stamps = {_event_key(event_id): now for event_id in event_ids if event_id}
+    if organization_id:
+        stamps[_org_key(organization_id)] = now
+    _cache().set_many(stamps, None)
+
+
+def as_timestamp(version):
+    """Seconds since the epoch, for Last-Modified"""
+    return version // 1_000_000_000
@@ -1,14 +1,50 @@
-from django.db.models import Sum, Count, Q
+import asyncio
+import json
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.http import FileResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework import generics, permissions, status
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.exceptions import PermissionDenied, ValidationError
-from .permissions import IsAccountManager
-from .models import Event, BudgetItem, Expense, EventChecklist
+from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
+from accounts.dashboard import invalidate_dashboard
+from accounts.models import User
+from plantra.async_views import AsyncAPIView, gather_queries, is_asgi, streaming_body
+from plantra.conditional import ConditionalGetMixin
+from plantra.fieldsets import SparseFieldsetMixin
+from plantra.pagination import DueDateKeysetPagination
+from .permissions import IsAccountManager, HasEventAccess
+from .access import EventAccessMixin, visible_events, invalidate_org_access
+from .alerts import (
+    build_budget_alerts, budget_item_overruns, alert_state, remember_alert_state, publish_alert_transitions
+)
+from .broker import get_broker, event_alert_topic
+from .versions import (
+    event_version, organization_version, bump_versions, as_timestamp
+)
+from .progress import checklist_progress
+from .reports import budget_variance_rows, VarianceTotals
+from .exports import (
+    EXPENSE_COLUMNS, BUDGET_ITEM_COLUMNS, expense_export_queryset,
+    budget_item_export_queryset, stream_csv, write_xlsx
+)
+from .imports import ExpenseImporter, iter_rows
+from .cloning import clone_event, save_as_template, create_event_from_template
+from .models import (
+    Event, BudgetItem, Expense, EventChecklist, EventTemplate, BudgetExceeded
+)
 from .serializers import (
     EventSerializer, BudgetItemSerializer, 
-    ExpenseSerializer, EventChecklistSerializer
+    ExpenseSerializer, EventChecklistSerializer, ChecklistBulkSerializer,
+    EventListSerializer, BudgetItemListSerializer, ExpenseListSerializer,
+    EventChecklistListSerializer,
+    EventTemplateSerializer, SaveAsTemplateSerializer, EventFromBlueprintSerializer
 )
 
 
@@ -19,6 +55,7 @@ class CreateEventView(generics.CreateAPIView):
     def perform_create(self, serializer):
         serializer.save(
             created_by=self.request.user,
+            organization_id=self.request.user.organization_id,
             organization_name=self.request.user.organization_name
         )
 
@@ -43,90 +80,232 @@ class UpdateEventView(generics.UpdateAPIView):
         raise PermissionDenied("You cannot update this event")
 
 
-class ListEventsView(generics.ListAPIView):
+def roll_at_midnight(version, last_modified):
+    """
+    Fold today's date into a version, for payloads with overdue counts,
+    which change at midnight without any write
+    """
+    midnight = timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+    return (version, midnight.date()), max(last_modified, int(midnight.timestamp()))
+
+
+class EventVersionMixin(ConditionalGetMixin):
+    """Conditional GET keyed on the event in the URL"""
+
+    def get_version(self, request, event_id, **kwargs):
+        version = event_version(event_id)
+        return version, as_timestamp(version)
+
+
+class OrganizationVersionMixin(ConditionalGetMixin):
+    """Conditional GET keyed on the user's organization and role"""
+
+    def get_version(self, request, *args, **kwargs):
+        version = organization_version(request.user.organization_id)
+        return version, as_timestamp(version)
+
+    def get_etag_parts(self, request, *args, **kwargs):
+        return (request.user.id, request.user.role, request.get_full_path())
+
+
+class ListEventsView(OrganizationVersionMixin, SparseFieldsetMixin, generics.ListAPIView):
     serializer_class = EventSerializer
+    compact_serializer_class = EventListSerializer
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        user = self.request.user
+        return visible_events(self.request.user)
 
-        if user.is_account_manager():
-            return Event.objects.filter(
-                organization_name=user.organization_name
+
+class ChecklistProgressView(ListEventsView):
+    """
+    Checklist progress for every event the user can see.
+    Pass ?ids=1,2,3 to limit the response to specific events.
+    """
+
+    def get_version(self, request, *args, **kwargs):
+        return roll_at_midnight(*super().get_version(request, *args, **kwargs))
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.get_queryset()
+
+        ids = request.query_params.get('ids')
+        if ids:
+            try:
+                queryset = queryset.filter(
+                    id__in=[int(pk) for pk in ids.split(',') if pk.strip()]
+                )
+            except ValueError:
+                raise ValidationError({'ids': 'Expected a comma-separated list of event ids'})
+
+        progress = checklist_progress(queryset.values_list('id', flat=True))
+        return Response([
+            {'event_id': event_id, **counts}
+            for event_id, counts in progress.items()
+        ])
+
+
+class CloneEventView(APIView):
+    """
+    Copy an event with all its budget items and checklist items.
+    Checklist due dates shift with the new event_date.
+    """
+    permission_classes = [IsAuthenticated, IsAccountManager]
+
+    def post(self, request, event_id):
+        try:
+            source = Event.objects.get(
+                id=event_id, organization_id=request.user.organization_id
+            )
+        except Event.DoesNotExist:
+            return Response(
+                {"detail": "Event not found"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        serializer = EventFromBlueprintSerializer(
+            data=request.data, context={'request': request}
+        )
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            event = clone_event(source, request.user, **serializer.validated_data)
+        except BudgetExceeded as e:
+            raise ValidationError({
+                'expected_budget': f'Budget items total {e.delta}, '
+                                   f'which exceeds the approved budget ({e.event.expected_budget})'
+            })
+
+        return Response(EventSerializer(event).data, status=status.HTTP_201_CREATED)
+
+
+class SaveEventAsTemplateView(APIView):
+    permission_classes = [IsAuthenticated, IsAccountManager]
+
+    def post(self, request, event_id):
+        try:
+            source = Event.objects.get(
+                id=event_id, organization_id=request.user.organization_id
+            )
+        except Event.DoesNotExist:
+            return Response(
+                {"detail": "Event not found"},
+                status=status.HTTP_404_NOT_FOUND
             )
 
-        if user.is_team_lead():
-            return Event.objects.filter(team_lead=user)
+        serializer = SaveAsTemplateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        template = save_as_template(source, request.user, **serializer.validated_data)
 
-        if user.is_team_member():
-            return Event.objects.filter(
-                checklist_items__assigned_to=user
-            ).distinct()
+        return Response(
+            EventTemplateSerializer(template).data,
+            status=status.HTTP_201_CREATED
+        )
 
-        return Event.objects.none()
+
+class ListEventTemplatesView(generics.ListAPIView):
+    serializer_class = EventTemplateSerializer
+    permission_classes = [IsAuthenticated, IsAccountManager]
+
+    def get_queryset(self):
+        return EventTemplate.objects.filter(
+            organization_id=self.request.user.organization_id
+        )
+
+
+class DeleteEventTemplateView(generics.DestroyAPIView):
+    serializer_class = EventTemplateSerializer
+    permission_classes = [IsAuthenticated, IsAccountManager]
+
+    def get_queryset(self):
+        return EventTemplate.objects.filter(
+            organization_id=self.request.user.organization_id
+        )
+
+
+class CreateEventFromTemplateView(APIView):
+    permission_classes = [IsAuthenticated, IsAccountManager]
+
+    def post(self, request, pk):
+        try:
+            template = EventTemplate.objects.get(
+                pk=pk, organization_id=request.user.organization_id
+            )
+        except EventTemplate.DoesNotExist:
+            return Response(
+                {"detail": "Template not found"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        serializer = EventFromBlueprintSerializer(
+            data=request.data, context={'request': request}
+        )
+        serializer.is_valid(raise_exception=True)
+        if template.expected_budget is None and 'expected_budget' not in serializer.validated_data:
+            raise ValidationError({'expected_budget': 'This template has no budget; provide one'})
+        if 'location' not in serializer.validated_data and not template.location:
+            raise ValidationError({'location': 'This template has no location; provide one'})
+
+        try:
+            event = create_event_from_template(
+                template, request.user, **serializer.validated_data
+            )
+        except BudgetExceeded as e:
+            raise ValidationError({
+                'expected_budget': f'Budget items total {e.delta}, '
+                                   f'which exceeds the approved budget ({e.event.expected_budget})'
+            })
+
+        return Response(EventSerializer(event).data, status=status.HTTP_201_CREATED)
 
 
 class CreateBudgetItemView(generics.CreateAPIView):
     serializer_class = BudgetItemSerializer
-    permission_classes = [permissions.IsAuthenticated]
+    permission_classes = [permissions.IsAuthenticated, HasEventAccess]
 
     def perform_create(self, serializer):
         event_id = self.kwargs['event_id']
-        event = Event.objects.get(id=event_id)
-        
-        # Check if adding this budget item would exceed approved budget
-        estimated_cost = serializer.validated_data.get('estimated_cost', 0)
-        total_allocated = event.total_budget_allocated + estimated_cost
-        
-        if total_allocated > event.expected_budget:
+
+        # The allocation is checked and reserved atomically on save
+        try:
+            serializer.save(event_id=event_id)
+        except Event.DoesNotExist:
+            raise NotFound("Event not found")
+        except BudgetExceeded as e:
             raise ValidationError({
-                'estimated_cost': f'Total budget allocation ({total_allocated}) '
-                                  f'would exceed approved budget ({event.expected_budget})'
+                'estimated_cost': f'Total budget allocation ({e.current + e.delta}) '
+                                  f'would exceed approved budget ({e.event.expected_budget})'
             })
-        
-        serializer.save(event_id=event_id)
 
 
-class ListBudgetItemsView(generics.ListAPIView):
+class ListBudgetItemsView(EventVersionMixin, EventAccessMixin, SparseFieldsetMixin, generics.ListAPIView):
+    queryset = BudgetItem.objects.all()
     serializer_class = BudgetItemSerializer
-    permission_classes = [permissions.IsAuthenticated]
+    compact_serializer_class = BudgetItemListSerializer
+    permission_classes = [permissions.IsAuthenticated, HasEventAccess]
 
-    def get_queryset(self):
-        event_id = self.kwargs['event_id']
-        return BudgetItem.objects.filter(event_id=event_id)
 
 
 class UpdateBudgetItemView(generics.UpdateAPIView):
     queryset = BudgetItem.objects.all()
     serializer_class = BudgetItemSerializer
-    permission_classes = [permissions.IsAuthenticated]
+    permission_classes = [permissions.IsAuthenticated, HasEventAccess]
 
     def perform_update(self, serializer):
-        budget_item = self.get_object()
-        event = budget_item.event
-        
-        # Check if updating this budget item would exceed approved budget
-        new_estimate = serializer.validated_data.get(
-            'estimated_cost', 
-            budget_item.estimated_cost
-        )
-        old_estimate = budget_item.estimated_cost
-        
-        total_allocated = event.total_budget_allocated - old_estimate + new_estimate
-        
-        if total_allocated > event.expected_budget:
+        # The allocation change is checked and reserved atomically on save
+        try:
+            serializer.save()
+        except BudgetExceeded as e:
             raise ValidationError({
-                'estimated_cost': f'Total budget allocation ({total_allocated}) '
-                                  f'would exceed approved budget ({event.expected_budget})'
+                'estimated_cost': f'Total budget allocation ({e.current + e.delta}) '
+                                  f'would exceed approved budget ({e.event.expected_budget})'
             })
-        
-        serializer.save()
 
 
 class DeleteBudgetItemView(generics.DestroyAPIView):
     queryset = BudgetItem.objects.all()
     serializer_class = BudgetItemSerializer
-    permission_classes = [permissions.IsAuthenticated]
+    permission_classes = [permissions.IsAuthenticated, HasEventAccess]
 
     def perform_destroy(self, instance):
         # Check if there are expenses linked to this budget item
@@ -140,147 +319,265 @@ class DeleteBudgetItemView(generics.DestroyAPIView):
 
 class CreateExpenseView(generics.CreateAPIView):
     serializer_class = ExpenseSerializer
-    permission_classes = [permissions.IsAuthenticated]
+    permission_classes = [permissions.IsAuthenticated, HasEventAccess]
 
     def perform_create(self, serializer):
         event_id = self.kwargs['event_id']
-        event = Event.objects.get(id=event_id)
-        
-        # Check budget before creating expense
-        expense_amount = serializer.validated_data.get('amount', 0)
-        new_total = event.total_expenses + expense_amount
-        
-        if new_total > event.expected_budget:
+
+        # The budget is checked and reserved atomically on save
+        try:
+            serializer.save(event_id=event_id)
+        except Event.DoesNotExist:
+            raise NotFound("Event not found")
+        except BudgetExceeded as e:
             raise ValidationError({
                 'amount': f'This expense would exceed the approved budget. '
-                          f'Budget: {event.expected_budget}, '
-                          f'Current expenses: {event.total_expenses}, '
-                          f'Remaining: {event.budget_remaining}'
+                          f'Budget: {e.event.expected_budget}, '
+                          f'Current expenses: {e.current}, '
+                          f'Remaining: {e.event.budget_remaining}'
             })
-        
-        serializer.save(event_id=event_id)
 
 
-class ListExpensesView(generics.ListAPIView):
+class BulkExpenseImportView(APIView):
+    """
+    Import many expenses for an event from a streamed CSV (text/csv, header
+    row of expense field names) or NDJSON (application/x-ndjson) body.
+    Returns a per-row error report; valid rows are saved in chunks.
+    """
+    permission_classes = [IsAuthenticated, HasEventAccess]
+
+    def post(self, request, event_id):
+        try:
+            event = Event.objects.get(id=event_id)
+        except Event.DoesNotExist:
+            return Response(
+                {"detail": "Event not found"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        if request.stream is None:
+            raise ValidationError({'detail': 'Request body is empty'})
+
+        content_type = request.content_type.split(';')[0].strip().lower()
+        report = ExpenseImporter(event).run(iter_rows(request.stream, content_type))
+
+        # bulk_create skips the model signals that drop the dashboard cache
+        # and bump the version stamps
+        invalidate_dashboard(event.organization_id)
+        bump_versions([event.id], event.organization_id)
+        publish_alert_transitions(event.id)
+
+        return Response(
+            report,
+            status=status.HTTP_201_CREATED if report['created'] else status.HTTP_400_BAD_REQUEST
+        )
+
+
+class ListExpensesView(EventVersionMixin, EventAccessMixin, SparseFieldsetMixin, generics.ListAPIView):
+    queryset = Expense.objects.all()
     serializer_class = ExpenseSerializer
-    permission_classes = [permissions.IsAuthenticated]
+    compact_serializer_class = ExpenseListSerializer
+    permission_classes = [permissions.IsAuthenticated, HasEventAccess]
 
-    def get_queryset(self):
-        event_id = self.kwargs['event_id']
-        return Expense.objects.filter(event_id=event_id)
 
 
 class UpdateExpenseView(generics.UpdateAPIView):
     queryset = Expense.objects.all()
     serializer_class = ExpenseSerializer
-    permission_classes = [permissions.IsAuthenticated]
+    permission_classes = [permissions.IsAuthenticated, HasEventAccess]
 
     def perform_update(self, serializer):
-        expense = self.get_object()
-        event = expense.event
-        
-        # Check budget before updating expense
-        new_amount = serializer.validated_data.get('amount', expense.amount)
-        old_amount = expense.amount
-        
-        new_total = event.total_expenses - old_amount + new_amount
-        
-        if new_total > event.expected_budget:
+        # The budget change is checked and reserved atomically on save
+        try:
+            serializer.save()
+        except BudgetExceeded as e:
             raise ValidationError({
                 'amount': f'This expense update would exceed the approved budget. '
-                          f'Budget: {event.expected_budget}, '
-                          f'Current expenses: {event.total_expenses}, '
-                          f'New expense: {new_amount}'
+                          f'Budget: {e.event.expected_budget}, '
+                          f'Current expenses: {e.current}, '
+                          f'New expense: {serializer.validated_data.get("amount")}'
             })
-        
-        serializer.save()
 
 
 class DeleteExpenseView(generics.DestroyAPIView):
     queryset = Expense.objects.all()
     serializer_class = ExpenseSerializer
-    permission_classes = [permissions.IsAuthenticated]
+    permission_classes = [permissions.IsAuthenticated, HasEventAccess]
 
 
 class CreateChecklistItemView(generics.CreateAPIView):
     serializer_class = EventChecklistSerializer
-    permission_classes = [permissions.IsAuthenticated]
+    permission_classes = [permissions.IsAuthenticated, HasEventAccess]
 
     def perform_create(self, serializer):
         event_id = self.kwargs['event_id']
         serializer.save(event_id=event_id)
 
 
-class ListChecklistItemsView(generics.ListAPIView):
+class BulkChecklistView(APIView):
+    """
+    Create, partially update and delete many checklist items of one event
+    in a single transaction. Access is checked once for the event.
+    """
+    permission_classes = [IsAuthenticated, HasEventAccess]
+    update_fields = ('status', 'assigned_to', 'due_date')
+
+    def post(self, request, event_id):
+        try:
+            event = Event.objects.get(id=event_id)
+        except Event.DoesNotExist:
+            return Response(
+                {"detail": "Event not found"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        serializer = ChecklistBulkSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        creates = serializer.validated_data.get('create', [])
+        updates = serializer.validated_data.get('update', [])
+        deletes = serializer.validated_data.get('delete', [])
+
+        with transaction.atomic():
+            assignees = self.resolve_assignees(event, creates + updates)
+
+            created = EventChecklist.objects.bulk_create([
+                EventChecklist(
+                    event=event,
+                    **{**row, 'assigned_to': assignees.get(row.get('assigned_to'))}
+                )
+                for row in creates
+            ])
+
+            updated = self.apply_updates(event, updates, assignees)
+
+            deleted = self.apply_deletes(event, deletes)
+
+            # Bulk creates and updates skip model signals, so drop the
+            # dashboard and the cached access sets (assignees may have
+            # changed) once the batch commits
+            def invalidate():
+                invalidate_dashboard(event.organization_id)
+                invalidate_org_access(event.organization_id)
+                bump_versions([event.id], event.organization_id)
+
+            transaction.on_commit(invalidate)
+
+        return Response({
+            'created': EventChecklistSerializer(created, many=True).data,
+            'updated': updated,
+            'deleted': deleted,
+        }, status=status.HTTP_200_OK)
+
+    def resolve_assignees(self, event, rows):
+        ids = {row['assigned_to'] for row in rows if row.get('assigned_to')}
+        users = User.objects.filter(
+            organization_id=event.organization_id, id__in=ids
+        ).in_bulk()
+        missing = ids - set(users)
+        if missing:
+            raise ValidationError({
+                'assigned_to': f'Unknown users for this organization: {sorted(missing)}'
+            })
+        return users
+
+    def apply_updates(self, event, updates, assignees):
+        if not updates:
+            return 0
+
+        items = EventChecklist.objects.filter(
+            event=event, id__in=[row['id'] for row in updates]
+        ).in_bulk()
+        missing = {row['id'] for row in updates} - set(items)
+        if missing:
+            raise ValidationError({
+                'update': f'Checklist items not found on this event: {sorted(missing)}'
+            })
+
+        changed_fields = set()
+        for row in updates:
+            item = items[row['id']]
+            for field in self.update_fields:
+                if field not in row:
+                    continue
+                value = row[field]
+                if field == 'assigned_to':
+                    value = assignees.get(value)
+                setattr(item, field, value)
+                changed_fields.add(field)
+
+        if changed_fields:
+            EventChecklist.objects.bulk_update(
+                list(items.values()), sorted(changed_fields), batch_size=500
+            )
+        return len(items)
+
+    def apply_deletes(self, event, deletes):
+        if not deletes:
+            return 0
+
+        to_delete = EventChecklist.objects.filter(event=event, id__in=deletes)
+        missing = set(deletes) - set(to_delete.values_list('id', flat=True))
+        if missing:
+            raise ValidationError({
+                'delete': f'Checklist items not found on this event: {sorted(missing)}'
+            })
+
+        # The prefetch hands each row its event, so the per-row delete
+        # signals don't look it up again
+        deleted, _ = to_delete.prefetch_related('event').delete()
+        return deleted
+
+
+class ListChecklistItemsView(EventVersionMixin, EventAccessMixin, SparseFieldsetMixin, generics.ListAPIView):
+    queryset = EventChecklist.objects.all()
     serializer_class = EventChecklistSerializer
-    permission_classes = [permissions.IsAuthenticated]
+    compact_serializer_class = EventChecklistListSerializer
+    permission_classes = [permissions.IsAuthenticated, HasEventAccess]
+    pagination_class = DueDateKeysetPagination
 
-    def get_queryset(self):
-        event_id = self.kwargs['event_id']
-        return EventChecklist.objects.filter(event_id=event_id)
 
 
 class UpdateChecklistItemView(generics.UpdateAPIView):
     queryset = EventChecklist.objects.all()
     serializer_class = EventChecklistSerializer
-    permission_classes = [permissions.IsAuthenticated]
+    permission_classes = [permissions.IsAuthenticated, HasEventAccess]
 
 
 class DeleteChecklistItemView(generics.DestroyAPIView):
     queryset = EventChecklist.objects.all()
     serializer_class = EventChecklistSerializer
-    permission_classes = [permissions.IsAuthenticated]
+    permission_classes = [permissions.IsAuthenticated, HasEventAccess]
 
 
-class EventSummaryView(APIView):
+class EventSummaryView(EventVersionMixin, AsyncAPIView):
     """
     Comprehensive event financial and progress summary
     """
-    permission_classes = [IsAuthenticated]
-
-    def get(self, request, event_id):
-        user = request.user
+    permission_classes = [IsAuthenticated, HasEventAccess]
+
+    def get_version(self, request, event_id, **kwargs):
+        return roll_at_midnight(*super().get_version(request, event_id, **kwargs))
+
+    async def get(self, request, event_id):
+        # The four queries are independent, so they run concurrently
+        event, budget_by_category, recent_expenses, progress = await gather_queries(
+            lambda: Event.objects.filter(id=event_id).first(),
+            # Budget breakdown by category
+            lambda: list(BudgetItem.objects.filter(event_id=event_id).by_category()),
+            # Recent expenses
+            lambda: list(Expense.objects.filter(event_id=event_id).order_by(
+                '-date'
+            )[:5].values('name', 'amount', 'date', 'budget_item__name')),
+            # Checklist progress
+            lambda: checklist_progress([event_id]),
+        )
 
-        try:
-            event = Event.objects.get(id=event_id)
-        except Event.DoesNotExist:
+        if event is None:
             return Response(
                 {"detail": "Event not found"}, 
                 status=status.HTTP_404_NOT_FOUND
             )
-
-        # Permission check
-        if not (
-            user.is_account_manager() and event.organization_name == user.organization_name
-            or user.is_team_lead() and event.team_lead == user
-            or user.is_team_member() and EventChecklist.objects.filter(
-                event=event, assigned_to=user
-            ).exists()
-        ):
-            raise PermissionDenied("You do not have access to this event")
-
-        # Budget breakdown by category
-        budget_by_category = BudgetItem.objects.filter(event=event).values(
-            'category'
-        ).annotate(
-            estimated=Sum('estimated_cost'),
-            actual=Sum('expenses__amount')
-        ).order_by('-estimated')
-
-        # Recent expenses
-        recent_expenses = Expense.objects.filter(event=event).order_by(
-            '-date'
-        )[:5].values('name', 'amount', 'date', 'budget_item__name')
-
-        # Checklist progress
-        checklist_total = EventChecklist.objects.filter(event=event).count()
-        checklist_completed = EventChecklist.objects.filter(
-            event=event, status='completed'
-        ).count()
-        checklist_progress = (
-            (checklist_completed / checklist_total) * 100
-            if checklist_total > 0 else 0
-        )
+        checklist = progress[event.id]
 
         return Response({
             "event": {
@@ -300,12 +597,15 @@ class EventSummaryView(APIView):
                 "is_over_budget": event.is_over_budget,
                 "is_near_limit": event.is_near_budget_limit,
             },
-            "budget_by_category": list(budget_by_category),
-            "recent_expenses": list(recent_expenses),
+            "budget_by_category": budget_by_category,
+            "recent_expenses": recent_expenses,
             "checklist": {
-                "total_items": checklist_total,
-                "completed_items": checklist_completed,
-                "progress_percent": round(checklist_progress, 2)
+                "total_items": checklist['total'],
+                "completed_items": checklist['completed'],
+                "pending_items": checklist['pending'],
+                "in_progress_items": checklist['in_progress'],
+                "overdue_items": checklist['overdue'],
+                "progress_percent": checklist['progress_percent']
             },
             "attendance": {
                 "expected_attendance": event.expected_attendance,
@@ -314,46 +614,24 @@ class EventSummaryView(APIView):
         })
 
 
-class BudgetAlertView(APIView):
+class BudgetAlertView(EventVersionMixin, AsyncAPIView):
     """
     Check budget status and provide alerts
     """
-    permission_classes = [IsAuthenticated]
+    permission_classes = [IsAuthenticated, HasEventAccess]
 
-    def get(self, request, event_id):
-        try:
-            event = Event.objects.get(id=event_id)
-        except Event.DoesNotExist:
+    async def get(self, request, event_id):
+        event, overruns = await gather_queries(
+            lambda: Event.objects.filter(id=event_id).first(),
+            lambda: budget_item_overruns(event_id),
+        )
+        if event is None:
             return Response(
                 {"detail": "Event not found"}, 
                 status=status.HTTP_404_NOT_FOUND
             )
 
-        alerts = []
-        
-        # Overall budget alerts
-        if event.is_over_budget:
-            alerts.append({
-                "level": "critical",
-                "type": "over_budget",
-                "message": f"Event is over budget by {abs(event.budget_remaining)}"
-            })
-        elif event.check_budget_threshold(90):
-            alerts.append({
-                "level": "warning",
-                "type": "near_budget_limit",
-                "message": f"Event has used {event.budget_utilization_percent:.1f}% of budget"
-            })
-
-        # Budget item alerts
-        for item in event.budget_items.all():
-            if item.is_over_estimate:
-                alerts.append({
-                    "level": "warning",
-                    "type": "budget_item_exceeded",
-                    "message": f"'{item.name}' has exceeded estimate by {abs(item.variance)}",
-                    "budget_item": item.name
-                })
+        alerts = build_budget_alerts(event, overruns)
 
         return Response({
             "event_id": event_id,
@@ -365,4 +643,213 @@ class BudgetAlertView(APIView):
                 "remaining": float(event.budget_remaining),
                 "utilization_percent": round(event.budget_utilization_percent, 2)
             }
-        })
\ No newline at end of file
+        })
+
+
+class BudgetAlertStreamView(AsyncAPIView):
+    """
+    Server-sent events stream of an event's budget alert transitions.
+
+    Sends a `snapshot` of the current alert state, then `budget_status`,
+    `budget_item_exceeded` and `budget_item_recovered` events as expense
+    and budget item writes move it. Subscribers share one broker topic per
+    event, so open streams run no queries between writes. EventSource
+    can't send headers, so the JWT access token may be passed as ?token=
+    instead of an Authorization header.
+
+    Needs the ASGI application (plantra.asgi). Under WSGI the stream would
+    be read to its end before anything is sent, which never happens, so
+    it answers 501 instead.
+    """
+    permission_classes = [IsAuthenticated, HasEventAccess]
+    token_query_param = 'token'
+
+    async def get(self, request, event_id):
+        if not is_asgi(request):
+            return Response(
+                {'detail': "Alert streams need the ASGI server"},
+                status=status.HTTP_501_NOT_IMPLEMENTED
+            )
+
+        response = StreamingHttpResponse(
+            self.stream(event_id), content_type='text/event-stream'
+        )
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+    async def stream(self, event_id):
+        heartbeat = settings.EVENT_ALERT_STREAM_HEARTBEAT
+
+        async with get_broker().subscribe(event_alert_topic(event_id)) as subscription:
+            # Subscribed first so no transition falls between the snapshot
+            # and the first message
+            state = await sync_to_async(alert_state)(event_id)
+            await sync_to_async(remember_alert_state)(event_id, state)
+            yield self.format('snapshot', {'event_id': event_id, **state})
+
+            while True:
+                try:
+                    message = await asyncio.wait_for(subscription.get(), heartbeat)
+                except asyncio.TimeoutError:
+                    yield ': keep-alive\n\n'
+                    continue
+                yield self.format(message['type'], message)
+
+    @staticmethod
+    def format(event, data):
+        return f"event: {event}\ndata: {json.dumps(data, cls=DjangoJSONEncoder)}\n\n"
+
+
+def parse_date_range(params, errors):
+    """Read ?date_from= and ?date_to= (YYYY-MM-DD), noting bad values in `errors`"""
+    dates = []
+    for param in ('date_from', 'date_to'):
+        value = None
+        if params.get(param):
+            try:
+                value = parse_date(params[param])
+            except ValueError:
+                pass
+            if value is None:
+                errors[param] = "Use YYYY-MM-DD"
+        dates.append(value)
+    return dates
+
+
+class BudgetVarianceReportView(OrganizationVersionMixin, AsyncAPIView):
+    """
+    Budget vs actual across the organization's events, grouped by budget
+    category, event month and event status, with per-category, per-month,
+    per-status and overall totals.
+
+    Filters: ?status=Pending,Completed, ?team_lead=<user id>, and
+    ?date_from= / ?date_to= (YYYY-MM-DD, on the event date). Amounts are
+    decimal strings. The JSON body is streamed as the grouped rows come
+    off the cursor.
+    """
+    permission_classes = [IsAuthenticated, IsAccountManager]
+    filter_params = ('status', 'team_lead', 'date_from', 'date_to')
+
+    async def get(self, request):
+        filters = self.get_event_filters(request)
+        applied = {
+            param: request.GET[param] for param in self.filter_params
+            if request.GET.get(param)
+        }
+        return StreamingHttpResponse(
+            streaming_body(request, self.stream(filters, applied)),
+            content_type='application/json'
+        )
+
+    def get_event_filters(self, request):
+        params = request.GET
+        filters = {'organization_id': request.user.organization_id}
+        errors = {}
+
+        if params.get('status'):
+            statuses = [value.strip() for value in params['status'].split(',') if value.strip()]
+            valid = {choice for choice, _ in Event.STATUS_CHOICES}
+            unknown = [value for value in statuses if value not in valid]
+            if unknown:
+                errors['status'] = f"Unknown status: {', '.join(unknown)}"
+            filters['status__in'] = statuses
+
+        if params.get('team_lead'):
+            try:
+                filters['team_lead_id'] = int(params['team_lead'])
+            except ValueError:
+                errors['team_lead'] = "Must be a user id"
+
+        date_from, date_to = parse_date_range(params, errors)
+        if date_from:
+            filters['event_date__gte'] = date_from
+        if date_to:
+            filters['event_date__lte'] = date_to
+
+        if errors:
+            raise ValidationError(errors)
+        return filters
+
+    def stream(self, filters, applied):
+        yield f'{{"filters": {json.dumps(applied)}, "rows": ['
+
+        totals = VarianceTotals()
+        separator = ''
+        for row in budget_variance_rows(filters):
+            totals.add(row)
+            yield separator + json.dumps(row, cls=DjangoJSONEncoder)
+            separator = ', '
+
+        yield f'], "totals": {json.dumps(totals.as_dict(), cls=DjangoJSONEncoder)}}}'
+
+
+class ExportView(AsyncAPIView):
+    """
+    Download an organization-wide export as CSV (the default) or XLSX,
+    with ?format=csv|xlsx and an optional ?date_from= / ?date_to= range.
+
+    CSV is streamed straight from the database cursor. XLSX needs openpyxl
+    and is sent once the workbook is written.
+
+    Subclasses set export_name, columns and export_queryset, a function
+    taking (organization_id, date_from, date_to); a subclass missing one
+    fails when it is defined.
+    """
+    permission_classes = [IsAuthenticated, IsAccountManager]
+    export_formats = {
+        'csv': 'text/csv; charset=utf-8',
+        'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    }
+    export_name = None
+    columns = None
+    export_queryset = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        missing = [
+            name for name in ('export_name', 'columns', 'export_queryset')
+            if getattr(cls, name) is None
+        ]
+        if missing:
+            raise ImproperlyConfigured(f"{cls.__name__} must set {', '.join(missing)}")
+
+    async def get(self, request):
+        errors = {}
+        date_from, date_to = parse_date_range(request.GET, errors)
+        export_format = request.GET.get('format', 'csv').lower()
+        if export_format not in self.export_formats:
+            errors['format'] = f"Choose one of: {', '.join(self.export_formats)}"
+        if errors:
+            raise ValidationError(errors)
+
+        queryset = self.export_queryset(request.user.organization_id, date_from, date_to)
+        filename = '-'.join(
+            [self.export_name] + [str(value) for value in (date_from, date_to) if value]
+        ) + f'.{export_format}'
+        content_type = self.export_formats[export_format]
+
+        if export_format == 'xlsx':
+            output = await sync_to_async(write_xlsx)(queryset, self.columns, self.export_name)
+            return FileResponse(
+                output, as_attachment=True, filename=filename, content_type=content_type
+            )
+
+        response = StreamingHttpResponse(
+            streaming_body(request, stream_csv(queryset, self.columns)),
+            content_type=content_type
+        )
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+
+class ExportExpensesView(ExportView):
+    export_name = 'expenses'
+    columns = EXPENSE_COLUMNS
+    export_queryset = staticmethod(expense_export_queryset)
+
+
+class ExportBudgetItemsView(ExportView):
+    export_name = 'budget-items'
+    columns = BUDGET_ITEM_COLUMNS
+    export_queryset = staticmethod(budget_item_export_queryset)
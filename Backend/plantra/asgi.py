@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'plantra.settings')
+# Read by the settings: persistent database connections are off under ASGI
+os.environ.setdefault('PLANTRA_ASGI', '1')
 
 application = get_asgi_application()
@@ -0,0 +1,189 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.exceptions import PermissionDenied as DjangoPermissionDenied
+from django.core.handlers.asgi import ASGIRequest
+from django.db import close_old_connections, connection
+from django.http import Http404
+from django.views import View
+from rest_framework import exceptions
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from accounts.authentication import ClaimsJWTAuthentication
+
+
+class AsyncAPIView(View):
+    """
+    A read-only async counterpart of DRF's APIView.
+
+    DRF views are synchronous, so this keeps the parts of APIView our
+    read endpoints rely on - JWT authentication, permission_classes,
+    APIException handling and DRF Responses - and lets `get` be a
+    coroutine. It calls the same initial / handle_exception /
+    finalize_response hooks, so mixins such as ConditionalGetMixin work on
+    it unchanged.
+    """
+    http_method_names = ['get', 'head']
+    permission_classes = ()
+    authentication = ClaimsJWTAuthentication()
+    renderer = JSONRenderer()
+    # EventSource and similar clients can't send an Authorization header
+    token_query_param = None
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.headers = {}
+        method = request.method.lower()
+        handler = getattr(self, method, None) if method in self.http_method_names else None
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            if handler is None:
+                raise exceptions.MethodNotAllowed(request.method)
+            response = await handler(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        return self.finalize_response(request, response, *args, **kwargs)
+
+    def initial(self, request, *args, **kwargs):
+        request.user = self.authenticate(request) or AnonymousUser()
+        self.check_permissions(request)
+
+    def authenticate(self, request):
+        # Honour APIClient.force_authenticate the way DRF's Request does
+        forced = getattr(request, '_force_auth_user', None)
+        if forced is not None:
+            return forced
+
+        try:
+            raw_token = self.token_query_param and request.GET.get(self.token_query_param)
+            if raw_token:
+                token = self.authentication.get_validated_token(raw_token)
+                return self.authentication.get_user(token)
+            result = self.authentication.authenticate(request)
+        except (InvalidToken, TokenError):
+            raise exceptions.AuthenticationFailed("Given token not valid for any token type")
+        return result[0] if result else None
+
+    def check_permissions(self, request):
+        for permission in (permission() for permission in self.permission_classes):
+            if not permission.has_permission(request, self):
+                if not request.user.is_authenticated:
+                    raise exceptions.NotAuthenticated()
+                raise exceptions.PermissionDenied(getattr(permission, 'message', None))
+
+    def handle_exception(self, exc):
+        if isinstance(exc, Http404):
+            exc = exceptions.NotFound(*exc.args)
+        elif isinstance(exc, DjangoPermissionDenied):
+            exc = exceptions.PermissionDenied(*exc.args)
+
+        if not isinstance(exc, exceptions.APIException):
+            raise exc
+
+        if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+            self.headers['WWW-Authenticate'] = self.authentication.authenticate_header(None)
+
+        detail = exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}
+        return Response(detail, status=exc.status_code)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if isinstance(response, Response):
+            response.accepted_renderer = self.renderer
+            response.accepted_media_type = self.renderer.media_type
+            response.renderer_context = {'request': request, 'response': response, 'view': self}
+        for name, value in self.headers.items():
+            response[name] = value
+        return response
+
+
+def is_asgi(request):
+    """Whether the request is served by the ASGI application"""
+    return isinstance(request, ASGIRequest)
+
+
+_EXHAUSTED = object()
+
+
+def streaming_body(request, iterator):
+    """
+    Adapt a blocking iterator for a StreamingHttpResponse body.
+
+    Django reads an async body to its end before sending anything under
+    WSGI, and a sync one in a single thread-pool call under ASGI, so
+    neither streams on the other server. Under ASGI each chunk is pulled
+    on the request's sync thread, the one holding its database
+    connection and any open cursor; under WSGI the iterator is returned
+    as it is.
+    """
+    if not is_asgi(request):
+        return iterator
+
+    async def chunks():
+        pull = sync_to_async(next, thread_sensitive=True)
+        try:
+            while True:
+                chunk = await pull(iterator, _EXHAUSTED)
+                if chunk is _EXHAUSTED:
+                    return
+                yield chunk
+        finally:
+            close = getattr(iterator, 'close', None)
+            if close is not None:
+                await sync_to_async(close, thread_sensitive=True)()
+
+    return chunks()
+
+
+
+def _in_transaction():
+    return connection.in_atomic_block
+
+
+@lru_cache(maxsize=None)
+def _query_executor():
+    """
+    The threads gathered queries run on. A fixed pool, so each thread
+    keeps its connection from one request to the next and a process never
+    holds more than ASYNC_QUERY_WORKERS of them.
+    """
+    return ThreadPoolExecutor(
+        max_workers=settings.ASYNC_QUERY_WORKERS, thread_name_prefix='gather-queries'
+    )
+
+
+def _run_on_worker_connection(func):
+    # The checks Django makes around a request: a connection that is
+    # broken or past CONN_MAX_AGE is closed, any other is kept for the
+    # next query this thread runs
+    close_old_connections()
+    try:
+        return func()
+    finally:
+        close_old_connections()
+
+
+async def gather_queries(*funcs):
+    """
+    Run independent, blocking ORM callables concurrently and return their
+    results in order.
+
+    Each callable runs on one of the ASYNC_QUERY_WORKERS threads, which
+    have their own database connections, so the queries really overlap
+    instead of queueing on the request's connection. Inside a transaction
+    (ATOMIC_REQUESTS, a TestCase) they must see its uncommitted writes, so
+    they run one after another on the request's connection instead.
+    """
+    if await sync_to_async(_in_transaction)():
+        return [await sync_to_async(func)() for func in funcs]
+    executor = _query_executor()
+    return await asyncio.gather(*(
+        sync_to_async(
+            _run_on_worker_connection, thread_sensitive=False, executor=executor
+        )(func)
+        for func in funcs
+    ))
@@ -0,0 +1,70 @@
+import hashlib
+from django.conf import settings
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+
+class NotModified(Exception):
+    def __init__(self, response):
+        self.response = response
+
+
+class ConditionalGetMixin:
+    """
+    ETag / Last-Modified support for read-only API views.
+
+    Subclasses implement `get_version(request, *args, **kwargs)` returning a
+    (version, last_modified) pair: any hashable version that changes on
+    every write behind the response, and a Unix timestamp. It runs after
+    authentication and permission checks but before the handler, so an
+    unchanged poll is answered with 304 without building the payload.
+    `get_etag_parts` can add anything else the payload depends on.
+    Nothing is done when CONDITIONAL_GET_ENABLED is off.
+    """
+
+    def get_version(self, request, *args, **kwargs):
+        raise NotImplementedError
+
+    def get_etag_parts(self, request, *args, **kwargs):
+        return (request.get_full_path(),)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.conditional = None
+        if request.method not in ('GET', 'HEAD') or not settings.CONDITIONAL_GET_ENABLED:
+            return
+
+        version, last_modified = self.get_version(request, *args, **kwargs)
+        if version is None:
+            return
+        parts = (version, *self.get_etag_parts(request, *args, **kwargs))
+        digest = hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()
+        self.conditional = (quote_etag(digest), int(last_modified))
+
+        response = get_conditional_response(
+            request, etag=self.conditional[0], last_modified=self.conditional[1]
+        )
+        if response is not None:
+            raise NotModified(response)
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            response = exc.response
+            self.add_conditional_headers(response)
+            return response
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if response.status_code == 200:
+            self.add_conditional_headers(response)
+        return response
+
+    def add_conditional_headers(self, response):
+        if not getattr(self, 'conditional', None):
+            return
+        etag, last_modified = self.conditional
+        response.headers['ETag'] = etag
+        response.headers['Last-Modified'] = http_date(last_modified)
+        # Let browsers keep the response but revalidate it on every poll
+        patch_cache_control(response, private=True, no_cache=True)
@@ -0,0 +1,91 @@
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework.exceptions import ValidationError
+
+
+class SparseFieldsSerializerMixin:
+    """
+    Accept a `fields` keyword argument listing the fields to keep;
+    every other field is dropped before serialization.
+    """
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+class SparseFieldsetMixin:
+    """
+    List view support for `?fields=id,name,...` and `?compact=true`.
+
+    `?fields=` limits the response to the named serializer fields and
+    `?compact=true` switches to `compact_serializer_class`, which leaves out
+    long text columns. Either way the queryset is narrowed with `.only()`
+    to the columns the serializer reads (plus the pagination keys), so
+    unused columns are neither fetched nor serialized.
+    """
+    compact_serializer_class = None
+    fields_query_param = 'fields'
+    compact_query_param = 'compact'
+
+    def is_compact(self):
+        value = self.request.query_params.get(self.compact_query_param, '')
+        return value.lower() in ('1', 'true', 'yes')
+
+    def get_serializer_class(self):
+        if self.compact_serializer_class is not None and self.is_compact():
+            return self.compact_serializer_class
+        return super().get_serializer_class()
+
+    def get_requested_fields(self):
+        if hasattr(self, '_requested_fields'):
+            return self._requested_fields
+
+        raw = self.request.query_params.get(self.fields_query_param)
+        requested = None
+        if raw:
+            requested = list(dict.fromkeys(
+                name.strip() for name in raw.split(',') if name.strip()
+            ))
+            available = self.get_serializer_class()().fields
+            unknown = [name for name in requested if name not in available]
+            if unknown:
+                raise ValidationError({
+                    self.fields_query_param: f"Unknown fields: {', '.join(unknown)}"
+                })
+
+        self._requested_fields = requested
+        return requested
+
+    def get_serializer(self, *args, **kwargs):
+        fields = self.get_requested_fields()
+        if fields is not None:
+            kwargs.setdefault('fields', fields)
+        return super().get_serializer(*args, **kwargs)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.get_requested_fields() is None and not self.is_compact():
+            return queryset
+        return queryset.only(*self.get_selected_columns(queryset.model))
+
+    def get_selected_columns(self, model):
+        serializer = self.get_serializer()
+        sources = [
+            field.source for field in serializer.fields.values()
+            if field.source != '*'
+        ]
+        # Keyset pagination reads its ordering values off each row
+        ordering = getattr(self.paginator, 'ordering', ())
+        sources += [name.lstrip('-') for name in ordering]
+
+        columns = []
+        for source in sources:
+            try:
+                field = model._meta.get_field(source.split('.')[0])
+            except FieldDoesNotExist:
+                continue
+            if field.concrete and field.name not in columns:
+                columns.append(field.name)
+        return columns
@@ -0,0 +1,169 @@
+import base64
+import json
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (cursor) pagination over a fixed ordering.
+
+    The cursor encodes the ordering values of the last row on the page, and
+    the next page is fetched with a WHERE clause on those values instead of
+    an OFFSET, so every page costs the same as the first one. The ordering
+    must end in a unique column (`id`) to keep it stable. NULLs always sort
+    last, in either direction.
+    """
+    ordering = ('-created_at', '-id')
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.fields = {
+            field: self._get_field(queryset.model, field)
+            for field in self._field_names()
+        }
+        self.nullable = {
+            name: field is not None and field.null
+            for name, field in self.fields.items()
+        }
+
+        queryset = queryset.order_by(*self._order_by())
+
+        cursor = self.decode_cursor(request)
+        if cursor is not None:
+            queryset = queryset.filter(self._after(cursor))
+
+        rows = list(queryset[:self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        self.page = rows[:self.page_size]
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        last = self.page[-1]
+        values = [self._value(last, field) for field in self._field_names()]
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(values))
+
+    def encode_cursor(self, values):
+        payload = json.dumps(values, default=str, separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            values = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+            if not isinstance(values, list) or len(values) != len(self.ordering):
+                raise ValueError
+            return [
+                self._to_python(name, value)
+                for name, value in zip(self._field_names(), values)
+            ]
+        except (TypeError, ValueError, UnicodeError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def _to_python(self, name, value):
+        """A cursor value as its ordering field's type; ValueError if it isn't one"""
+        if value is None:
+            if not self.nullable[name]:
+                raise ValueError
+            return None
+        # Cursors only ever hold scalars; to_python would stringify the rest
+        if isinstance(value, (list, dict)):
+            raise ValueError
+        field = self.fields[name]
+        return field.to_python(value) if field is not None else value
+
+    def _field_names(self):
+        return [field.lstrip('-') for field in self.ordering]
+
+    def _order_by(self):
+        order_by = []
+        for field in self.ordering:
+            name = field.lstrip('-')
+            nulls_last = True if self.nullable[name] else None
+            if field.startswith('-'):
+                order_by.append(F(name).desc(nulls_last=nulls_last))
+            else:
+                order_by.append(F(name).asc(nulls_last=nulls_last))
+        return order_by
+
+    def _after(self, values):
+        """Rows that sort strictly after the row the cursor points at"""
+        condition = Q(pk__in=[])
+        equal_so_far = Q()
+        for field, value in zip(self.ordering, values):
+            name = field.lstrip('-')
+            if value is None:
+                # Only NULLs follow a NULL; they are matched by the next key
+                equal_so_far &= Q(**{f'{name}__isnull': True})
+                continue
+
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            later = Q(**{f'{name}__{lookup}': value})
+            if self.nullable[name]:
+                later |= Q(**{f'{name}__isnull': True})
+
+            condition |= equal_so_far & later
+            equal_so_far &= Q(**{name: value})
+        return condition
+
+    @staticmethod
+    def _value(row, field):
+        if isinstance(row, dict):
+            return row[field]
+        return getattr(row, field)
+
+    @staticmethod
+    def _get_field(model, field):
+        try:
+            return model._meta.get_field(field)
+        except FieldDoesNotExist:
+            return None
+
+
+class DueDateKeysetPagination(KeysetPagination):
+    ordering = ('due_date', '-created_at', '-id')
+
+
+class TeamKeysetPagination(KeysetPagination):
+    ordering = ('role', 'name', 'id')
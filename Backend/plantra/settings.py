@@ -10,8 +10,11 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/6.0/ref/settings/
 """
 
+import os
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -61,8 +64,12 @@ CORS_ALLOW_ALL_ORIGINS = True
 # JWT Authentication
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        # request.user is built from the token claims; see accounts.authentication
+        'accounts.authentication.ClaimsJWTAuthentication',
     ),
+    # Keyset pagination; clients can override the size with ?page_size=
+    'DEFAULT_PAGINATION_CLASS': 'plantra.pagination.KeysetPagination',
+    'PAGE_SIZE': 50,
 }
 
 # Custom User model
@@ -87,17 +94,155 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'plantra.wsgi.application'
 
+# The budget alert stream (server-sent events) only works under the ASGI
+# application, e.g. `uvicorn plantra.asgi:application`; under WSGI it
+# answers 501.
+
 
 # Database
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
 
-DATABASES = {
+# PLANTRA_DB_ENGINE selects the backend:
+#   sqlite   (default) - a local file, tuned for concurrent writers
+#   postgres - PostgreSQL through psycopg's connection pool, configured
+#              with the POSTGRES_* variables below
+PLANTRA_DB_ENGINE = os.environ.get('PLANTRA_DB_ENGINE', 'sqlite')
+
+# Set by plantra.asgi. Under ASGI each request runs its sync code on a
+# thread of its own, so a connection kept open past the request would be
+# left behind with its thread; persistent connections default to off there.
+RUNNING_ASGI = os.environ.get('PLANTRA_ASGI') == '1'
+
+if PLANTRA_DB_ENGINE == 'postgres':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('POSTGRES_DB', 'plantra'),
+            'USER': os.environ.get('POSTGRES_USER', 'plantra'),
+            'PASSWORD': os.environ.get('POSTGRES_PASSWORD', ''),
+            'HOST': os.environ.get('POSTGRES_HOST', 'localhost'),
+            'PORT': os.environ.get('POSTGRES_PORT', '5432'),
+            # Connections are reused through the pool, so CONN_MAX_AGE
+            # must stay 0
+            'CONN_MAX_AGE': 0,
+            'OPTIONS': {
+                'pool': {
+                    'min_size': int(os.environ.get('POSTGRES_POOL_MIN_SIZE', 2)),
+                    'max_size': int(os.environ.get('POSTGRES_POOL_MAX_SIZE', 20)),
+                    'timeout': int(os.environ.get('POSTGRES_POOL_TIMEOUT', 10)),
+                },
+            },
+        }
+    }
+elif PLANTRA_DB_ENGINE == 'sqlite':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get('SQLITE_PATH', BASE_DIR / 'db.sqlite3'),
+            # Keep connections open between requests instead of
+            # reconnecting (and re-running the PRAGMAs) every time; not
+            # under ASGI, see RUNNING_ASGI
+            'CONN_MAX_AGE': int(os.environ.get(
+                'DB_CONN_MAX_AGE', 0 if RUNNING_ASGI else 600
+            )),
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {},
+        }
+    }
+    if os.environ.get('SQLITE_TUNED', '1') == '1':
+        DATABASES['default']['OPTIONS'] = {
+            # Seconds a writer waits for the lock (sqlite3_busy_timeout)
+            # before failing with "database is locked"
+            'timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT', 20)),
+            # Take the write lock when the transaction starts, so two
+            # writers can't both read and then deadlock upgrading
+            'transaction_mode': 'IMMEDIATE',
+            # WAL lets readers run alongside the writer; NORMAL only
+            # syncs at checkpoints, which is safe in WAL mode
+            'init_command': (
+                'PRAGMA journal_mode=WAL;'
+                'PRAGMA synchronous=NORMAL;'
+            ),
+        }
+else:
+    raise ImproperlyConfigured(
+        f"Unknown PLANTRA_DB_ENGINE {PLANTRA_DB_ENGINE!r}; use 'sqlite' or 'postgres'"
+    )
+
+# Threads per process that plantra.async_views.gather_queries runs
+# blocking queries on. Each keeps its own database connection, so this
+# also bounds the connections they hold.
+ASYNC_QUERY_WORKERS = int(os.environ.get('ASYNC_QUERY_WORKERS', 4))
+
+
+# Cache
+# https://docs.djangoproject.com/en/6.0/topics/cache/
+
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'plantra',
+        'OPTIONS': {
+            'MAX_ENTRIES': 5000,
+        },
     }
 }
 
+# Version stamps behind the ETag / Last-Modified responses (events.versions)
+# live in their own cache alias. Every worker process must see the same
+# stamps: LocMemCache is private to a process, so with several workers a
+# write handled by one of them would leave the others answering 304 with
+# stale data. Set VERSION_CACHE_URL to a Redis URL when running more than
+# one worker (WEB_CONCURRENCY, as read by gunicorn and uvicorn); without
+# it, conditional GET is switched off for multi-worker deployments and the
+# other state that has to agree across workers (event access sets, token
+# versions) is not cached at all.
+VERSION_CACHE_URL = os.environ.get('VERSION_CACHE_URL', '')
+WEB_CONCURRENCY = int(os.environ.get('WEB_CONCURRENCY', 1))
+
+if VERSION_CACHE_URL:
+    CACHES['versions'] = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': VERSION_CACHE_URL,
+    }
+else:
+    CACHES['versions'] = {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'plantra-versions',
+    }
+
+VERSION_CACHE_ALIAS = 'versions'
+VERSION_CACHE_SHARED = bool(VERSION_CACHE_URL) or WEB_CONCURRENCY == 1
+CONDITIONAL_GET_ENABLED = VERSION_CACHE_SHARED
+
+# Seconds an organization's dashboard snapshot may be served from cache.
+# Writes invalidate it immediately; this only bounds the drift of
+# date-relative fields such as "overdue" and "this week".
+DASHBOARD_CACHE_TIMEOUT = 60
+
+# Seconds a user's set of accessible event ids may be cached. Event,
+# team lead and assignment changes invalidate it immediately. The sets
+# live in the VERSION_CACHE_ALIAS cache and are only cached while it is
+# shared (VERSION_CACHE_SHARED); otherwise they are resolved per request.
+EVENT_ACCESS_CACHE_TIMEOUT = 300
+
+# Seconds a user's token_version may be cached. Saving or deleting the
+# user drops it immediately; the timeout only bounds queryset .update()s.
+# Like access sets, token versions live in the VERSION_CACHE_ALIAS cache
+# and are read from the database on every request while it isn't shared.
+TOKEN_VERSION_CACHE_TIMEOUT = 300
+
+# Seconds a process keeps a user row for tokens without usable claims
+TOKEN_USER_CACHE_TIMEOUT = 30
+
+# Pub/sub used to push budget alert transitions to open streams. The
+# in-process broker only reaches streams served by the same process;
+# a shared broker also needs a shared CACHES backend for alert state.
+EVENT_ALERT_BROKER = 'events.broker.InProcessBroker'
+
+# Seconds between keep-alive comments on idle alert streams
+EVENT_ALERT_STREAM_HEARTBEAT = 15
+
 
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
@@ -117,6 +262,20 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Processes that hash passwords for bulk team invites (None: one per CPU).
+# Batches smaller than PASSWORD_HASHING_POOL_MIN_BATCH are hashed inline.
+PASSWORD_HASHING_WORKERS = None
+PASSWORD_HASHING_POOL_MIN_BATCH = 8
+
+# Most rows accepted by one bulk team invite
+TEAM_INVITE_MAX_ROWS = 1000
+
+# Organization teardown deletes this many rows per table per batch. A
+# running job whose heartbeat is older than ORGANIZATION_TEARDOWN_STALE_AFTER
+# seconds is treated as crashed; `manage.py teardown_organizations` resumes it.
+ORGANIZATION_TEARDOWN_BATCH_SIZE = 1000
+ORGANIZATION_TEARDOWN_STALE_AFTER = 300
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/6.0/topics/i18n/
@@ -137,4 +296,10 @@ STATIC_URL = 'static/'
 
 
 # Google OAuth Settings
-GOOGLE_OAUTH_CLIENT_ID = '548539601310-fro2n359t24lgrodatgvc1lh5nq5vpup.apps.googleusercontent.com'
\ No newline at end of file
+GOOGLE_OAUTH_CLIENT_ID = '548539601310-fro2n359t24lgrodatgvc1lh5nq5vpup.apps.googleusercontent.com'
+
+# Google's ID token signing certificates, cached per process for the
+# max-age Google sends. Point at a local stand-in for testing.
+GOOGLE_OAUTH_CERTS_URL = os.environ.get(
+    'GOOGLE_OAUTH_CERTS_URL', 'https://www.googleapis.com/oauth2/v1/certs'
+)
@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { DollarSign, Plus, X, Edit2, Trash2, MoreVertical, TrendingUp, TrendingDown, AlertCircle, AlertTriangle } from 'lucide-react';
-import axiosInstance from '../../../Constants/Axiosintance';
+import axiosInstance, { fetchAllPages } from '../../../Constants/Axiosintance';
 
 const Budget = () => {
   const [events, setEvents] = useState([]);
@@ -36,10 +36,10 @@ const Budget = () => {
 
   const fetchEvents = async () => {
     try {
-      const response = await axiosInstance.get('/events/');
-      setEvents(response.data);
-      if (response.data.length > 0) {
-        setSelectedEvent(response.data[0].id);
+      const { results } = await fetchAllPages('/events/?fields=id,name');
+      setEvents(results);
+      if (results.length > 0) {
+        setSelectedEvent(results[0].id);
       }
       setLoading(false);
     } catch (err) {
@@ -59,8 +59,8 @@ const Budget = () => {
 
   const fetchBudgetItems = async () => {
     try {
-      const response = await axiosInstance.get(`/events/${selectedEvent}/budget-items/`);
-      setBudgetItems(response.data);
+      const { results } = await fetchAllPages(`/events/${selectedEvent}/budget-items/`);
+      setBudgetItems(results);
     } catch (err) {
       console.error('Error fetching budget items:', err);
     }
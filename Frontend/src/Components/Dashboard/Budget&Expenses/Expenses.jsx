@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { DollarSign, Plus, X, Edit2, Trash2, MoreVertical, AlertCircle, Calendar, CreditCard, FileText } from 'lucide-react';
-import axiosInstance from '../../../Constants/Axiosintance';
+import axiosInstance, { fetchAllPages } from '../../../Constants/Axiosintance';
 
 const Expenses = () => {
   const [events, setEvents] = useState([]);
@@ -40,10 +40,10 @@ const Expenses = () => {
 
   const fetchEvents = async () => {
     try {
-      const response = await axiosInstance.get('/events/');
-      setEvents(response.data);
-      if (response.data.length > 0) {
-        setSelectedEvent(response.data[0].id);
+      const { results } = await fetchAllPages('/events/?fields=id,name');
+      setEvents(results);
+      if (results.length > 0) {
+        setSelectedEvent(results[0].id);
       }
       setLoading(false);
     } catch (err) {
@@ -63,8 +63,8 @@ const Expenses = () => {
 
   const fetchBudgetItems = async () => {
     try {
-      const response = await axiosInstance.get(`/events/${selectedEvent}/budget-items/`);
-      setBudgetItems(response.data);
+      const { results } = await fetchAllPages(`/events/${selectedEvent}/budget-items/`);
+      setBudgetItems(results);
     } catch (err) {
       console.error('Error fetching budget items:', err);
     }
@@ -72,8 +72,8 @@ const Expenses = () => {
 
   const fetchExpenses = async () => {
     try {
-      const response = await axiosInstance.get(`/events/${selectedEvent}/expenses/`);
-      setExpenses(response.data);
+      const { results } = await fetchAllPages(`/events/${selectedEvent}/expenses/`);
+      setExpenses(results);
     } catch (err) {
       console.error('Error fetching expenses:', err);
     }
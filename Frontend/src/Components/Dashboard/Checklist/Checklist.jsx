@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { CheckSquare, Plus, X, Edit2, Trash2, MoreVertical, AlertCircle, Clock, User } from 'lucide-react';
-import axiosInstance from "../../../Constants/Axiosintance"
+import axiosInstance, { fetchAllPages } from "../../../Constants/Axiosintance"
 import AddChecklist from './AddChecklist';
 import EditChecklist from './EditChecklist';
 
@@ -32,10 +32,10 @@ const Checklist = () => {
 
   const fetchEvents = async () => {
     try {
-      const response = await axiosInstance.get('/events/');
-      setEvents(response.data);
-      if (response.data.length > 0) {
-        setSelectedEvent(response.data[0].id);
+      const { results } = await fetchAllPages('/events/?fields=id,name');
+      setEvents(results);
+      if (results.length > 0) {
+        setSelectedEvent(results[0].id);
       }
       setLoading(false);
     } catch (err) {
@@ -46,10 +46,8 @@ const Checklist = () => {
 
 const fetchTeamMembers = async () => {
   try {
-    const response = await axiosInstance.get('/accounts/team/');
-    // Extract the members array from the response
-    setTeamMembers(response.data.members || []);
-    console.log('Team members:', response.data.members); // Debug: Check the structure
+    const { members } = await fetchAllPages('/accounts/team/', 'members');
+    setTeamMembers(members || []);
   } catch (err) {
     console.error('Error fetching team members:', err);
     setTeamMembers([]); // Set empty array on error
@@ -57,8 +55,8 @@ const fetchTeamMembers = async () => {
 };
   const fetchChecklistItems = async () => {
     try {
-      const response = await axiosInstance.get(`/events/${selectedEvent}/checklist/`);
-      setChecklistItems(response.data);
+      const { results } = await fetchAllPages(`/events/${selectedEvent}/checklist/`);
+      setChecklistItems(results);
     } catch (err) {
       console.error('Error fetching checklist items:', err);
     }
@@ -3,7 +3,7 @@
 // ========================
 import React, { useState, useEffect } from 'react';
 import { Calendar, MapPin, Users, DollarSign, Plus, X, Search, Filter, TrendingUp, Clock, Edit2, Trash2, MoreVertical } from 'lucide-react';
-import axiosInstance from '../../../Constants/Axiosintance';
+import axiosInstance, { fetchAllPages } from '../../../Constants/Axiosintance';
 import UpdateEvent from './UpdateEvent';
 import AddEvent from './AddEvent';
 
@@ -26,8 +26,8 @@ const Event = () => {
   const fetchEvents = async () => {
     try {
       setLoading(true);
-      const response = await axiosInstance.get('/events/');
-      setEvents(response.data);
+      const { results } = await fetchAllPages('/events/');
+      setEvents(results);
       setError(null);
     } catch (err) {
       setError(err.response?.data?.message || err.message || 'Failed to fetch events');
@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { Users, Mail, Shield, Trash2, Plus, X, Search } from 'lucide-react';
-import axiosInstance from "../../../Constants/Axiosintance"
+import axiosInstance, { fetchAllPages } from "../../../Constants/Axiosintance"
 
 const Team = () => {
   const [teamData, setTeamData] = useState(null);
@@ -21,8 +21,7 @@ const Team = () => {
   const fetchTeamMembers = async () => {
     try {
       setLoading(true);
-      const response = await axiosInstance.get('/accounts/team/');
-      setTeamData(response.data);
+      setTeamData(await fetchAllPages('/accounts/team/', 'members'));
       setError(null);
     } catch (err) {
       setError(err.response?.data?.message || err.message || 'Failed to fetch team members');
@@ -118,4 +118,24 @@ axiosInstance.interceptors.response.use(
   }
 )
 
+/**
+ * GET a paginated list endpoint and follow its `next` links to the last
+ * page. Returns the first page's body with `key` holding the rows of
+ * every page, so callers can use it like an unpaginated response.
+ */
+export const fetchAllPages = async (url, key = "results") => {
+  const response = await axiosInstance.get(url)
+  const data = { ...response.data, [key]: [...response.data[key]] }
+
+  let next = response.data.next
+  while (next) {
+    const page = await axiosInstance.get(next)
+    data[key].push(...page.data[key])
+    next = page.data.next
+  }
+
+  data.next = null
+  return data
+}
+
 export default axiosInstance
\ No newline at end of file